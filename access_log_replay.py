@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+ROBOT Access-Log Replay
+
+Replays production traffic shapes from access logs against a ROBOT
+deployment. Log lines are streamed (plain or .gz), mapped onto the routes
+the harness knows and fired through the async load client at their
+original inter-arrival times, optionally compressed:
+
+    python3 access_log_replay.py router.log                      # real time
+    python3 access_log_replay.py router.log.gz --speed 10        # 10x faster
+    python3 access_log_replay.py traffic.csv --concurrency 64 --target http://localhost:8000
+    python3 access_log_replay.py router.log --dry-run            # mix and rate only
+
+Input formats (--format, default by file extension):
+    heroku   Heroku router lines (at=info method=GET path="/orders" ... status=200)
+    csv      header row with timestamp, method, path columns (optional: status, body)
+    jsonl    one object per line with the same keys
+
+Timestamps are ISO 8601 or Unix seconds. Only GET requests are replayed
+unless --allow-writes is given (router logs carry no bodies; CSV/JSONL
+rows may). Memory stays constant: lines are parsed one at a time, at most
+2 x concurrency requests are pending, and results only update the
+HarnessRun histograms (use ROBOT_LOG_LEVEL=quiet or progress).
+"""
+
+import argparse
+import asyncio
+import csv
+import gzip
+import io
+import json
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, Optional, Iterator
+
+from async_client import AsyncLoadClient
+from harness import HarnessRun
+from latency_histogram import LatencyHistogram
+from route_templates import known_template
+
+BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
+
+HEROKU = "heroku"
+CSV = "csv"
+JSONL = "jsonl"
+FORMATS = [HEROKU, CSV, JSONL]
+
+_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?")
+_FIELD = re.compile(r'(\w+)=("(?:[^"\\]|\\.)*"|\S+)')
+_MS = re.compile(r"^(\d+)ms$")
+
+TIMESTAMP_KEYS = ["timestamp", "time", "ts", "@timestamp"]
+PATH_KEYS = ["path", "endpoint", "url", "uri"]
+
+
+@dataclass
+class LogEntry:
+    timestamp: float   # Unix seconds
+    method: str
+    path: str
+    status: Optional[int] = None
+    service_time: Optional[float] = None  # seconds, when the log reports it
+    body: Any = None
+
+
+def parse_timestamp(value) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def parse_heroku_line(line: str) -> Optional[LogEntry]:
+    """Heroku router log line -> LogEntry, None for other lines"""
+    if "path=" not in line:
+        return None
+    match = _TIMESTAMP.search(line)
+    timestamp = parse_timestamp(match.group(0)) if match else None
+    fields = {key: value.strip('"') for key, value in _FIELD.findall(line)}
+    if timestamp is None or "method" not in fields or "path" not in fields:
+        return None
+    status = fields.get("status")
+    service = _MS.match(fields.get("service", ""))
+    return LogEntry(timestamp, fields["method"].upper(), fields["path"],
+                    int(status) if status and status.isdigit() else None,
+                    int(service.group(1)) / 1000.0 if service else None)
+
+
+def _entry_from_record(record: Dict[str, Any]) -> Optional[LogEntry]:
+    timestamp = next((parse_timestamp(record.get(key)) for key in TIMESTAMP_KEYS if record.get(key)), None)
+    path = next((record.get(key) for key in PATH_KEYS if record.get(key)), None)
+    method = record.get("method")
+    if timestamp is None or not path or not method:
+        return None
+    if "://" in path:
+        path = "/" + path.split("://", 1)[1].partition("/")[2]
+    status = record.get("status")
+    body = record.get("body")
+    if isinstance(body, str) and body:
+        try:
+            body = json.loads(body)
+        except ValueError:
+            pass
+    return LogEntry(timestamp, str(method).upper(), path,
+                    int(status) if str(status or "").isdigit() else None, None, body or None)
+
+
+def open_log(path: str) -> io.TextIOBase:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace", newline="")
+    return open(path, encoding="utf-8", errors="replace", newline="")
+
+
+def detect_format(path: str) -> str:
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith(".csv"):
+        return CSV
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return JSONL
+    return HEROKU
+
+
+class LogStats:
+    """Counts of what happened to the lines read"""
+
+    def __init__(self):
+        self.lines = 0
+        self.unparsed = 0
+        self.unknown_route = 0
+        self.filtered = 0
+        self.out_of_order = 0
+        self.templates: Dict[str, int] = {}
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+
+
+def iter_entries(stream, fmt: str, stats: LogStats) -> Iterator[LogEntry]:
+    """Stream LogEntry objects from an open log"""
+    if fmt == CSV:
+        for row in csv.DictReader(stream):
+            stats.lines += 1
+            entry = _entry_from_record({key.strip().lower(): value for key, value in row.items() if key})
+            if entry is None:
+                stats.unparsed += 1
+                continue
+            yield entry
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        stats.lines += 1
+        if fmt == JSONL:
+            try:
+                entry = _entry_from_record(json.loads(line))
+            except (ValueError, AttributeError):
+                entry = None
+        else:
+            entry = parse_heroku_line(line)
+        if entry is None:
+            stats.unparsed += 1
+            continue
+        yield entry
+
+
+def map_entries(entries: Iterator[LogEntry], stats: LogStats, methods=("GET",),
+                limit: Optional[int] = None) -> Iterator[LogEntry]:
+    """Keep entries on known ROBOT routes with an allowed method"""
+    sent = 0
+    for entry in entries:
+        template = known_template(entry.method, entry.path)
+        if template is None:
+            stats.unknown_route += 1
+            continue
+        if entry.method not in methods:
+            stats.filtered += 1
+            continue
+        stats.templates[template] = stats.templates.get(template, 0) + 1
+        if stats.first is None:
+            stats.first = entry.timestamp
+        if stats.last is not None and entry.timestamp < stats.last:
+            stats.out_of_order += 1
+        stats.last = max(stats.last or entry.timestamp, entry.timestamp)
+        yield entry
+        sent += 1
+        if limit is not None and sent >= limit:
+            return
+
+
+class ReplaySchedule:
+    """Maps log time onto wall time and tracks how far sends lag behind it"""
+
+    def __init__(self, speed: float = 1.0):
+        self.speed = speed
+        self.lag = LatencyHistogram()
+        self._log_start: Optional[float] = None
+        self._wall_start: Optional[float] = None
+
+    def due(self, timestamp: float) -> float:
+        """perf_counter() time at which an entry with this log timestamp should fire"""
+        if self._log_start is None:
+            self._log_start, self._wall_start = timestamp, time.perf_counter()
+        offset = max(timestamp - self._log_start, 0.0)
+        return self._wall_start + (offset / self.speed if self.speed > 0 else 0.0)
+
+    def sent(self, due: float):
+        self.lag.record(max(time.perf_counter() - due, 0.0))
+
+
+async def replay(entries: Iterator[LogEntry], client: AsyncLoadClient, speed: float = 1.0) -> ReplaySchedule:
+    """Fire entries at their (compressed) original times with bounded pending work"""
+    schedule = ReplaySchedule(speed)
+    pending = set()
+    max_pending = client.concurrency * 2
+
+    async def fire(entry: LogEntry, due: float):
+        await client.request(entry.method, entry.path, entry.body, expect_success=True,
+                             on_send=lambda: schedule.sent(due))
+
+    for entry in entries:
+        due = schedule.due(entry.timestamp)
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        while len(pending) >= max_pending:
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        pending.add(asyncio.ensure_future(fire(entry, due)))
+    if pending:
+        await asyncio.wait(pending)
+    return schedule
+
+
+def print_summary(stats: LogStats, schedule: Optional[ReplaySchedule], elapsed: float, sent: int):
+    mapped = sum(stats.templates.values())
+    print(f"\n📜 Access-log replay: {stats.lines:,} lines, {mapped:,} mapped onto ROBOT routes")
+    skipped = [(stats.unparsed, "unparsed"), (stats.unknown_route, "unknown routes"),
+               (stats.filtered, "methods filtered"), (stats.out_of_order, "out of order")]
+    details = ", ".join(f"{count:,} {label}" for count, label in skipped if count)
+    if details:
+        print(f"   Skipped/noted: {details}")
+    if stats.first is not None and stats.last is not None and stats.last > stats.first:
+        span = stats.last - stats.first
+        print(f"   Log span {span:,.1f}s at {mapped / span:,.2f} req/s")
+    if not mapped:
+        return
+    print("   Mix:")
+    for template, count in sorted(stats.templates.items(), key=lambda item: -item[1])[:15]:
+        print(f"      {template}: {count:,} ({count / mapped:.1%})")
+    if schedule is not None and sent:
+        lag = schedule.lag
+        print(f"   Sent {sent:,} requests in {elapsed:,.1f}s ({sent / elapsed:,.2f} req/s); schedule lag "
+              f"p50 {lag.percentile(50) * 1000:.1f}ms, p99 {lag.percentile(99) * 1000:.1f}ms, "
+              f"max {lag.max * 1000:.1f}ms")
+        if lag.percentile(99) > 0.1:
+            print("   ⚠️ Sends fell behind the log's timing; raise --concurrency or lower --speed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay access logs against the ROBOT API")
+    parser.add_argument("log", help="log file (.gz supported)")
+    parser.add_argument("--format", choices=FORMATS, help="default: by file extension")
+    parser.add_argument("--target", default=BASE_URL, help="base URL to send requests to")
+    parser.add_argument("--speed", type=float, default=1.0, help="time compression (10 = 10x faster, 0 = no waits)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--transport", default="requests", choices=["requests", "http.client"])
+    parser.add_argument("--limit", type=int, help="stop after this many mapped requests")
+    parser.add_argument("--allow-writes", action="store_true", help="also replay POST/PUT/PATCH/DELETE")
+    parser.add_argument("--dry-run", action="store_true", help="parse and map only")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.log)
+    methods = ("GET", "POST", "PUT", "PATCH", "DELETE") if args.allow_writes else ("GET",)
+    stats = LogStats()
+    start_time = time.time()
+    with open_log(args.log) as stream:
+        entries = map_entries(iter_entries(stream, fmt, stats), stats, methods, args.limit)
+        if args.dry_run:
+            for _ in entries:
+                pass
+            print_summary(stats, None, time.time() - start_time, 0)
+            return
+        harness = HarnessRun.from_env("access_log_replay", target_url=args.target)
+        client = AsyncLoadClient.create(args.target, args.concurrency, args.transport, harness=harness)
+        try:
+            schedule = asyncio.run(replay(entries, client, args.speed))
+        finally:
+            client.close()
+    elapsed = time.time() - start_time
+    harness.close()
+    print_summary(stats, schedule, elapsed, schedule.lag.count)
+    exit(0 if harness.passed_slos else 1)
+
+
+if __name__ == "__main__":
+    main()
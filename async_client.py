@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+ROBOT Async Load Client
+
+asyncio front end over the blocking LoadClient: requests run on a thread
+pool through run_in_executor and a semaphore caps how many are in flight,
+so load generators can schedule thousands of requests from one event loop
+while the transports, codecs and HarnessRun recording stay exactly those
+the self-benchmark measures.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, Optional, Callable
+
+from load_client import LoadClient, TestResult
+
+
+class AsyncLoadClient:
+    """Bounded-concurrency async wrapper around a LoadClient"""
+
+    def __init__(self, client: LoadClient, concurrency: int = 32):
+        self.client = client
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="robot-load")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def create(cls, base_url: str, concurrency: int = 32, transport: str = "requests", codec: str = "json",
+               harness=None, timeout: float = 30.0) -> "AsyncLoadClient":
+        """Client whose connection pool matches the concurrency"""
+        return cls(LoadClient.create(base_url, transport, codec, harness, pool_size=concurrency,
+                                     timeout=timeout), concurrency)
+
+    @property
+    def harness(self):
+        return self.client.harness
+
+    @property
+    def timeout(self) -> float:
+        """Per-request timeout of the underlying transport"""
+        return self.client.transport.timeout
+
+    async def request(self, method: str, endpoint: str, data: Any = None, expect_success: bool = True,
+                      headers: Optional[Dict[str, str]] = None,
+                      on_send: Optional[Callable[[], None]] = None) -> TestResult:
+        """Send one request once a concurrency slot is free
+
+        `on_send` is called when the slot is acquired, just before the
+        request goes out.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            if on_send is not None:
+                on_send()
+            self.in_flight += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._executor,
+                    partial(self.client.request, method, endpoint, data, expect_success, headers))
+            finally:
+                self.in_flight -= 1
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.client.close()
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+ROBOT Benchmark History
+
+Persists every suite run to a local SQLite database: git SHA, target URL,
+suite, and per endpoint template the latency histogram snapshot,
+percentiles, throughput and error counts. Nothing touches the database
+while requests are being measured; the harness hands over its aggregated
+stats once the run closes and they are written in a single transaction.
+
+Enabled with ROBOT_HISTORY_DB=<path>. Query it with:
+    python3 benchmark_history.py runs [--suite S] [--limit N]
+    python3 benchmark_history.py show RUN
+    python3 benchmark_history.py trend "GET /items" [--since 7d] [--metric p95]
+    python3 benchmark_history.py compare RUN_A RUN_B
+
+RUN is a run id, "latest", "latest~N", or a git SHA prefix (most recent run
+at that commit).
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import time
+from typing import Dict, Any, Optional, List
+
+from latency_histogram import LatencyHistogram
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    git_sha TEXT,
+    target_url TEXT,
+    suite TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    throughput REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS endpoint_stats (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    git_sha TEXT,
+    requests INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    throughput REAL NOT NULL,
+    mean REAL, p50 REAL, p95 REAL, p99 REAL, max REAL,
+    status_counts TEXT,
+    histogram TEXT NOT NULL,
+    PRIMARY KEY (run_id, endpoint)
+);
+CREATE INDEX IF NOT EXISTS idx_endpoint_stats_endpoint_time ON endpoint_stats(endpoint, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_endpoint_stats_git_sha ON endpoint_stats(git_sha);
+CREATE INDEX IF NOT EXISTS idx_runs_git_sha ON runs(git_sha);
+CREATE INDEX IF NOT EXISTS idx_runs_suite_time ON runs(suite, started_at);
+"""
+
+METRICS = ["mean", "p50", "p95", "p99", "max", "throughput", "errors"]
+
+
+def current_git_sha() -> Optional[str]:
+    """HEAD of the checkout the suite runs from (ROBOT_GIT_SHA overrides)"""
+    sha = os.environ.get("ROBOT_GIT_SHA")
+    if sha:
+        return sha
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if out.returncode != 0:
+        return None
+    return out.stdout.strip() or None
+
+
+def parse_since(value: str) -> float:
+    """'7d', '12h', '30m' -> epoch seconds that many units ago"""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhdw])", value.strip())
+    if not match:
+        raise ValueError(f"Invalid duration '{value}', expected e.g. 30m, 12h, 7d, 2w")
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+    return time.time() - float(match.group(1)) * units[match.group(2)]
+
+
+class BenchmarkHistory:
+    """SQLite store of run results"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(f"{path} has schema v{version}, this tool supports v{SCHEMA_VERSION}")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @classmethod
+    def from_env(cls) -> Optional["BenchmarkHistory"]:
+        path = os.environ.get("ROBOT_HISTORY_DB")
+        return cls(path) if path else None
+
+    def close(self):
+        self.conn.close()
+
+    # Ingestion ------------------------------------------------------------
+
+    def record_run(self, suite: str, started_at: float, finished_at: float,
+                   endpoints: Dict[str, Any], target_url: Optional[str] = None,
+                   git_sha: Optional[str] = None) -> int:
+        """Store one run and its per-endpoint stats in a single transaction
+
+        `endpoints` maps an endpoint template ("GET /orders/{id}") to an
+        object with `histogram`, `requests`, `errors` and `status_counts`.
+        """
+        duration = max(finished_at - started_at, 1e-9)
+        total = sum(s.requests for s in endpoints.values())
+        errors = sum(s.errors for s in endpoints.values())
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (started_at, finished_at, git_sha, target_url, suite, requests, errors, throughput) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (started_at, finished_at, git_sha, target_url, suite, total, errors, total / duration)
+            )
+            run_id = cursor.lastrowid
+            rows = []
+            for endpoint, stats in endpoints.items():
+                summary = stats.histogram.summary()
+                rows.append((
+                    run_id, endpoint, finished_at, git_sha, stats.requests, stats.errors,
+                    stats.requests / duration, summary["mean"], summary["p50"], summary["p95"],
+                    summary["p99"], summary["max"],
+                    json.dumps(stats.status_counts, sort_keys=True),
+                    json.dumps(stats.histogram.snapshot(), separators=(",", ":"))
+                ))
+            self.conn.executemany(
+                "INSERT INTO endpoint_stats (run_id, endpoint, recorded_at, git_sha, requests, errors, "
+                "throughput, mean, p50, p95, p99, max, status_counts, histogram) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return run_id
+
+    # Queries --------------------------------------------------------------
+
+    def runs(self, suite: Optional[str] = None, git_sha: Optional[str] = None,
+             limit: int = 20) -> List[sqlite3.Row]:
+        query = "SELECT * FROM runs"
+        clauses, params = [], []
+        if suite:
+            clauses.append("suite = ?")
+            params.append(suite)
+        if git_sha:
+            clauses.append("git_sha LIKE ?")
+            params.append(git_sha + "%")
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY started_at DESC, id DESC LIMIT ?"
+        return self.conn.execute(query, params + [limit]).fetchall()
+
+    def resolve_run(self, ref: str, suite: Optional[str] = None) -> sqlite3.Row:
+        """Resolve a run id, 'latest', 'latest~N' or git SHA prefix"""
+        match = re.fullmatch(r"latest(?:~(\d+))?", ref)
+        if match:
+            offset = int(match.group(1) or 0)
+            rows = self.runs(suite=suite, limit=offset + 1)
+            if len(rows) <= offset:
+                raise LookupError(f"No run '{ref}'" + (f" for suite {suite}" if suite else ""))
+            return rows[offset]
+        if ref.isdigit():
+            row = self.conn.execute("SELECT * FROM runs WHERE id = ?", (int(ref),)).fetchone()
+            if row:
+                return row
+        rows = self.runs(suite=suite, git_sha=ref, limit=1)
+        if not rows:
+            raise LookupError(f"No run matches '{ref}'")
+        return rows[0]
+
+    def endpoint_stats(self, run_id: int) -> Dict[str, sqlite3.Row]:
+        rows = self.conn.execute(
+            "SELECT * FROM endpoint_stats WHERE run_id = ? ORDER BY endpoint", (run_id,)
+        ).fetchall()
+        return {row["endpoint"]: row for row in rows}
+
+    def histogram(self, run_id: int, endpoint: str) -> LatencyHistogram:
+        row = self.conn.execute(
+            "SELECT histogram FROM endpoint_stats WHERE run_id = ? AND endpoint = ?", (run_id, endpoint)
+        ).fetchone()
+        return LatencyHistogram.from_snapshot(json.loads(row["histogram"]) if row else None)
+
+    def run_histograms(self, run_id: int) -> Dict[str, LatencyHistogram]:
+        """All endpoint histograms of a run, keyed by template"""
+        rows = self.conn.execute(
+            "SELECT endpoint, histogram FROM endpoint_stats WHERE run_id = ?", (run_id,)
+        ).fetchall()
+        return {row["endpoint"]: LatencyHistogram.from_snapshot(json.loads(row["histogram"])) for row in rows}
+
+    def trend(self, endpoint: str, since: Optional[float] = None, suite: Optional[str] = None,
+              limit: int = 50) -> List[sqlite3.Row]:
+        """Per-run stats for one endpoint template, oldest first"""
+        query = ("SELECT e.*, r.suite, r.target_url FROM endpoint_stats e JOIN runs r ON r.id = e.run_id "
+                 "WHERE e.endpoint = ?")
+        params: List[Any] = [endpoint]
+        if since is not None:
+            query += " AND e.recorded_at >= ?"
+            params.append(since)
+        if suite:
+            query += " AND r.suite = ?"
+            params.append(suite)
+        query += " ORDER BY e.recorded_at DESC LIMIT ?"
+        params.append(limit)
+        return list(reversed(self.conn.execute(query, params).fetchall()))
+
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value * 1000:.1f}ms" if value is not None else "-"
+
+
+def _when(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+
+
+def _sha(sha: Optional[str]) -> str:
+    return sha[:8] if sha else "-"
+
+
+def _delta(old: Optional[float], new: Optional[float]) -> str:
+    if not old or new is None:
+        return ""
+    change = (new - old) / old * 100
+    icon = "🔺" if change > 5 else "🔻" if change < -5 else "  "
+    return f"{icon}{change:+.1f}%"
+
+
+def print_runs(history: BenchmarkHistory, args):
+    rows = history.runs(suite=args.suite, git_sha=args.sha, limit=args.limit)
+    if not rows:
+        print("No runs recorded")
+        return
+    print(f"{'id':>5}  {'started':<16}  {'sha':<8}  {'suite':<26}{'requests':>9}{'errors':>8}{'req/s':>9}  target")
+    for row in rows:
+        print(f"{row['id']:>5}  {_when(row['started_at']):<16}  {_sha(row['git_sha']):<8}  {row['suite']:<26}"
+              f"{row['requests']:>9}{row['errors']:>8}{row['throughput']:>9.1f}  {row['target_url'] or '-'}")
+
+
+def print_run(history: BenchmarkHistory, args):
+    run = history.resolve_run(args.run, args.suite)
+    print(f"📊 Run #{run['id']} {run['suite']} @ {_sha(run['git_sha'])} ({_when(run['started_at'])})")
+    print(f"   Target: {run['target_url'] or '-'}")
+    print(f"   {run['requests']} requests, {run['errors']} errors, {run['throughput']:.1f} req/s, "
+          f"{run['finished_at'] - run['started_at']:.1f}s")
+    print(f"\n   {'endpoint':<40}{'n':>6}{'err':>5}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for endpoint, row in history.endpoint_stats(run["id"]).items():
+        print(f"   {endpoint:<40}{row['requests']:>6}{row['errors']:>5}{_ms(row['p50']):>10}"
+              f"{_ms(row['p95']):>10}{_ms(row['p99']):>10}{_ms(row['max']):>10}")
+
+
+def print_trend(history: BenchmarkHistory, args):
+    since = parse_since(args.since) if args.since else None
+    rows = history.trend(args.endpoint, since=since, suite=args.suite, limit=args.limit)
+    if not rows:
+        print(f"No history for '{args.endpoint}'")
+        return
+    metric = args.metric
+    print(f"📈 {args.endpoint}: {metric} over {len(rows)} runs")
+    previous = None
+    for row in rows:
+        value = row[metric]
+        shown = f"{value}" if metric == "errors" else f"{value:.1f} req/s" if metric == "throughput" else _ms(value)
+        print(f"   {_when(row['recorded_at'])}  #{row['run_id']:<5} {_sha(row['git_sha']):<8}  "
+              f"{shown:>12} {_delta(previous, value):>9}   (n={row['requests']}, errors={row['errors']})")
+        previous = value
+    first, last = rows[0][metric], rows[-1][metric]
+    if len(rows) > 1:
+        print(f"\n   First → last: {_delta(first, last).strip() or 'n/a'}")
+
+
+def print_compare(history: BenchmarkHistory, args):
+    run_a = history.resolve_run(args.run_a, args.suite)
+    run_b = history.resolve_run(args.run_b, args.suite)
+    stats_a = history.endpoint_stats(run_a["id"])
+    stats_b = history.endpoint_stats(run_b["id"])
+    print(f"⚖️ Run #{run_a['id']} ({_sha(run_a['git_sha'])}, {_when(run_a['started_at'])}) "
+          f"→ #{run_b['id']} ({_sha(run_b['git_sha'])}, {_when(run_b['started_at'])})")
+    endpoints = sorted(set(stats_a) | set(stats_b))
+    if args.endpoint:
+        endpoints = [e for e in endpoints if e == args.endpoint]
+    print(f"\n   {'endpoint':<40}{'p50':>22}{'p95':>22}{'p99':>22}{'errors':>10}")
+    for endpoint in endpoints:
+        a, b = stats_a.get(endpoint), stats_b.get(endpoint)
+        if a is None or b is None:
+            print(f"   {endpoint:<40}  only in run #{run_a['id'] if a is not None else run_b['id']}")
+            continue
+        cells = [f"{_ms(b[m])} {_delta(a[m], b[m])}" for m in ("p50", "p95", "p99")]
+        print(f"   {endpoint:<40}{cells[0]:>22}{cells[1]:>22}{cells[2]:>22}{a['errors']:>4} → {b['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROBOT benchmark history")
+    parser.add_argument("--db", default=os.environ.get("ROBOT_HISTORY_DB", "robot_history.db"),
+                        help="SQLite database (default: $ROBOT_HISTORY_DB or robot_history.db)")
+    parser.add_argument("--suite", help="restrict to one suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("runs", help="list recorded runs")
+    p.add_argument("--sha", help="git SHA prefix")
+    p.add_argument("--limit", type=int, default=20)
+    p.set_defaults(func=print_runs)
+
+    p = sub.add_parser("show", help="per-endpoint stats of one run")
+    p.add_argument("run")
+    p.set_defaults(func=print_run)
+
+    p = sub.add_parser("trend", help="one endpoint template across runs")
+    p.add_argument("endpoint", help='endpoint template, e.g. "GET /items"')
+    p.add_argument("--since", help="time window, e.g. 7d, 12h")
+    p.add_argument("--metric", choices=METRICS, default="p95")
+    p.add_argument("--limit", type=int, default=50)
+    p.set_defaults(func=print_trend)
+
+    p = sub.add_parser("compare", help="compare two runs endpoint by endpoint")
+    p.add_argument("run_a")
+    p.add_argument("run_b")
+    p.add_argument("--endpoint", help="only this endpoint template")
+    p.set_defaults(func=print_compare)
+
+    args = parser.parse_args()
+    if not os.path.exists(args.db):
+        print(f"❌ No history database at {args.db}")
+        exit(1)
+    history = BenchmarkHistory(args.db)
+    try:
+        args.func(history, args)
+    except LookupError as e:
+        print(f"❌ {e}")
+        exit(1)
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
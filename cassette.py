@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+ROBOT Record/Replay Cassettes
+
+Records every request a harness-instrumented session sends, with the full
+response (status, headers, body) and its phase timing (time to response
+headers, body download), into a cassette file, and replays cassettes
+without touching the network:
+
+    ROBOT_CASSETTE=orders.cassette ROBOT_CASSETTE_MODE=record python3 complete_orders_api_test.py
+    ROBOT_CASSETTE=orders.cassette ROBOT_CASSETTE_MODE=replay python3 complete_orders_api_test.py
+    ROBOT_REPLAY_TIMING=original ...     sleep for each response's recorded latency
+                                         (default: fast, answer immediately)
+
+    python3 cassette.py info orders.cassette
+    python3 cassette.py serve orders.cassette --port 8099 [--timing original]
+
+`serve` answers any HTTP client from the cassette, for the load client
+transports that do not go through requests.
+
+A replayed request is matched on method, endpoint template and a
+fingerprint of its body (canonical JSON when the body is JSON). When
+nothing with the same fingerprint was recorded, any recording of the
+same template is used. Recordings of the same key are handed out in
+recorded order and wrap around, and a request that matches no template
+gets a 501.
+
+Authorization, Cookie and Set-Cookie headers are redacted on both the
+request and the response side. Bodies are stored as-is, including login
+responses that carry bearer tokens; treat recordings of authenticated
+runs as secrets or record against a disposable deployment.
+
+File format: an 8-byte magic followed by zlib-compressed frames (4-byte
+big-endian length + frame; a frame is a JSON metadata line followed by
+the request and response bodies), then a compressed JSON index of all
+frames and a fixed-size trailer pointing at it. The index makes opening a
+cassette for replay cost one read; a cassette whose recording never
+finished is indexed by scanning its frames.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, List, Tuple
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from route_templates import endpoint_template
+
+MAGIC = b"RBTCAS01"
+TRAILER_MAGIC = b"RBTIDX01"
+_TRAILER = struct.Struct(">QI8s")  # index offset, index length, magic
+_FRAME = struct.Struct(">I")
+
+RECORD = "record"
+REPLAY = "replay"
+FAST = "fast"
+ORIGINAL = "original"
+
+REDACTED_HEADERS = {"authorization", "cookie", "set-cookie"}
+
+FRAME_CACHE_SIZE = 256  # decompressed frames kept by a player
+
+
+def body_fingerprint(body) -> str:
+    """Short hash of a request body; JSON bodies are canonicalised first"""
+    if not body:
+        return ""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"),
+                          ensure_ascii=False).encode("utf-8")
+    except ValueError:
+        pass
+    return hashlib.sha1(body).hexdigest()[:16]
+
+
+def _endpoint(url: str) -> str:
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def _as_bytes(body) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    if isinstance(body, bytes):
+        return body
+    return b""  # streamed/file bodies are not recorded
+
+
+def _redact(headers) -> Dict[str, str]:
+    return {name: ("<redacted>" if name.lower() in REDACTED_HEADERS else value)
+            for name, value in headers.items()}
+
+
+class CassetteWriter:
+    """Appends recorded exchanges to a cassette file; thread-safe"""
+
+    def __init__(self, path: str, level: int = 6):
+        self.path = path
+        self.level = level
+        self.count = 0
+        self.raw_bytes = 0
+        self.index: List[List[Any]] = []
+        self.started_at = time.time()
+        self._start_perf = time.perf_counter()
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+
+    def record(self, method: str, endpoint: str, request_headers, request_body: bytes,
+               status: int, reason: str, response_headers, response_body: bytes,
+               headers_time: float, total_time: float, started: float):
+        """Store one exchange; `started` is the perf_counter() reading when it was sent"""
+        template = endpoint_template(method, endpoint)
+        fingerprint = body_fingerprint(request_body)
+        meta = {
+            "method": method,
+            "endpoint": endpoint,
+            "template": template,
+            "fingerprint": fingerprint,
+            "at": round(started - self._start_perf, 6),
+            "status": status,
+            "reason": reason,
+            "request_headers": _redact(request_headers),
+            "response_headers": _redact(response_headers),
+            "request_size": len(request_body),
+            "response_size": len(response_body),
+            "timing": {"headers": round(headers_time, 6), "download": round(total_time - headers_time, 6),
+                       "total": round(total_time, 6)},
+        }
+        frame = json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n" + request_body + response_body
+        compressed = zlib.compress(frame, self.level)
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(_FRAME.pack(len(compressed)) + compressed)
+            self.index.append([method, template, fingerprint, endpoint, offset, meta["at"], total_time])
+            self.count += 1
+            self.raw_bytes += len(frame)
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            document = {"version": 1, "started_at": self.started_at, "entries": self.index}
+            index = zlib.compress(json.dumps(document, ensure_ascii=False).encode("utf-8"), self.level)
+            offset = self._file.tell()
+            self._file.write(index)
+            self._file.write(_TRAILER.pack(offset, len(index), TRAILER_MAGIC))
+            self._file.close()
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.path)
+
+
+class RecordedResponse:
+    """One decoded cassette frame"""
+
+    __slots__ = ("meta", "request_body", "body")
+
+    def __init__(self, meta: Dict[str, Any], request_body: bytes, body: bytes):
+        self.meta = meta
+        self.request_body = request_body
+        self.body = body
+
+    @property
+    def status(self) -> int:
+        return self.meta["status"]
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return self.meta["response_headers"]
+
+    @property
+    def latency(self) -> float:
+        return self.meta["timing"]["total"]
+
+
+class CassettePlayer:
+    """Looks up recorded responses for replay; thread-safe"""
+
+    def __init__(self, path: str, timing: str = FAST, frame_cache: int = FRAME_CACHE_SIZE):
+        if timing not in (FAST, ORIGINAL):
+            raise ValueError(f"Unknown replay timing '{timing}', expected '{FAST}' or '{ORIGINAL}'")
+        self.path = path
+        self.timing = timing
+        self.started_at: Optional[float] = None
+        self.served = 0
+        self.fuzzy = 0  # matched on template only
+        self.misses: Dict[str, int] = {}
+        self._file = open(path, "rb")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a ROBOT cassette")
+        self.entries = self._read_index()
+        self._by_template: Dict[Tuple[str, str], List[List[Any]]] = {}
+        for entry in self.entries:
+            self._by_template.setdefault((entry[0], entry[1]), []).append(entry)
+        self._cursors: Dict[Tuple[str, str, str], int] = {}
+        self._frames: "OrderedDict[int, RecordedResponse]" = OrderedDict()  # LRU by file offset
+        self._frame_cache = frame_cache
+        self._lock = threading.Lock()
+
+    def _read_index(self) -> List[List[Any]]:
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+        if size >= len(MAGIC) + _TRAILER.size:
+            self._file.seek(size - _TRAILER.size)
+            offset, length, magic = _TRAILER.unpack(self._file.read(_TRAILER.size))
+            if magic == TRAILER_MAGIC:
+                self._file.seek(offset)
+                document = json.loads(zlib.decompress(self._file.read(length)))
+                self.started_at = document.get("started_at")
+                return document["entries"]
+        return self._scan(size)
+
+    def _scan(self, size: int) -> List[List[Any]]:
+        """Index an unfinished recording frame by frame"""
+        entries = []
+        offset = len(MAGIC)
+        while offset + _FRAME.size <= size:
+            self._file.seek(offset)
+            (length,) = _FRAME.unpack(self._file.read(_FRAME.size))
+            data = self._file.read(length)
+            if len(data) < length:
+                break
+            try:
+                meta = json.loads(zlib.decompress(data).split(b"\n", 1)[0])
+            except (zlib.error, ValueError):
+                break
+            entries.append([meta["method"], meta["template"], meta["fingerprint"], meta["endpoint"],
+                            offset, meta["at"], meta["timing"]["total"]])
+            offset += _FRAME.size + length
+        return entries
+
+    def _frame(self, offset: int) -> RecordedResponse:
+        frame = self._frames.get(offset)
+        if frame is not None:
+            self._frames.move_to_end(offset)
+            return frame
+        self._file.seek(offset)
+        (length,) = _FRAME.unpack(self._file.read(_FRAME.size))
+        data = zlib.decompress(self._file.read(length))
+        header, _, bodies = data.partition(b"\n")
+        meta = json.loads(header)
+        split = meta["request_size"]
+        frame = RecordedResponse(meta, bodies[:split], bodies[split:])
+        if self._frame_cache > 0:
+            self._frames[offset] = frame
+            if len(self._frames) > self._frame_cache:
+                self._frames.popitem(last=False)
+        return frame
+
+    def lookup(self, method: str, endpoint: str, body=None) -> Optional[RecordedResponse]:
+        """Next recorded response for this request, or None"""
+        template = endpoint_template(method, endpoint)
+        fingerprint = body_fingerprint(_as_bytes(body))
+        with self._lock:
+            candidates = self._by_template.get((method, template))
+            if not candidates:
+                self.misses[template] = self.misses.get(template, 0) + 1
+                return None
+            exact = [entry for entry in candidates if entry[2] == fingerprint]
+            if exact:
+                candidates, cursor_key = exact, (method, template, fingerprint)
+            else:
+                self.fuzzy += 1
+                cursor_key = (method, template, "*")
+            # Prefer recordings of the very same URL (same query values)
+            same_url = [entry for entry in candidates if entry[3] == endpoint]
+            if same_url:
+                candidates = same_url
+                cursor_key += (endpoint,)
+            position = self._cursors.get(cursor_key, 0)
+            self._cursors[cursor_key] = position + 1
+            self.served += 1
+            return self._frame(candidates[position % len(candidates)][4])
+
+    def wait(self, recorded: RecordedResponse):
+        """Reproduce the recorded latency in original-timing mode"""
+        if self.timing == ORIGINAL:
+            time.sleep(recorded.latency)
+
+    def close(self):
+        self._file.close()
+
+    def summary(self) -> str:
+        misses = sum(self.misses.values())
+        text = f"{self.served} responses replayed from {self.path}"
+        if self.fuzzy:
+            text += f", {self.fuzzy} matched on template only"
+        if misses:
+            text += f", {misses} unmatched ({', '.join(sorted(self.misses))})"
+        return text
+
+
+# requests adapters ------------------------------------------------------
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends requests normally and writes each exchange to a cassette
+
+    With `inner`, requests are sent through that adapter (keeping its pool
+    settings) instead of this one's own pool.
+    """
+
+    def __init__(self, writer: CassetteWriter, inner: Optional[HTTPAdapter] = None, **kwargs):
+        self.writer = writer
+        self.inner = inner
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        started = time.perf_counter()
+        sender = self.inner.send if self.inner is not None else super().send
+        response = sender(request, stream=True, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        headers_at = time.perf_counter()
+        content = response.content
+        end = time.perf_counter()
+        self.writer.record(request.method, _endpoint(request.url), request.headers, _as_bytes(request.body),
+                           response.status_code, response.reason or "", response.headers, content,
+                           headers_at - started, end - started, started)
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Answers requests from a cassette without network access"""
+
+    def __init__(self, player: CassettePlayer, **kwargs):
+        self.player = player
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        endpoint = _endpoint(request.url)
+        recorded = self.player.lookup(request.method, endpoint, request.body)
+        response = Response()
+        response.request = request
+        response.url = request.url
+        if recorded is None:
+            body = json.dumps({"detail": f"No recording for {endpoint_template(request.method, endpoint)}"})
+            response.status_code, response.reason = 501, "Not Recorded"
+            response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+            response._content = body.encode("utf-8")
+        else:
+            self.player.wait(recorded)
+            response.status_code, response.reason = recorded.status, recorded.meta["reason"]
+            response.headers = CaseInsensitiveDict(recorded.headers)
+            response._content = recorded.body
+            response.elapsed = timedelta(seconds=recorded.latency)
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        return response
+
+
+class Cassette:
+    """Recording or replay side of a cassette, as attached to a HarnessRun"""
+
+    def __init__(self, path: str, mode: str, timing: str = FAST):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode '{mode}', expected '{RECORD}' or '{REPLAY}'")
+        self.path = path
+        self.mode = mode
+        self.writer = CassetteWriter(path) if mode == RECORD else None
+        self.player = CassettePlayer(path, timing) if mode == REPLAY else None
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """Cassette selected by ROBOT_CASSETTE/ROBOT_CASSETTE_MODE/ROBOT_REPLAY_TIMING, or None"""
+        path = os.environ.get("ROBOT_CASSETTE")
+        if not path:
+            return None
+        mode = os.environ.get("ROBOT_CASSETTE_MODE", REPLAY if os.path.exists(path) else RECORD)
+        return cls(path, mode, os.environ.get("ROBOT_REPLAY_TIMING", FAST))
+
+    def adapter(self, inner: Optional[HTTPAdapter] = None) -> HTTPAdapter:
+        """Recording adapter sending through `inner`, or the replay adapter"""
+        return RecordingAdapter(self.writer, inner) if self.writer else ReplayAdapter(self.player)
+
+    def mount(self, session):
+        """Route a session's HTTP(S) traffic through the cassette, recording over its existing adapters"""
+        for prefix in ("http://", "https://"):
+            inner = session.adapters.get(prefix)
+            session.mount(prefix, self.adapter(inner if isinstance(inner, HTTPAdapter) else None))
+        return session
+
+    def close(self) -> str:
+        """Finish the cassette; returns a one-line summary"""
+        if self.writer:
+            self.writer.close()
+            ratio = self.writer.raw_bytes / self.writer.size if self.writer.size else 0.0
+            return (f"{self.writer.count} exchanges recorded to {self.path} "
+                    f"({self.writer.size / 1024:,.1f} KiB, {ratio:.1f}x compressed)")
+        self.player.close()
+        return self.player.summary()
+
+
+# Standalone server ------------------------------------------------------
+
+def serve(player: CassettePlayer, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """HTTP server answering from the cassette (for non-requests clients)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _replay(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            recorded = player.lookup(self.command, self.path, body)
+            if recorded is None:
+                payload = json.dumps({"detail": f"No recording for {endpoint_template(self.command, self.path)}"})
+                self._send(501, "Not Recorded", {"Content-Type": "application/json"}, payload.encode("utf-8"))
+                return
+            player.wait(recorded)
+            self._send(recorded.status, recorded.meta["reason"], recorded.headers, recorded.body)
+
+        def _send(self, status: int, reason: str, headers: Dict[str, str], body: bytes):
+            self.send_response(status, reason)
+            for name, value in headers.items():
+                if name.lower() not in ("content-length", "transfer-encoding", "content-encoding",
+                                        "connection", "date", "server"):
+                    self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _replay
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def print_info(player: CassettePlayer):
+    entries = player.entries
+    print(f"📼 {player.path}: {len(entries)} exchanges, {os.path.getsize(player.path) / 1024:,.1f} KiB")
+    if not entries:
+        return
+    span = max(entry[5] for entry in entries)
+    print(f"   Recorded over {span:.1f}s")
+    by_template: Dict[str, List[float]] = {}
+    for entry in entries:
+        by_template.setdefault(entry[1], []).append(entry[6])
+    for template, latencies in sorted(by_template.items(), key=lambda item: -len(item[1])):
+        latencies.sort()
+        print(f"   {template}: {len(latencies)} x, median {latencies[len(latencies) // 2]:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROBOT record/replay cassettes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    info = subparsers.add_parser("info", help="summarise a cassette")
+    info.add_argument("cassette")
+    serve_parser = subparsers.add_parser("serve", help="serve a cassette over HTTP")
+    serve_parser.add_argument("cassette")
+    serve_parser.add_argument("--port", type=int, default=8099)
+    serve_parser.add_argument("--timing", choices=[FAST, ORIGINAL], default=FAST)
+    args = parser.parse_args()
+
+    player = CassettePlayer(args.cassette, getattr(args, "timing", FAST))
+    if args.command == "info":
+        print_info(player)
+        return
+    server = serve(player, args.port)
+    print(f"📼 Serving {args.cassette} on http://127.0.0.1:{server.server_address[1]} ({args.timing} timing)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📼 {player.summary()}")
+
+
+if __name__ == "__main__":
+    main()
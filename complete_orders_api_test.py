@@ -12,6 +12,10 @@ import uuid
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 
+from harness import HarnessRun
+from route_templates import succeeded_routes
+from server_timing import ResponseTiming, capture_timing
+
 # API Configuration
 BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
 API_BASE = BASE_URL
@@ -25,29 +29,38 @@ class TestResult:
     response_data: Any
     error_message: Optional[str] = None
     execution_time: float = 0.0
+    timing: Optional[ResponseTiming] = None
+
+def format_result(result: TestResult) -> str:
+    """Format a test result for the log (runs on the sink's writer thread)"""
+    status = "✅ PASS" if result.success else "❌ FAIL"
+    lines = [f"{status} {result.method} {result.endpoint} ({result.status_code}) - {result.execution_time:.3f}s"]
+    if result.error_message:
+        lines.append(f"   Error: {result.error_message}")
+    if result.success and result.response_data:
+        if isinstance(result.response_data, dict):
+            if 'id' in result.response_data:
+                lines.append(f"   ID: {result.response_data['id']}")
+        elif isinstance(result.response_data, list):
+            lines.append(f"   Response: Array with {len(result.response_data)} items")
+    return "\n".join(lines)
 
 class CompleteOrdersApiTester:
     def __init__(self):
         self.session = requests.Session()
         self.auth_token = None
         self.test_results: List[TestResult] = []
+        self.harness = HarnessRun.from_env("complete_orders_api", formatter=format_result, target_url=API_BASE)
+        self.harness.instrument(self.session)
+        self.sink = self.harness.sink
         self.created_category_id = None
         self.created_item_ids: List[str] = []
         self.created_order_ids: List[str] = []
         
     def log_result(self, result: TestResult):
-        """Log test result and print status"""
+        """Record test result; output is written off the hot path by the sink"""
         self.test_results.append(result)
-        status = "✅ PASS" if result.success else "❌ FAIL"
-        print(f"{status} {result.method} {result.endpoint} ({result.status_code}) - {result.execution_time:.3f}s")
-        if result.error_message:
-            print(f"   Error: {result.error_message}")
-        if result.success and result.response_data:
-            if isinstance(result.response_data, dict):
-                if 'id' in result.response_data:
-                    print(f"   ID: {result.response_data['id']}")
-            elif isinstance(result.response_data, list):
-                print(f"   Response: Array with {len(result.response_data)} items")
+        self.harness.record(result)
     
     def make_request(self, method: str, endpoint: str, data: Dict = None, 
                     headers: Dict = None, expect_success: bool = True) -> TestResult:
@@ -105,7 +118,8 @@ class CompleteOrdersApiTester:
                 status_code=response.status_code,
                 response_data=response_data,
                 error_message=error_message,
-                execution_time=execution_time
+                execution_time=execution_time,
+                timing=capture_timing(response)
             )
             
         except Exception as e:
@@ -122,7 +136,7 @@ class CompleteOrdersApiTester:
     
     def setup_test_data(self):
         """Create test category and items for Orders testing"""
-        print("\n🔧 Setting up test data...")
+        self.sink.note("\n🔧 Setting up test data...")
         
         # Create test category
         test_category = {
@@ -139,7 +153,7 @@ class CompleteOrdersApiTester:
         
         if result.success and result.response_data and 'id' in result.response_data:
             self.created_category_id = result.response_data['id']
-            print(f"   📁 Created category: {self.created_category_id}")
+            self.sink.note(f"   📁 Created category: {self.created_category_id}")
         
         # Create test items
         if self.created_category_id:
@@ -200,14 +214,14 @@ class CompleteOrdersApiTester:
                 
                 if result.success and result.response_data and 'id' in result.response_data:
                     self.created_item_ids.append(result.response_data['id'])
-                    print(f"   🍽️ Created item: {result.response_data['id']}")
+                    self.sink.note(f"   🍽️ Created item: {result.response_data['id']}")
     
     def test_orders_with_real_data(self):
         """Test Orders API with real item data"""
-        print("\n📋 Testing Orders API with Real Data...")
+        self.sink.note("\n📋 Testing Orders API with Real Data...")
         
         if len(self.created_item_ids) < 2:
-            print("❌ Not enough test items created, skipping order tests")
+            self.sink.note("❌ Not enough test items created, skipping order tests")
             return
         
         # Test order creation with real items
@@ -263,7 +277,7 @@ class CompleteOrdersApiTester:
         if result.success and result.response_data and 'id' in result.response_data:
             order_id = result.response_data['id']
             self.created_order_ids.append(order_id)
-            print(f"   📝 Created order: {order_id}")
+            self.sink.note(f"   📝 Created order: {order_id}")
             
             # Test getting the created order
             result = self.make_request("GET", f"/orders/{order_id}")
@@ -277,7 +291,7 @@ class CompleteOrdersApiTester:
                 self.log_result(result)
                 
                 if result.success:
-                    print(f"   ✅ Status updated to: {status}")
+                    self.sink.note(f"   ✅ Status updated to: {status}")
         
         # Create pickup order
         pickup_order = {
@@ -318,7 +332,7 @@ class CompleteOrdersApiTester:
     
     def test_orders_filtering_and_stats(self):
         """Test orders filtering and statistics"""
-        print("\n🔍 Testing Orders Filtering & Statistics...")
+        self.sink.note("\n🔍 Testing Orders Filtering & Statistics...")
         
         # Test basic listing
         result = self.make_request("GET", "/orders")
@@ -343,7 +357,7 @@ class CompleteOrdersApiTester:
     
     def test_ukrainian_language_support(self):
         """Test Ukrainian language support in orders"""
-        print("\n🇺🇦 Testing Ukrainian Language Support...")
+        self.sink.note("\n🇺🇦 Testing Ukrainian Language Support...")
         
         if self.created_order_ids:
             # Get order and check Ukrainian content
@@ -357,14 +371,14 @@ class CompleteOrdersApiTester:
                 if 'items' in order_data and len(order_data['items']) > 0:
                     first_item = order_data['items'][0]
                     if 'name' in first_item and 'ua' in first_item['name']:
-                        print(f"   🇺🇦 Ukrainian item name: {first_item['name']['ua']}")
-                        print("   ✅ Ukrainian language support confirmed")
+                        self.sink.note(f"   🇺🇦 Ukrainian item name: {first_item['name']['ua']}")
+                        self.sink.note("   ✅ Ukrainian language support confirmed")
                     else:
-                        print("   ⚠️ Ukrainian language data not found in response")
+                        self.sink.note("   ⚠️ Ukrainian language data not found in response")
     
     def test_error_handling_comprehensive(self):
         """Test comprehensive error handling"""
-        print("\n⚠️ Testing Comprehensive Error Handling...")
+        self.sink.note("\n⚠️ Testing Comprehensive Error Handling...")
         
         # Test invalid item ID
         invalid_order = {
@@ -431,7 +445,7 @@ class CompleteOrdersApiTester:
     
     def cleanup_test_data(self):
         """Clean up all created test data"""
-        print("\n🧹 Cleaning up test data...")
+        self.sink.note("\n🧹 Cleaning up test data...")
         
         # Delete orders
         for order_id in self.created_order_ids:
@@ -458,24 +472,30 @@ class CompleteOrdersApiTester:
         
         try:
             # Test backend health
-            result = self.make_request("GET", "/health")
-            self.log_result(result)
+            with self.harness.step("health_check"):
+                result = self.make_request("GET", "/health")
+                self.log_result(result)
             
             # Setup test data
-            self.setup_test_data()
+            with self.harness.step("setup_test_data"):
+                self.setup_test_data()
             
             # Run Orders API tests
-            self.test_orders_with_real_data()
-            self.test_orders_filtering_and_stats()
-            self.test_ukrainian_language_support()
-            self.test_error_handling_comprehensive()
+            for step in [self.test_orders_with_real_data,
+                         self.test_orders_filtering_and_stats,
+                         self.test_ukrainian_language_support,
+                         self.test_error_handling_comprehensive]:
+                with self.harness.step(step.__name__):
+                    step()
             
         except Exception as e:
-            print(f"❌ Test execution error: {str(e)}")
+            self.sink.note(f"❌ Test execution error: {str(e)}")
         finally:
-            self.cleanup_test_data()
+            with self.harness.step("cleanup_test_data"):
+                self.cleanup_test_data()
         
         total_time = time.time() - start_time
+        self.harness.close()
         
         # Print comprehensive summary
         print(f"\n📊 Complete Orders API Test Summary")
@@ -489,14 +509,15 @@ class CompleteOrdersApiTester:
         print(f"📈 Success rate: {(passed/len(self.test_results)*100):.1f}%")
         
         # Analyze Orders API functionality
+        routes = succeeded_routes(self.test_results)
         orders_functionality = {
-            'health_check': any(r.success and r.endpoint == "/health" for r in self.test_results),
-            'orders_list': any(r.success and r.endpoint == "/orders" and r.method == "GET" for r in self.test_results),
-            'order_creation': any(r.success and r.endpoint == "/orders" and r.method == "POST" for r in self.test_results),
-            'order_retrieval': any(r.success and "/orders/" in r.endpoint and r.method == "GET" for r in self.test_results),
-            'status_updates': any(r.success and "/status" in r.endpoint and r.method == "PATCH" for r in self.test_results),
-            'filtering': any(r.success and "?" in r.endpoint and r.method == "GET" for r in self.test_results),
-            'statistics': any(r.success and "/stats/" in r.endpoint for r in self.test_results)
+            'health_check': ("GET", "/health", False) in routes,
+            'orders_list': ("GET", "/orders", False) in routes,
+            'order_creation': ("POST", "/orders", False) in routes,
+            'order_retrieval': ("GET", "/orders/{id}", False) in routes,
+            'status_updates': ("PATCH", "/orders/{id}/status", False) in routes,
+            'filtering': ("GET", "/orders", True) in routes,
+            'statistics': ("GET", "/orders/stats/summary", False) in routes
         }
         
         print(f"\n📋 Orders API Functionality Assessment:")
@@ -512,13 +533,18 @@ class CompleteOrdersApiTester:
             print(f"\n⚡ Performance Analysis:")
             print(f"   📊 Average response time: {avg_response_time:.3f}s")
             print(f"   📊 Maximum response time: {max_response_time:.3f}s")
+            for template, stats in sorted(self.harness.endpoints.items()):
+                summary = stats.histogram.summary()
+                print(f"      {template}: {stats.requests}x, p50 {summary['p50']:.3f}s, "
+                      f"p95 {summary['p95']:.3f}s")
             
-            if avg_response_time < 0.1:
-                performance_rating = "🟢 EXCELLENT"
-            elif avg_response_time < 0.5:
-                performance_rating = "🟡 GOOD"
+            slo_report = self.harness.slo_report
+            if slo_report is None:
+                performance_rating = "⚪ NO SLO BUDGETS"
+            elif slo_report.passed:
+                performance_rating = "🟢 WITHIN SLO BUDGETS"
             else:
-                performance_rating = "🔴 NEEDS IMPROVEMENT"
+                performance_rating = f"🔴 {len(slo_report.violations)} SLO BUDGET VIOLATIONS"
             
             print(f"   📊 Performance rating: {performance_rating}")
         
@@ -528,10 +554,7 @@ class CompleteOrdersApiTester:
         print(f"\n🇺🇦 Ukrainian Language Support: {'✅ CONFIRMED' if ukrainian_support else '❌ NOT DETECTED'}")
         
         if failed > 0:
-            print(f"\n❌ Failed Tests Details:")
-            for result in self.test_results:
-                if not result.success:
-                    print(f"   {result.method} {result.endpoint}: {result.error_message}")
+            self.sink.print_recent_failures()
         
         # Final assessment
         working_features = sum(orders_functionality.values())
@@ -542,7 +565,8 @@ class CompleteOrdersApiTester:
             print("✅ Orders API is FULLY FUNCTIONAL and production-ready")
             print("   All core features working: creation, retrieval, status updates, filtering")
             print("   Ukrainian language support confirmed")
-            print("   Performance is excellent")
+            print("   Performance is within SLO budgets" if self.harness.passed_slos
+                  else "   Performance is outside SLO budgets")
         elif working_features >= total_features * 0.8:
             print("⚠️ Orders API is MOSTLY FUNCTIONAL with minor limitations")
             print("   Core functionality working but some features may need attention")
@@ -563,6 +587,10 @@ def main():
     print(f"\n🏁 Complete Test Suite Finished")
     print(f"📊 Final Results: {passed} passed, {failed} failed")
     
+    if not tester.harness.passed_slos:
+        print("❌ SLO budgets violated")
+        exit(1)
+    
     return passed, failed, functionality
 
 if __name__ == "__main__":
@@ -13,6 +13,12 @@ import uuid
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 
+from harness import HarnessRun
+from route_templates import succeeded_routes
+from server_timing import ResponseTiming, capture_timing
+from order_integrity import verify_orders, print_report
+from polling import poll_until, VisibilityStats
+
 # API Configuration
 BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
 API_BASE = BASE_URL
@@ -102,29 +108,39 @@ class TestResult:
     response_data: Any
     error_message: Optional[str] = None
     execution_time: float = 0.0
+    timing: Optional[ResponseTiming] = None
+
+def format_result(result: TestResult) -> str:
+    """Format a test result for the log (runs on the sink's writer thread)"""
+    status = "✅ PASS" if result.success else "❌ FAIL"
+    lines = [f"{status} {result.method} {result.endpoint} ({result.status_code}) - {result.execution_time:.3f}s"]
+    if result.error_message:
+        lines.append(f"   Error: {result.error_message}")
+    if result.success and result.response_data:
+        if isinstance(result.response_data, dict):
+            if 'id' in result.response_data:
+                lines.append(f"   Order ID: {result.response_data['id']}")
+            if 'order_number' in result.response_data:
+                lines.append(f"   Order Number: {result.response_data['order_number']}")
+        elif isinstance(result.response_data, list):
+            lines.append(f"   Response: Array with {len(result.response_data)} items")
+    return "\n".join(lines)
 
 class ComprehensiveOrdersTester:
     def __init__(self):
         self.session = requests.Session()
         self.auth_token = None
         self.test_results: List[TestResult] = []
+        self.harness = HarnessRun.from_env("comprehensive_orders", formatter=format_result, target_url=API_BASE)
+        self.harness.instrument(self.session)
+        self.sink = self.harness.sink
         self.created_order_ids: List[str] = []
+        self.visibility = VisibilityStats()
         
     def log_result(self, result: TestResult):
-        """Log test result and print status"""
+        """Record test result; output is written off the hot path by the sink"""
         self.test_results.append(result)
-        status = "✅ PASS" if result.success else "❌ FAIL"
-        print(f"{status} {result.method} {result.endpoint} ({result.status_code}) - {result.execution_time:.3f}s")
-        if result.error_message:
-            print(f"   Error: {result.error_message}")
-        if result.success and result.response_data:
-            if isinstance(result.response_data, dict):
-                if 'id' in result.response_data:
-                    print(f"   Order ID: {result.response_data['id']}")
-                if 'order_number' in result.response_data:
-                    print(f"   Order Number: {result.response_data['order_number']}")
-            elif isinstance(result.response_data, list):
-                print(f"   Response: Array with {len(result.response_data)} items")
+        self.harness.record(result)
     
     def make_request(self, method: str, endpoint: str, data: Dict = None, 
                     headers: Dict = None, expect_success: bool = True) -> TestResult:
@@ -170,7 +186,7 @@ class ComprehensiveOrdersTester:
                         # Validation errors
                         error_message = f"Validation errors: {len(response_data['detail'])} issues"
                         for error in response_data['detail'][:3]:  # Show first 3 errors
-                            print(f"     - {error.get('loc', [])}: {error.get('msg', '')}")
+                            self.sink.note(f"     - {error.get('loc', [])}: {error.get('msg', '')}")
                     else:
                         error_message = response_data['detail']
                 elif isinstance(response_data, dict) and 'message' in response_data:
@@ -185,7 +201,8 @@ class ComprehensiveOrdersTester:
                 status_code=response.status_code,
                 response_data=response_data,
                 error_message=error_message,
-                execution_time=execution_time
+                execution_time=execution_time,
+                timing=capture_timing(response)
             )
             
         except Exception as e:
@@ -202,7 +219,7 @@ class ComprehensiveOrdersTester:
     
     def test_backend_health(self):
         """Test backend health and connectivity"""
-        print("\n🏥 Testing Backend Health & Connectivity...")
+        self.sink.note("\n🏥 Testing Backend Health & Connectivity...")
         
         # Test health endpoint
         result = self.make_request("GET", "/health")
@@ -218,7 +235,7 @@ class ComprehensiveOrdersTester:
     
     def test_orders_basic_operations(self):
         """Test basic Orders API operations"""
-        print("\n📋 Testing Orders Basic Operations...")
+        self.sink.note("\n📋 Testing Orders Basic Operations...")
         
         # Test GET /orders (list orders)
         result = self.make_request("GET", "/orders")
@@ -234,14 +251,25 @@ class ComprehensiveOrdersTester:
     
     def test_order_creation(self):
         """Test order creation with different scenarios"""
-        print("\n🆕 Testing Order Creation...")
+        self.sink.note("\n🆕 Testing Order Creation...")
         
         # Test creating delivery order
         result = self.make_request("POST", "/orders", TEST_ORDER_CREATE)
         self.log_result(result)
         
         if result.success and result.response_data and 'id' in result.response_data:
-            self.created_order_ids.append(result.response_data['id'])
+            order_id = result.response_data['id']
+            self.created_order_ids.append(order_id)
+            
+            # Read-after-write: poll from the moment the POST was acknowledged
+            poll = poll_until(
+                lambda: self.make_request("GET", f"/orders/{order_id}"),
+                lambda r: r.success and isinstance(r.response_data, dict)
+                and r.response_data.get('id') == order_id,
+                timeout=5.0
+            )
+            self.log_result(poll.value)
+            self.visibility.record("POST /orders -> GET /orders/{id}", poll)
         
         # Test creating pickup order
         result = self.make_request("POST", "/orders", TEST_PICKUP_ORDER)
@@ -286,7 +314,7 @@ class ComprehensiveOrdersTester:
     
     def test_order_status_filtering(self):
         """Test order filtering by status (using English statuses)"""
-        print("\n🔍 Testing Order Status Filtering...")
+        self.sink.note("\n🔍 Testing Order Status Filtering...")
         
         # Test filtering by each valid status
         valid_statuses = ['pending', 'confirmed', 'preparing', 'ready', 'out_for_delivery', 'delivered', 'cancelled']
@@ -297,7 +325,7 @@ class ComprehensiveOrdersTester:
     
     def test_individual_order_operations(self):
         """Test operations on individual orders"""
-        print("\n🔧 Testing Individual Order Operations...")
+        self.sink.note("\n🔧 Testing Individual Order Operations...")
         
         # Test getting individual orders
         for order_id in self.created_order_ids[:2]:  # Test first 2 orders
@@ -325,14 +353,14 @@ class ComprehensiveOrdersTester:
     
     def test_orders_statistics(self):
         """Test orders statistics endpoint"""
-        print("\n📊 Testing Orders Statistics...")
+        self.sink.note("\n📊 Testing Orders Statistics...")
         
         result = self.make_request("GET", "/orders/stats/summary")
         self.log_result(result)
     
     def test_error_handling(self):
         """Test error handling and validation"""
-        print("\n⚠️ Testing Error Handling & Validation...")
+        self.sink.note("\n⚠️ Testing Error Handling & Validation...")
         
         # Test invalid order creation (missing required fields)
         invalid_order = {
@@ -363,7 +391,7 @@ class ComprehensiveOrdersTester:
     
     def test_authentication_requirements(self):
         """Test authentication requirements"""
-        print("\n🔐 Testing Authentication Requirements...")
+        self.sink.note("\n🔐 Testing Authentication Requirements...")
         
         # Save current auth token
         old_token = self.auth_token
@@ -383,7 +411,7 @@ class ComprehensiveOrdersTester:
     
     def test_performance_and_load(self):
         """Test performance with multiple requests"""
-        print("\n⚡ Testing Performance & Load...")
+        self.sink.note("\n⚡ Testing Performance & Load...")
         
         start_time = time.time()
         
@@ -396,15 +424,15 @@ class ComprehensiveOrdersTester:
         total_time = time.time() - start_time
         avg_time = total_time / 5
         
-        print(f"   📈 Performance: 5 requests in {total_time:.2f}s (avg: {avg_time:.3f}s per request)")
+        self.sink.note(f"   📈 Performance: 5 requests in {total_time:.2f}s (avg: {avg_time:.3f}s per request)")
         
         # Test with larger limit
         result = self.make_request("GET", "/orders?limit=100")
         self.log_result(result)
     
-    def test_data_integrity(self):
-        """Test data integrity and persistence"""
-        print("\n🔒 Testing Data Integrity & Persistence...")
+    def test_data_integrity(self) -> Optional[str]:
+        """Test data integrity and persistence; returns a failure message for inconsistent totals"""
+        self.sink.note("\n🔒 Testing Data Integrity & Persistence...")
         
         if self.created_order_ids:
             order_id = self.created_order_ids[0]
@@ -416,21 +444,48 @@ class ComprehensiveOrdersTester:
             if result1.success:
                 original_data = result1.response_data
                 
-                # Wait a moment and get again to check persistence
-                time.sleep(1)
-                result2 = self.make_request("GET", f"/orders/{order_id}")
+                # Re-read until the order is consistently visible (no fixed sleep)
+                poll = poll_until(
+                    lambda: self.make_request("GET", f"/orders/{order_id}"),
+                    lambda r: r.success and isinstance(r.response_data, dict)
+                    and r.response_data.get('id') == original_data.get('id'),
+                    timeout=5.0
+                )
+                result2 = poll.value
                 self.log_result(result2)
                 
                 if result2.success:
                     # Check if data is consistent
-                    if original_data.get('id') == result2.response_data.get('id'):
-                        print("   ✅ Data persistence verified")
+                    if poll.satisfied:
+                        self.sink.note(f"   ✅ Data persistence verified ({poll.attempts} reads, {poll.elapsed:.3f}s)")
                     else:
-                        print("   ❌ Data persistence issue detected")
+                        self.sink.note("   ❌ Data persistence issue detected")
+        
+        # Verify money invariants across all fetched orders in one pass
+        result = self.make_request("GET", "/orders?limit=1000")
+        self.log_result(result)
+        
+        if result.success and isinstance(result.response_data, list):
+            report = verify_orders(result.response_data)
+            print_report(report, emit=self.sink.note)
+            if not report.passed:
+                failure = f"{len(report.offending)} orders with inconsistent totals"
+                # Counts against the suite's pass/fail, but it is not a request: keep it
+                # out of the harness histograms, exports and history
+                self.test_results.append(TestResult(
+                    endpoint="/orders?limit=1000",
+                    method="VERIFY",
+                    success=False,
+                    status_code=result.status_code,
+                    response_data=None,
+                    error_message=failure
+                ))
+                return failure
+        return None
     
     def cleanup_test_data(self):
         """Clean up created test orders"""
-        print("\n🧹 Cleaning up test data...")
+        self.sink.note("\n🧹 Cleaning up test data...")
         
         for order_id in self.created_order_ids:
             result = self.make_request("DELETE", f"/orders/{order_id}")
@@ -444,23 +499,33 @@ class ComprehensiveOrdersTester:
         
         start_time = time.time()
         
+        steps = [
+            self.test_backend_health,
+            self.test_orders_basic_operations,
+            self.test_order_creation,
+            self.test_order_status_filtering,
+            self.test_individual_order_operations,
+            self.test_orders_statistics,
+            self.test_error_handling,
+            self.test_authentication_requirements,
+            self.test_performance_and_load,
+            self.test_data_integrity
+        ]
+        
         try:
-            self.test_backend_health()
-            self.test_orders_basic_operations()
-            self.test_order_creation()
-            self.test_order_status_filtering()
-            self.test_individual_order_operations()
-            self.test_orders_statistics()
-            self.test_error_handling()
-            self.test_authentication_requirements()
-            self.test_performance_and_load()
-            self.test_data_integrity()
+            for step in steps:
+                with self.harness.step(step.__name__) as outcome:
+                    failure = step()
+                    if failure:
+                        outcome.fail(failure)
         except Exception as e:
-            print(f"❌ Test execution error: {str(e)}")
+            self.sink.note(f"❌ Test execution error: {str(e)}")
         finally:
-            self.cleanup_test_data()
+            with self.harness.step("cleanup_test_data"):
+                self.cleanup_test_data()
         
         total_time = time.time() - start_time
+        self.harness.close()
         
         # Print comprehensive summary
         print(f"\n📊 Comprehensive Orders API Test Summary")
@@ -474,14 +539,11 @@ class ComprehensiveOrdersTester:
         print(f"📈 Success rate: {(passed/len(self.test_results)*100):.1f}%")
         
         # Analyze Orders API functionality
-        orders_get_working = any(r.success and r.endpoint == "/orders" and r.method == "GET" 
-                               for r in self.test_results)
-        orders_create_working = any(r.success and r.endpoint == "/orders" and r.method == "POST" 
-                                  for r in self.test_results)
-        orders_status_working = any(r.success and "/status" in r.endpoint and r.method == "PATCH" 
-                                  for r in self.test_results)
-        orders_filtering_working = any(r.success and "?" in r.endpoint and r.method == "GET" 
-                                     for r in self.test_results)
+        routes = succeeded_routes(self.test_results)
+        orders_get_working = ("GET", "/orders", False) in routes
+        orders_create_working = ("POST", "/orders", False) in routes
+        orders_status_working = ("PATCH", "/orders/{id}/status", False) in routes
+        orders_filtering_working = ("GET", "/orders", True) in routes
         
         print(f"\n📋 Orders API Functionality Analysis:")
         print(f"   📥 Orders retrieval (GET): {'✅ WORKING' if orders_get_working else '❌ FAILED'}")
@@ -489,6 +551,8 @@ class ComprehensiveOrdersTester:
         print(f"   🔄 Status updates (PATCH): {'✅ WORKING' if orders_status_working else '❌ FAILED'}")
         print(f"   🔍 Filtering & search: {'✅ WORKING' if orders_filtering_working else '❌ FAILED'}")
         
+        self.visibility.print_summary()
+        
         # Performance analysis
         response_times = [r.execution_time for r in self.test_results if r.success]
         if response_times:
@@ -500,10 +564,7 @@ class ComprehensiveOrdersTester:
             print(f"   📊 Performance rating: {'🟢 EXCELLENT' if avg_response_time < 0.1 else '🟡 GOOD' if avg_response_time < 0.5 else '🔴 NEEDS IMPROVEMENT'}")
         
         if failed > 0:
-            print(f"\n❌ Failed Tests Summary:")
-            for result in self.test_results:
-                if not result.success:
-                    print(f"   {result.method} {result.endpoint}: {result.error_message}")
+            self.sink.print_recent_failures()
         
         # Final assessment
         print(f"\n🎯 Final Assessment:")
@@ -532,6 +593,10 @@ def main():
     print(f"\n🏁 Test Execution Complete")
     print(f"📊 Results: {passed} passed, {failed} failed")
     
+    if not tester.harness.passed_slos:
+        print("❌ SLO budgets violated")
+        exit(1)
+    
     return passed, failed, analysis
 
 if __name__ == "__main__":
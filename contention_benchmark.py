@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+ROBOT Concurrent-Writer Contention Benchmark
+
+Several staff members hit the same rows at the same moment during service.
+This benchmark has 1 to 64 concurrent writers fire conflicting writes at
+shared rows and reads the final state back after every round:
+
+    reorder        PATCH /categories/reorder, every writer a new permutation
+                   of the same --categories categories
+    availability   PATCH /items/{id}/availability on the same --rows items
+    status         PATCH /orders/{id}/status on the same --rows orders
+
+    python3 contention_benchmark.py --target http://localhost:8000
+    python3 contention_benchmark.py --scenarios reorder,status --writers 1,4,16,64 --rounds 10
+
+A round starts all writers together; each sends --writes writes back to
+back. The final state of a row must be the value of a write that may have
+landed last, i.e. one that (or its unacknowledged sibling) was still in
+flight when the last acknowledged write to the row began. Anything else is
+reported as a lost update; for reorder, a final order that matches no
+single request's permutation means the batch was not applied atomically.
+
+Fixtures (categories, items and orders) are created at the start and the
+categories and items are deleted at the end unless --keep is given.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple
+
+from async_client import AsyncLoadClient
+from harness import HarnessRun
+from latency_histogram import LatencyHistogram
+from synthetic_data import SyntheticDataGenerator, UKRAINIAN_STATUSES
+
+BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
+
+REORDER = "reorder"
+AVAILABILITY = "availability"
+STATUS = "status"
+SCENARIOS = [REORDER, AVAILABILITY, STATUS]
+
+DEFAULT_WRITERS = [1, 2, 4, 8, 16, 32, 64]
+
+FIXTURE_CATEGORY = {
+    "name": {
+        "ua": "Категорія навантаження",
+        "pl": "Kategoria obciążeniowa",
+        "en": "Contention Category",
+        "by": "Катэгорыя нагрузкі"
+    },
+    "visible": True
+}
+
+FIXTURE_ITEM = {
+    "name": {
+        "ua": "Страва дня",
+        "pl": "Danie dnia",
+        "en": "Dish of the Day",
+        "by": "Страва дня"
+    },
+    "description": {
+        "ua": "Позиція для тесту конкурентних записів",
+        "pl": "Pozycja do testu współbieżnych zapisów",
+        "en": "Item for the concurrent-writer test",
+        "by": "Пазіцыя для тэсту канкурэнтных запісаў"
+    },
+    "price": 189.0,
+    "packaging_price": 10.0,
+    "available": True
+}
+
+
+@dataclass
+class Write:
+    row: str
+    value: Any
+    start: float
+    end: float
+    status_code: int
+    success: bool
+
+    @property
+    def may_have_applied(self) -> bool:
+        # Connection errors and 5xx leave the outcome unknown
+        return self.success or self.status_code == 0 or self.status_code >= 500
+
+
+def lost_update(writes: List[Write], final: Any) -> bool:
+    """True if `final` cannot be the value of any write that may have landed last"""
+    acknowledged = [w for w in writes if w.success]
+    if not acknowledged:
+        return False
+    last_start = max(w.start for w in acknowledged)
+    candidates = [w.value for w in writes if w.may_have_applied and w.end >= last_start]
+    return final not in candidates
+
+
+class LevelStats:
+    """Outcome of one scenario at one writer count"""
+
+    def __init__(self, writers: int):
+        self.writers = writers
+        self.latency = LatencyHistogram()
+        self.writes = 0
+        self.errors = 0
+        self.conflicts = 0      # 409/412/423 responses
+        self.rounds = 0
+        self.lost = 0           # rounds x rows whose final state no write explains
+        self.checked = 0
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return (self.writes - self.errors) / self.elapsed if self.elapsed else 0.0
+
+
+class ContentionBenchmark:
+    def __init__(self, client: AsyncLoadClient, rows: int = 1, categories: int = 5, seed: int = 0):
+        self.client = client
+        self.rows = rows
+        self.n_categories = categories
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.category_ids: List[str] = []
+        self.item_ids: List[str] = []
+        self.order_ids: List[str] = []
+
+    async def _create(self, endpoint: str, payload: Dict[str, Any]) -> Optional[str]:
+        result = await self.client.request("POST", endpoint, payload)
+        if result.success and isinstance(result.response_data, dict):
+            return result.response_data.get("id")
+        return None
+
+    async def setup(self, scenarios: List[str]) -> List[str]:
+        """Create fixtures; returns the scenarios that have them"""
+        needed = max(self.n_categories if REORDER in scenarios else 0, 1 if AVAILABILITY in scenarios else 0)
+        created = await asyncio.gather(*(self._create("/categories", FIXTURE_CATEGORY) for _ in range(needed)))
+        self.category_ids = [c for c in created if c]
+        if AVAILABILITY in scenarios and self.category_ids:
+            item = {**FIXTURE_ITEM, "category_id": self.category_ids[0]}
+            created = await asyncio.gather(*(self._create("/items", item) for _ in range(self.rows)))
+            self.item_ids = [i for i in created if i]
+        if STATUS in scenarios:
+            generator = SyntheticDataGenerator(seed=self.seed)
+            payloads = list(generator.iter_order_records(self.rows, payload_only=True))
+            created = await asyncio.gather(*(self._create("/orders", p) for p in payloads))
+            self.order_ids = [o for o in created if o]
+
+        ready = []
+        for scenario, ids, wanted in ((REORDER, self.category_ids, self.n_categories),
+                                      (AVAILABILITY, self.item_ids, self.rows),
+                                      (STATUS, self.order_ids, self.rows)):
+            if scenario not in scenarios:
+                continue
+            if len(ids) < wanted:
+                print(f"⚠️ Skipping {scenario}: could only create {len(ids)} of {wanted} fixtures")
+            else:
+                ready.append(scenario)
+        return ready
+
+    async def cleanup(self):
+        await asyncio.gather(*(self.client.request("DELETE", f"/items/{i}") for i in self.item_ids))
+        await asyncio.gather(*(self.client.request("DELETE", f"/categories/{c}") for c in self.category_ids))
+
+    def _next_write(self, scenario: str) -> Tuple[str, str, Any, Any]:
+        """(row, endpoint, body, value the row should hold afterwards)"""
+        if scenario == REORDER:
+            ids = self.category_ids[:self.n_categories]
+            orders = list(range(1, len(ids) + 1))
+            self.rng.shuffle(orders)
+            body = {"categories": [{"id": c, "order": o} for c, o in zip(ids, orders)]}
+            return REORDER, "/categories/reorder", body, tuple(orders)
+        if scenario == AVAILABILITY:
+            item_id = self.rng.choice(self.item_ids)
+            available = self.rng.random() < 0.5
+            return item_id, f"/items/{item_id}/availability", {"available": available}, available
+        order_id = self.rng.choice(self.order_ids)
+        status = self.rng.choice(UKRAINIAN_STATUSES)
+        return order_id, f"/orders/{order_id}/status", {"status": status}, status
+
+    async def _read_back(self, scenario: str) -> Dict[str, Any]:
+        """Final value of every row touched by the scenario"""
+        if scenario == REORDER:
+            result = await self.client.request("GET", "/categories")
+            categories = result.response_data if isinstance(result.response_data, list) else []
+            order = {c.get("id"): c.get("order") for c in categories if isinstance(c, dict)}
+            return {REORDER: tuple(order.get(c) for c in self.category_ids[:self.n_categories])}
+        ids, endpoint, field = ((self.item_ids, "/items/{}", "available") if scenario == AVAILABILITY
+                                else (self.order_ids, "/orders/{}", "status"))
+        results = await asyncio.gather(*(self.client.request("GET", endpoint.format(i)) for i in ids))
+        return {i: r.response_data.get(field) if isinstance(r.response_data, dict) else None
+                for i, r in zip(ids, results)}
+
+    async def _writer(self, scenario: str, writes: int, log: List[Write], stats: LevelStats):
+        for _ in range(writes):
+            row, endpoint, body, value = self._next_write(scenario)
+            start = time.perf_counter()
+            result = await self.client.request("PATCH", endpoint, body)
+            end = time.perf_counter()
+            log.append(Write(row, value, start, end, result.status_code, result.success))
+            stats.writes += 1
+            if result.success:
+                stats.latency.record(result.execution_time)
+            else:
+                stats.errors += 1
+                if result.status_code in (409, 412, 423):
+                    stats.conflicts += 1
+
+    async def run_level(self, scenario: str, writers: int, rounds: int, writes: int) -> LevelStats:
+        stats = LevelStats(writers)
+        for _ in range(rounds):
+            log: List[Write] = []
+            start = time.perf_counter()
+            await asyncio.gather(*(self._writer(scenario, writes, log, stats) for _ in range(writers)))
+            stats.elapsed += time.perf_counter() - start
+            final = await self._read_back(scenario)
+            stats.rounds += 1
+            for row, value in final.items():
+                row_writes = [w for w in log if w.row == row]
+                if row_writes:
+                    stats.checked += 1
+                    stats.lost += lost_update(row_writes, value)
+        return stats
+
+
+def print_scenario(scenario: str, levels: List[LevelStats]):
+    print(f"\n🤼 {scenario}:")
+    print(f"   {'writers':>7}{'writes/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>8}{'conflicts':>11}{'lost':>9}")
+    for s in levels:
+        h = s.latency
+        latencies = "".join(f"{h.percentile(p) * 1000:>7.0f}ms" for p in (50, 95, 99)) if h.count else f"{'-':>27}"
+        print(f"   {s.writers:>7}{s.throughput:>10.1f}{latencies}{s.errors / max(s.writes, 1):>8.1%}"
+              f"{s.conflicts:>11,}{s.lost:>5}/{s.checked:<3}")
+    measured = [s for s in levels if s.latency.count]
+    if len(measured) >= 2:
+        base, peak = measured[0], max(measured, key=lambda s: s.throughput)
+        last = measured[-1]
+        print(f"   Peak {peak.throughput:.1f} writes/s at {peak.writers} writers; at {last.writers} writers "
+              f"throughput is {last.throughput / max(peak.throughput, 1e-9):.0%} of peak and p99 "
+              f"{last.latency.percentile(99) / max(base.latency.percentile(99), 1e-9):.1f}x the "
+              f"{base.writers}-writer p99")
+    lost = sum(s.lost for s in levels)
+    if lost:
+        what = "non-atomic reorders" if scenario == REORDER else "lost updates"
+        print(f"   ❌ {lost} {what}: final state matched no write that could have landed last")
+    else:
+        print("   ✅ Final state always matched a write that could have landed last")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ROBOT write endpoints under concurrent-writer contention")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"comma-separated: {', '.join(SCENARIOS)}")
+    parser.add_argument("--writers", default=",".join(map(str, DEFAULT_WRITERS)),
+                        help="comma-separated writer counts")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per writer count")
+    parser.add_argument("--writes", type=int, default=10, help="writes per writer per round")
+    parser.add_argument("--rows", type=int, default=1, help="hot items/orders shared by all writers")
+    parser.add_argument("--categories", type=int, default=5, help="categories permuted by reorder")
+    parser.add_argument("--transport", default="requests", choices=["requests", "http.client"])
+    parser.add_argument("--target", default=BASE_URL)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="do not delete the fixture categories and items")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    writer_counts = sorted({int(w) for w in args.writers.split(",")})
+
+    harness = HarnessRun.from_env("contention_benchmark", target_url=args.target)
+    client = AsyncLoadClient.create(args.target, max(writer_counts + [args.rows]), args.transport, harness=harness)
+    benchmark = ContentionBenchmark(client, args.rows, args.categories, args.seed)
+    results: Dict[str, List[LevelStats]] = {}
+
+    async def run():
+        ready = await benchmark.setup(scenarios)
+        try:
+            for scenario in ready:
+                results[scenario] = []
+                for writers in writer_counts:
+                    results[scenario].append(await benchmark.run_level(scenario, writers, args.rounds, args.writes))
+        finally:
+            if not args.keep:
+                await benchmark.cleanup()
+
+    try:
+        asyncio.run(run())
+    finally:
+        client.close()
+    harness.close()
+    for scenario, levels in results.items():
+        print_scenario(scenario, levels)
+    lost = sum(s.lost for levels in results.values() for s in levels)
+    exit(0 if harness.passed_slos and results and not lost else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+ROBOT Test Harness Run
+
+Single entry point the test suites use to record request results and test
+steps. A run fans each record out to the logging sink and, when enabled,
+the streaming result exporters and live metrics, and aggregates a latency
+histogram per endpoint template that is checked against the SLO budgets
+and stored in the benchmark history on close. Tracing, cassettes,
+profiling and memory tracking attach to the run the same way.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, Optional, List, Callable
+
+from benchmark_history import BenchmarkHistory, current_git_sha
+from cassette import Cassette
+from latency_histogram import LatencyHistogram
+from live_metrics import LiveMetrics
+from memory_tracking import MemoryTracker, MemoryReport, print_report as print_memory_report
+from profiler import SamplingProfiler
+from result_export import ResultExporter
+from result_logging import ResultSink, format_result
+from route_templates import endpoint_template
+from tracing import Tracer, instrument as instrument_session
+from slo import SloReport, load_budgets, evaluate as evaluate_slo, print_report as print_slo_report, DEFAULT_BUDGET_FILE
+
+class EndpointStats:
+    """Latency histogram and counters for one endpoint template"""
+
+    __slots__ = ("histogram", "requests", "errors", "status_counts", "server_histogram", "network_histogram")
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.status_counts: Dict[str, int] = {}
+        # Only requests whose response reported its server time
+        self.server_histogram = LatencyHistogram()
+        self.network_histogram = LatencyHistogram()
+
+    def record(self, result):
+        self.histogram.record(result.execution_time)
+        self.requests += 1
+        if not result.success:
+            self.errors += 1
+        status = str(result.status_code)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        timing = getattr(result, "timing", None)
+        if timing is not None and timing.server_time is not None:
+            self.server_histogram.record(timing.server_time)
+            self.network_histogram.record(timing.network_time(result.execution_time))
+
+
+class StepOutcome:
+    """Handle yielded by HarnessRun.step(); lets a step fail without raising"""
+
+    __slots__ = ("name", "failure")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.failure: Optional[str] = None
+
+    def fail(self, message: str):
+        self.failure = message
+
+
+class HarnessRun:
+    """Per-suite recording hub"""
+
+    def __init__(self, suite: str, sink: ResultSink, exporter: Optional[ResultExporter] = None,
+                 history: Optional[BenchmarkHistory] = None, target_url: Optional[str] = None,
+                 budgets: Optional[Dict[str, Dict[str, float]]] = None, budget_source: str = "",
+                 live: Optional[LiveMetrics] = None, tracer: Optional[Tracer] = None,
+                 profiler: Optional[SamplingProfiler] = None, memory: Optional[MemoryTracker] = None,
+                 cassette: Optional[Cassette] = None):
+        self.suite = suite
+        self.sink = sink
+        self.exporter = exporter
+        self.history = history
+        self.target_url = target_url
+        self.budgets = budgets
+        self.budget_source = budget_source
+        self.slo_report: Optional[SloReport] = None
+        self.live = live
+        self.tracer = tracer
+        self.profiler = profiler
+        self.memory = memory
+        self.memory_report: Optional[MemoryReport] = None
+        self.cassette = cassette
+        self.current_step: Optional[str] = None
+        self.started_at = time.time()
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self._step_requests = 0
+        self._step_failures = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, suite: str, formatter: Callable[[Any], str] = format_result,
+                 target_url: Optional[str] = None) -> "HarnessRun":
+        """Build a run configured from ROBOT_* environment variables"""
+        budget_source = os.environ.get("ROBOT_SLO_FILE", DEFAULT_BUDGET_FILE)
+        return cls(suite, ResultSink.from_env(formatter=formatter), ResultExporter.from_env(suite),
+                   BenchmarkHistory.from_env(), target_url, load_budgets(budget_source), budget_source,
+                   LiveMetrics.from_env(suite), Tracer.from_env(suite), SamplingProfiler.from_env(),
+                   MemoryTracker.from_env(), Cassette.from_env())
+
+    def instrument(self, session):
+        """Attach the cassette and trace headers, when enabled, to a requests.Session"""
+        if self.cassette:
+            self.cassette.mount(session)
+        if self.tracer:
+            instrument_session(session, self.tracer)
+        return session
+
+    def record(self, result, in_flight: bool = False):
+        """Record one request result (safe to call from concurrent workers)
+
+        `in_flight` marks a result whose request was announced with
+        live.request_started(), as load clients do.
+        """
+        template = endpoint_template(result.method, result.endpoint)
+        if self.live:
+            self.live.request_finished(template, result.status_code, result.success, result.execution_time,
+                                       was_started=in_flight)
+        with self._lock:
+            self.sink.record(result)
+            stats = self.endpoints.get(template)
+            if stats is None:
+                stats = self.endpoints[template] = EndpointStats()
+            stats.record(result)
+            self._step_requests += 1
+            if not result.success:
+                self._step_failures += 1
+            if self.exporter:
+                self.exporter.record_request(result, self.current_step)
+
+    def note(self, text: str):
+        self.sink.note(text)
+
+    @contextmanager
+    def step(self, name: str):
+        """Group the requests made inside the block into a named test step
+
+        The step passes when the block raises nothing, does not call
+        fail() on the yielded StepOutcome and all of its requests
+        succeeded. Exceptions are recorded and re-raised.
+        """
+        previous = (self.current_step, self._step_requests, self._step_failures)
+        self.current_step = name
+        self._step_requests = 0
+        self._step_failures = 0
+        start_time = time.time()
+        outcome = StepOutcome(name)
+        error = None
+        span_context = self.tracer.step(name) if self.tracer else nullcontext()
+        try:
+            with span_context as span:
+                try:
+                    yield outcome
+                except Exception as e:
+                    error = str(e)
+                    raise
+                finally:
+                    if error is None:
+                        error = outcome.failure
+                    if span is not None:
+                        span.attributes["robot.step.requests"] = self._step_requests
+                        span.attributes["robot.step.failures"] = self._step_failures
+                        if outcome.failure:
+                            span.fail(outcome.failure)
+                        elif error is None and self._step_failures:
+                            span.fail(f"{self._step_failures} of {self._step_requests} requests failed")
+        finally:
+            self.record_step(name, error is None and self._step_failures == 0,
+                             time.time() - start_time, error, self._step_requests, self._step_failures)
+            self.current_step = previous[0]
+            self._step_requests += previous[1]
+            self._step_failures += previous[2]
+
+    def record_step(self, name: str, passed: bool, duration: float, error: Optional[str] = None,
+                    requests: int = 0, failures: int = 0):
+        """Record a test step outcome with its own request counts (for suites that track steps themselves)"""
+        if not passed and error is None and not failures:
+            error = "step failed without a failing request"
+        if self.exporter:
+            self.exporter.record_step(name, passed, duration, requests, failures, error)
+
+    def check_slos(self, templates: Optional[List[str]] = None) -> Optional[SloReport]:
+        """Evaluate the SLO budgets against what was recorded so far
+
+        With `templates`, only budgets for those endpoint templates are
+        checked. Returns None when no budget file is configured.
+        """
+        if self.budgets is None:
+            return None
+        budgets = self.budgets
+        if templates is not None:
+            budgets = {key: targets for key, targets in budgets.items() if key in templates}
+        return evaluate_slo(budgets, self.endpoints, time.time() - self.started_at, self.budget_source)
+
+    def print_time_split(self):
+        """Server vs network/queueing time per endpoint, for responses that reported server timing"""
+        timed = {template: stats for template, stats in self.endpoints.items() if stats.server_histogram.count}
+        if not timed:
+            return
+        print(f"\n🌐 Server vs Network Time (p50 / p95):")
+        for template, stats in sorted(timed.items()):
+            server, network = stats.server_histogram, stats.network_histogram
+            share = server.total / (server.total + network.total) if server.total + network.total else 0.0
+            print(f"   {template}: server {server.percentile(50):.3f}s / {server.percentile(95):.3f}s, "
+                  f"network {network.percentile(50):.3f}s / {network.percentile(95):.3f}s "
+                  f"({share:.0%} server, {server.count}/{stats.requests} timed)")
+
+    @property
+    def passed_slos(self) -> bool:
+        """False only when budgets were evaluated on close and violated"""
+        return self.slo_report is None or self.slo_report.passed
+
+    def close(self):
+        """Flush all output and check SLO budgets; call before printing the suite summary"""
+        if self.profiler:
+            self.profiler.stop()
+            paths = self.profiler.write(f"{self.suite}-{os.getpid()}")
+            print(f"🔥 Profile written: {', '.join(paths)} ({self.profiler.samples} samples)")
+            self.profiler = None
+        if self.memory:
+            self.memory.stop()
+            self.memory_report = self.memory.report()
+            self.memory = None
+        if self.live:
+            self.live.close()
+            self.live = None
+        self.sink.close()
+        if self.cassette:
+            print(f"📼 {self.cassette.close()}")
+            self.cassette = None
+        if self.tracer:
+            self.tracer.close()
+            print(f"🧵 Trace written: {self.tracer.path} ({self.tracer.spans_written} spans)")
+            self.tracer = None
+        if self.exporter:
+            self.exporter.close()
+            print(f"📁 Results exported: {', '.join(self.exporter.paths)}")
+            self.exporter = None
+        self.print_time_split()
+        if self.memory_report:
+            print_memory_report(self.memory_report)
+        if self.budgets is not None and self.slo_report is None:
+            self.slo_report = self.check_slos()
+            print_slo_report(self.slo_report)
+        if self.history:
+            run_id = self.history.record_run(self.suite, self.started_at, time.time(), self.endpoints,
+                                             target_url=self.target_url, git_sha=current_git_sha())
+            print(f"🗄️ Run #{run_id} stored in {self.history.path}")
+            self.history.close()
+            self.history = None
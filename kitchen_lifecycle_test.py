@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+ROBOT Kitchen Order-Lifecycle Load Test
+
+Creates orders at a Poisson --rate and lets a simulated kitchen move each
+one through нове → у реалізації → виконано with PATCH /orders/{id}/status,
+while simulated dashboards keep polling the filtered order lists:
+
+    python3 kitchen_lifecycle_test.py --orders 2000 --rate 5 --cooks 20 --target http://localhost:8000
+    python3 kitchen_lifecycle_test.py --orders 500 --time-scale 600 --dashboards 8 --poll-interval 1
+
+Service times follow the synthetic data model: an order is accepted after
+an exponential delay (mean --accept-mean), then waits for one of --cooks
+cooks, who takes a gamma-distributed time (mean --cook-mean) to finish it.
+--time-scale compresses kitchen time (60 = one kitchen minute per second),
+so when orders arrive faster than the cooks finish them the active-order
+set grows and list queries run against more and more open orders.
+
+Reported:
+- status-update latency per target status
+- read-after-write visibility lag: for a --visibility-sample share of the
+  updates, how long until GET /orders/{id} returns the new status
+- dashboard list-query latency by size of the active-order set, with the
+  fitted latency growth per 100 active orders
+
+Orders are real writes; point --target at a disposable deployment.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, Any, Optional, List
+
+from async_client import AsyncLoadClient
+from harness import HarnessRun
+from latency_histogram import LatencyHistogram
+from memory_tracking import fit_growth
+from polling import PollResult, VisibilityStats
+from synthetic_data import SyntheticDataGenerator, UKRAINIAN_STATUSES
+
+BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
+
+NEW, IN_PROGRESS, DONE = UKRAINIAN_STATUSES
+
+COOK_SHAPE = 4.0  # gamma shape of cooking times, as in synthetic_data
+
+# Lists the dashboards poll; the kitchen screen reads open orders far more often
+DASHBOARD_QUERIES = [
+    (0.4, f"/orders?status={NEW}"),
+    (0.4, f"/orders?status={IN_PROGRESS}"),
+    (0.1, f"/orders?status={DONE}&limit=50"),
+    (0.1, "/orders?limit=50"),
+]
+
+
+class KitchenSimulation:
+    """Order creation, kitchen staff and dashboards sharing one client"""
+
+    def __init__(self, client: AsyncLoadClient, time_scale: float = 60.0, accept_mean: float = 240.0,
+                 cook_mean: float = 1440.0, cooks: int = 20, dashboards: int = 4, poll_interval: float = 2.0,
+                 visibility_sample: float = 0.1, bucket: int = 100, seed: int = 0):
+        self.client = client
+        self.time_scale = time_scale
+        self.accept_mean = accept_mean
+        self.cook_mean = cook_mean
+        self.cooks = cooks
+        self.dashboards = dashboards
+        self.poll_interval = poll_interval
+        self.visibility_sample = visibility_sample
+        self.bucket = bucket
+        self.rng = random.Random(seed)
+        self.generator = SyntheticDataGenerator(seed=seed)
+        self.generator.generate_menu()
+
+        self.active = 0
+        self.peak_active = 0
+        self.counters = {"created": 0, "create_failed": 0, "completed": 0, "update_failed": 0, "lost": 0}
+        self.create_latency = LatencyHistogram()
+        self.update_latency: Dict[str, LatencyHistogram] = {IN_PROGRESS: LatencyHistogram(),
+                                                            DONE: LatencyHistogram()}
+        self.list_latency: Dict[int, LatencyHistogram] = {}  # active-set bucket -> latency
+        self.list_samples: List[tuple] = []                  # (active orders, latency) for the growth fit
+        self.visibility = VisibilityStats()
+        self._kitchen: Optional[asyncio.Queue] = None
+        self._background: set = set()
+
+    def _spawn(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def create_orders(self, total: int, rate: float):
+        start = time.perf_counter()
+        offset = 0.0
+        payloads = self.generator.iter_order_records(total, batch_size=1_000, payload_only=True)
+        for payload in payloads:
+            offset += self.rng.expovariate(rate)
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._spawn(self.create(payload))
+
+    async def create(self, payload: Dict[str, Any]):
+        result = await self.client.request("POST", "/orders", payload)
+        order_id = result.response_data.get("id") if isinstance(result.response_data, dict) else None
+        if not result.success or not order_id:
+            self.counters["create_failed"] += 1
+            return
+        self.create_latency.record(result.execution_time)
+        self.counters["created"] += 1
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        await asyncio.sleep(self.rng.expovariate(1.0 / self.accept_mean) / self.time_scale)
+        if await self.update(order_id, IN_PROGRESS):
+            await self._kitchen.put(order_id)
+        else:
+            self.counters["lost"] += 1
+            self.active -= 1
+
+    async def update(self, order_id: str, status: str) -> bool:
+        result = await self.client.request("PATCH", f"/orders/{order_id}/status", {"status": status})
+        if not result.success:
+            self.counters["update_failed"] += 1
+            return False
+        self.update_latency[status].record(result.execution_time)
+        if self.rng.random() < self.visibility_sample:
+            self._spawn(self.probe_visibility(order_id, status))
+        return True
+
+    async def probe_visibility(self, order_id: str, status: str, timeout: float = 10.0,
+                               initial_delay: float = 0.05, max_delay: float = 1.0):
+        """Poll GET /orders/{id} until it reports the status just written"""
+        start = time.perf_counter()
+        delay = initial_delay
+        attempts = 0
+        while True:
+            result = await self.client.request("GET", f"/orders/{order_id}")
+            attempts += 1
+            value = result.response_data.get("status") if isinstance(result.response_data, dict) else None
+            elapsed = time.perf_counter() - start
+            if value == status or elapsed >= timeout:
+                self.visibility.record(f"status → {status}", PollResult(value == status, value, attempts, elapsed))
+                return
+            await asyncio.sleep(min(delay, timeout - elapsed))
+            delay = min(delay * 2, max_delay)
+
+    async def cook(self):
+        while True:
+            order_id = await self._kitchen.get()
+            cook_time = self.rng.gammavariate(COOK_SHAPE, self.cook_mean / COOK_SHAPE) / self.time_scale
+            await asyncio.sleep(cook_time)
+            if await self.update(order_id, DONE):
+                self.counters["completed"] += 1
+            else:
+                self.counters["lost"] += 1
+            self.active -= 1
+            self._kitchen.task_done()
+
+    async def dashboard(self):
+        weights = [weight for weight, _ in DASHBOARD_QUERIES]
+        endpoints = [endpoint for _, endpoint in DASHBOARD_QUERIES]
+        # Dashboards open at different moments
+        await asyncio.sleep(self.rng.random() * self.poll_interval)
+        while True:
+            endpoint = self.rng.choices(endpoints, weights)[0]
+            active = self.active
+            result = await self.client.request("GET", endpoint)
+            if result.success:
+                bucket = active // self.bucket * self.bucket
+                self.list_latency.setdefault(bucket, LatencyHistogram()).record(result.execution_time)
+                self.list_samples.append((active, result.execution_time))
+            await asyncio.sleep(self.poll_interval * (0.5 + self.rng.random()))
+
+    async def run(self, orders: int, rate: float, max_duration: Optional[float] = None) -> float:
+        """Run until every created order is done (or max_duration passes)"""
+        start = time.perf_counter()
+        self._kitchen = asyncio.Queue()
+        staff = [asyncio.ensure_future(self.cook()) for _ in range(self.cooks)]
+        staff += [asyncio.ensure_future(self.dashboard()) for _ in range(self.dashboards)]
+
+        async def lifecycle():
+            await self.create_orders(orders, rate)
+            while self._background:
+                await asyncio.wait(set(self._background))
+            await self._kitchen.join()
+            # Visibility probes of the last updates
+            while self._background:
+                await asyncio.wait(set(self._background))
+
+        try:
+            await asyncio.wait_for(lifecycle(), max_duration)
+        except asyncio.TimeoutError:
+            print(f"⚠️ Stopped after {max_duration:.0f}s with {self.active:,} orders still active")
+        finally:
+            for task in staff + list(self._background):
+                task.cancel()
+            await asyncio.gather(*staff, *self._background, return_exceptions=True)
+        return time.perf_counter() - start
+
+
+def _percentiles(h: LatencyHistogram) -> str:
+    return (f"p50 {h.percentile(50) * 1000:.0f}ms, p95 {h.percentile(95) * 1000:.0f}ms, "
+            f"p99 {h.percentile(99) * 1000:.0f}ms")
+
+
+def print_report(simulation: KitchenSimulation, elapsed: float):
+    c = simulation.counters
+    print(f"\n🍳 Kitchen lifecycle ({elapsed:.0f}s): {c['created']:,} orders created, {c['completed']:,} completed, "
+          f"peak {simulation.peak_active:,} active")
+    failures = [(c["create_failed"], "creates failed"), (c["update_failed"], "status updates failed"),
+                (c["lost"], "orders abandoned after a failed update")]
+    details = ", ".join(f"{count:,} {label}" for count, label in failures if count)
+    if details:
+        print(f"   ❌ {details}")
+    if simulation.create_latency.count:
+        print(f"   POST /orders: {_percentiles(simulation.create_latency)}")
+    for status, h in simulation.update_latency.items():
+        if h.count:
+            print(f"   → {status}: {h.count:,} updates, {_percentiles(h)}")
+    simulation.visibility.print_summary()
+
+    if not simulation.list_latency:
+        return
+    print("\n📋 Dashboard list queries by active orders:")
+    print(f"   {'active':>11}{'queries':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for bucket in sorted(simulation.list_latency):
+        h = simulation.list_latency[bucket]
+        print(f"   {bucket:>5}-{bucket + simulation.bucket - 1:<5}{h.count:>9,}"
+              f"{h.percentile(50) * 1000:>7.0f}ms{h.percentile(95) * 1000:>7.0f}ms{h.percentile(99) * 1000:>7.0f}ms")
+    samples = simulation.list_samples
+    if len(samples) >= 2 and len({active for active, _ in samples}) >= 2:
+        trend = fit_growth("list latency", [active for active, _ in samples],
+                           [latency for _, latency in samples], min_growth=0.0)
+        print(f"   List latency grows {trend.slope * 100 * 1000:+.2f} ms per 100 active orders "
+              f"(R²={trend.r_squared:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the kitchen order lifecycle of the ROBOT API")
+    parser.add_argument("--orders", type=int, default=2000, help="orders to create")
+    parser.add_argument("--rate", type=float, default=5.0, help="orders created per second")
+    parser.add_argument("--cooks", type=int, default=20, help="orders cooked in parallel")
+    parser.add_argument("--accept-mean", type=float, default=240.0, help="mean kitchen seconds until accepted")
+    parser.add_argument("--cook-mean", type=float, default=1440.0, help="mean kitchen seconds to cook")
+    parser.add_argument("--time-scale", type=float, default=60.0, help="kitchen seconds per wall second")
+    parser.add_argument("--dashboards", type=int, default=4)
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="seconds between dashboard polls")
+    parser.add_argument("--visibility-sample", type=float, default=0.1,
+                        help="share of status updates checked for read-after-write visibility")
+    parser.add_argument("--bucket", type=int, default=100, help="active-order bucket width for list latency")
+    parser.add_argument("--max-duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--transport", default="requests", choices=["requests", "http.client"])
+    parser.add_argument("--target", default=BASE_URL)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    harness = HarnessRun.from_env("kitchen_lifecycle", target_url=args.target)
+    client = AsyncLoadClient.create(args.target, args.concurrency, args.transport, harness=harness)
+    simulation = KitchenSimulation(client, args.time_scale, args.accept_mean, args.cook_mean, args.cooks,
+                                   args.dashboards, args.poll_interval, args.visibility_sample, args.bucket,
+                                   args.seed)
+    print(f"🚀 {args.orders:,} orders at {args.rate:g}/s, {args.cooks} cooks, {args.dashboards} dashboards, "
+          f"kitchen time x{args.time_scale:g}")
+    try:
+        elapsed = asyncio.run(simulation.run(args.orders, args.rate, args.max_duration))
+    finally:
+        client.close()
+    harness.close()
+    print_report(simulation, elapsed)
+    c = simulation.counters
+    exit(0 if harness.passed_slos and not (c["create_failed"] or c["update_failed"]) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+ROBOT Latency Histogram
+
+Fixed-layout log-scale histogram for request latencies. Buckets grow by a
+constant ratio (2% by default) from 50µs to 120s, so any two histograms
+share bucket boundaries: they can be merged, stored as sparse snapshots
+and compared across runs. Percentiles are accurate to the bucket width.
+"""
+
+import math
+from typing import Dict, Any, Optional, List
+
+MIN_LATENCY = 0.00005   # 50µs
+MAX_LATENCY = 120.0     # 2 minutes
+GROWTH = 1.02           # bucket width ratio (±1% error)
+
+_LOG_GROWTH = math.log(GROWTH)
+BUCKETS = int(math.ceil(math.log(MAX_LATENCY / MIN_LATENCY) / _LOG_GROWTH)) + 1
+
+
+def bucket_index(value: float) -> int:
+    """Map a latency in seconds to its bucket"""
+    if value <= MIN_LATENCY:
+        return 0
+    index = int(math.log(value / MIN_LATENCY) / _LOG_GROWTH) + 1
+    return index if index < BUCKETS else BUCKETS - 1
+
+
+def bucket_upper_bound(index: int) -> float:
+    """Upper latency bound of a bucket in seconds"""
+    return MIN_LATENCY * GROWTH ** index
+
+
+def bucket_midpoint(index: int) -> float:
+    if index == 0:
+        return MIN_LATENCY
+    return MIN_LATENCY * GROWTH ** (index - 0.5)
+
+
+class LatencyHistogram:
+    """Mergeable latency histogram"""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value: float):
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram"):
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Latency at percentile p (0-100), clamped to the observed min/max"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(math.ceil(self.count * p / 100.0)))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(max(bucket_midpoint(i), self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max
+        }
+
+    def samples(self) -> List[float]:
+        """Expand to representative samples (bucket midpoints), for statistical tests"""
+        values = []
+        for i, c in enumerate(self.counts):
+            if c:
+                values.extend([bucket_midpoint(i)] * c)
+        return values
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Sparse, JSON-serializable representation"""
+        return {
+            "growth": GROWTH,
+            "min_latency": MIN_LATENCY,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max,
+            "buckets": {str(i): c for i, c in enumerate(self.counts) if c}
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Optional[Dict[str, Any]]) -> "LatencyHistogram":
+        histogram = cls()
+        if not data:
+            return histogram
+        if data.get("growth") != GROWTH or data.get("min_latency") != MIN_LATENCY:
+            raise ValueError("Histogram snapshot uses a different bucket layout")
+        for i, c in data["buckets"].items():
+            histogram.counts[int(i)] = c
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"] if data["min"] is not None else math.inf
+        histogram.max = data["max"]
+        return histogram
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+ROBOT Live Metrics
+
+Exposes counters and latency histograms of a running suite or load test
+while it runs:
+
+- ROBOT_METRICS_PORT=<port> serves Prometheus text format on
+  http://127.0.0.1:<port>/metrics
+- ROBOT_DASHBOARD=1 redraws a compact terminal view every second
+  (best combined with ROBOT_LOG_LEVEL=quiet)
+
+Every worker thread writes only to its own WorkerCounters (found through a
+thread-local), so the request path takes no locks; scrapes and dashboard
+redraws merge the per-worker values and tolerate reading a counter that
+is one update behind.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, List, Tuple
+
+from latency_histogram import LatencyHistogram, bucket_upper_bound
+
+# Prometheus histogram bucket bounds (seconds)
+PROMETHEUS_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+RATE_WINDOW = 10.0  # seconds over which the achieved rate is measured
+
+
+class WorkerCounters:
+    """Counters owned by a single worker thread"""
+
+    __slots__ = ("requests", "errors", "histograms", "started", "finished")
+
+    def __init__(self):
+        self.requests: Dict[str, int] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.started = 0
+        self.finished = 0
+
+
+class LiveMetrics:
+    """Registry of per-worker counters with merged, read-only views"""
+
+    def __init__(self, suite: str = ""):
+        self.suite = suite
+        self.started_at = time.time()
+        self.target_rate: Optional[float] = None
+        self._local = threading.local()
+        self._workers: List[WorkerCounters] = []
+        self._register_lock = threading.Lock()
+        self._rate_samples = deque()
+        self._rate_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._dashboard: Optional["MetricsDashboard"] = None
+
+    @classmethod
+    def from_env(cls, suite: str = "") -> Optional["LiveMetrics"]:
+        """Start the endpoint/dashboard selected by ROBOT_METRICS_PORT/ROBOT_DASHBOARD, or None"""
+        port = os.environ.get("ROBOT_METRICS_PORT")
+        dashboard = os.environ.get("ROBOT_DASHBOARD", "").lower() in ("1", "true", "yes")
+        if not port and not dashboard:
+            return None
+        metrics = cls(suite)
+        if port:
+            metrics.serve(int(port))
+        if dashboard:
+            metrics.start_dashboard()
+        return metrics
+
+    # Worker side (lock-free) ----------------------------------------------
+
+    def _counters(self) -> WorkerCounters:
+        counters = getattr(self._local, "counters", None)
+        if counters is None:
+            counters = self._local.counters = WorkerCounters()
+            with self._register_lock:
+                self._workers.append(counters)
+        return counters
+
+    def request_started(self):
+        """Mark a request as in flight (load clients call this before sending)"""
+        self._counters().started += 1
+
+    def request_finished(self, template: str, status_code, success: bool, latency: float,
+                         was_started: bool = False):
+        """Record a completed request under its endpoint template"""
+        counters = self._counters()
+        if was_started:
+            counters.finished += 1
+        counters.requests[template] = counters.requests.get(template, 0) + 1
+        if not success:
+            key = (template, str(status_code))
+            counters.errors[key] = counters.errors.get(key, 0) + 1
+        histogram = counters.histograms.get(template)
+        if histogram is None:
+            histogram = counters.histograms[template] = LatencyHistogram()
+        histogram.record(latency)
+
+    def set_target_rate(self, rate: Optional[float]):
+        self.target_rate = rate
+
+    # Reader side ----------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, object]:
+        """Merged view over all workers"""
+        requests: Dict[str, int] = {}
+        errors: Dict[Tuple[str, str], int] = {}
+        histograms: Dict[str, LatencyHistogram] = {}
+        in_flight = 0
+        with self._register_lock:
+            workers = list(self._workers)
+        for counters in workers:
+            for template, count in list(counters.requests.items()):
+                requests[template] = requests.get(template, 0) + count
+            for key, count in list(counters.errors.items()):
+                errors[key] = errors.get(key, 0) + count
+            for template, histogram in list(counters.histograms.items()):
+                merged = histograms.get(template)
+                if merged is None:
+                    merged = histograms[template] = LatencyHistogram()
+                merged.merge(histogram)
+            in_flight += counters.started - counters.finished
+        total = sum(requests.values())
+        return {
+            "requests": requests,
+            "errors": errors,
+            "histograms": histograms,
+            "in_flight": max(in_flight, 0),
+            "total": total,
+            "failed": sum(errors.values()),
+            "achieved_rate": self._achieved_rate(total),
+            "elapsed": time.time() - self.started_at
+        }
+
+    def _achieved_rate(self, total: int) -> float:
+        now = time.monotonic()
+        with self._rate_lock:
+            samples = self._rate_samples
+            samples.append((now, total))
+            while len(samples) > 2 and now - samples[0][0] > RATE_WINDOW:
+                samples.popleft()
+            if len(samples) < 2:
+                elapsed = time.time() - self.started_at
+                return total / elapsed if elapsed > 0 else 0.0
+            (t0, n0), (t1, n1) = samples[0], samples[-1]
+            return (n1 - n0) / (t1 - t0) if t1 > t0 else 0.0
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        snap = self.snapshot()
+        suite = _label(self.suite)
+        lines = [
+            "# HELP robot_requests_total Completed requests per endpoint template.",
+            "# TYPE robot_requests_total counter",
+        ]
+        for template, count in sorted(snap["requests"].items()):
+            method, route = _split(template)
+            lines.append(f'robot_requests_total{{suite="{suite}",method="{method}",route="{route}"}} {count}')
+        lines += [
+            "# HELP robot_request_errors_total Failed requests per endpoint template and status code.",
+            "# TYPE robot_request_errors_total counter",
+        ]
+        for (template, status), count in sorted(snap["errors"].items()):
+            method, route = _split(template)
+            lines.append(f'robot_request_errors_total{{suite="{suite}",method="{method}",route="{route}",'
+                         f'status="{_label(status)}"}} {count}')
+        lines += [
+            "# HELP robot_requests_in_flight Requests sent and not yet completed.",
+            "# TYPE robot_requests_in_flight gauge",
+            f'robot_requests_in_flight{{suite="{suite}"}} {snap["in_flight"]}',
+            "# HELP robot_request_duration_seconds Request latency per endpoint template.",
+            "# TYPE robot_request_duration_seconds histogram",
+        ]
+        for template, histogram in sorted(snap["histograms"].items()):
+            method, route = _split(template)
+            labels = f'suite="{suite}",method="{method}",route="{route}"'
+            for bound, count in _cumulative(histogram):
+                lines.append(f'robot_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'robot_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"robot_request_duration_seconds_sum{{{labels}}} {histogram.total:.6f}")
+            lines.append(f"robot_request_duration_seconds_count{{{labels}}} {histogram.count}")
+        lines += [
+            "# HELP robot_achieved_rate_rps Completed requests per second over the last "
+            f"{RATE_WINDOW:.0f}s.",
+            "# TYPE robot_achieved_rate_rps gauge",
+            f'robot_achieved_rate_rps{{suite="{suite}"}} {snap["achieved_rate"]:.3f}',
+        ]
+        if self.target_rate is not None:
+            lines += [
+                "# HELP robot_target_rate_rps Request rate the load generator aims for.",
+                "# TYPE robot_target_rate_rps gauge",
+                f'robot_target_rate_rps{{suite="{suite}"}} {self.target_rate:.3f}',
+            ]
+        return "\n".join(lines) + "\n"
+
+    # Exposition -----------------------------------------------------------
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> int:
+        """Serve /metrics from a daemon thread; returns the bound port"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="live-metrics", daemon=True).start()
+        bound = self._server.server_address[1]
+        print(f"📡 Live metrics: http://{host}:{bound}/metrics")
+        return bound
+
+    def start_dashboard(self, interval: float = 1.0, stream=None):
+        self._dashboard = MetricsDashboard(self, interval, stream)
+        self._dashboard.start()
+
+    def close(self):
+        if self._dashboard:
+            self._dashboard.stop()
+            self._dashboard = None
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class MetricsDashboard:
+    """Periodically redrawn terminal view of LiveMetrics"""
+
+    def __init__(self, metrics: LiveMetrics, interval: float = 1.0, stream=None, rows: int = 15):
+        self.metrics = metrics
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.rows = rows
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-dashboard", daemon=True)
+        self._lines_drawn = 0
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.draw()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.draw()
+
+    def render(self) -> List[str]:
+        snap = self.metrics.snapshot()
+        target = f" / target {self.metrics.target_rate:,.1f}" if self.metrics.target_rate is not None else ""
+        lines = [
+            f"📡 {self.metrics.suite or 'ROBOT'} | {snap['elapsed']:6.1f}s | {snap['total']:,} requests | "
+            f"❌ {snap['failed']:,} | in flight {snap['in_flight']} | {snap['achieved_rate']:,.1f} req/s{target}",
+            f"   {'endpoint':<44}{'n':>8}{'err':>6}{'p50':>9}{'p95':>9}{'p99':>9}",
+        ]
+        errors_by_template: Dict[str, int] = {}
+        for (template, _), count in snap["errors"].items():
+            errors_by_template[template] = errors_by_template.get(template, 0) + count
+        busiest = sorted(snap["requests"].items(), key=lambda item: -item[1])[:self.rows]
+        for template, count in busiest:
+            histogram = snap["histograms"][template]
+            lines.append(f"   {template[:44]:<44}{count:>8}{errors_by_template.get(template, 0):>6}"
+                         f"{histogram.percentile(50) * 1000:>7.0f}ms{histogram.percentile(95) * 1000:>7.0f}ms"
+                         f"{histogram.percentile(99) * 1000:>7.0f}ms")
+        return lines
+
+    def draw(self):
+        lines = self.render()
+        out = ""
+        if self._lines_drawn:
+            out += f"\x1b[{self._lines_drawn}F"  # cursor up to the previous frame
+        out += "".join(f"\x1b[2K{line}\n" for line in lines)
+        self.stream.write(out)
+        self.stream.flush()
+        self._lines_drawn = len(lines)
+
+
+def _split(template: str) -> Tuple[str, str]:
+    method, _, route = template.partition(" ")
+    return _label(method), _label(route)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _cumulative(histogram: LatencyHistogram):
+    """(le, cumulative count) for PROMETHEUS_BUCKETS from the fine-grained histogram"""
+    counts = histogram.counts
+    index = 0
+    running = 0
+    for bound in PROMETHEUS_BUCKETS:
+        while index < len(counts) and bucket_upper_bound(index) <= bound:
+            running += counts[index]
+            index += 1
+        yield bound, running
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+ROBOT Load Client
+
+The suites' make_request() path as a reusable client for load and
+benchmark modes, with pluggable transports and JSON codecs:
+
+    transports: requests (requests.Session, as the suites use)
+                http.client (one persistent connection per thread)
+    codecs:     json (stdlib), orjson (if installed)
+
+Each call encodes the body, sends it, decodes the response, decides
+success the same way the suites do and records the TestResult on the
+HarnessRun. Safe to share between threads.
+"""
+
+import http.client
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple
+from urllib.parse import urlsplit, quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from server_timing import ResponseTiming, timing_from_headers
+
+
+@dataclass
+class TestResult:
+    endpoint: str
+    method: str
+    success: bool
+    status_code: int
+    response_data: Any
+    error_message: Optional[str] = None
+    execution_time: float = 0.0
+    timing: Optional[ResponseTiming] = None
+
+
+# Transports -------------------------------------------------------------
+
+class RequestsTransport:
+    """requests.Session with a connection pool sized for the worker count"""
+
+    name = "requests"
+
+    def __init__(self, base_url: str, timeout: float = 30.0, pool_size: int = 10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def send(self, method: str, path: str, body: Optional[bytes],
+             headers: Dict[str, str]) -> Tuple[int, Any, bytes, str]:
+        response = self.session.request(method, self.base_url + path, data=body, headers=headers,
+                                        timeout=self.timeout)
+        return response.status_code, response.headers, response.content, response.reason
+
+    def close(self):
+        self.session.close()
+
+
+_URL_SAFE = "/?&=%:;@!$'()*+,~"  # percent-encode only what http.client rejects (e.g. Cyrillic values)
+
+
+class HttpClientTransport:
+    """Bare http.client with a keep-alive connection per thread"""
+
+    name = "http.client"
+
+    def __init__(self, base_url: str, timeout: float = 30.0, pool_size: int = 10):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            factory = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            connection = self._local.connection = factory(self.host, self.port, timeout=self.timeout)
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def send(self, method: str, path: str, body: Optional[bytes],
+             headers: Dict[str, str]) -> Tuple[int, Any, bytes, str]:
+        for attempt in (1, 2):
+            connection = self._connection()
+            try:
+                connection.request(method, quote(self.prefix + path, safe=_URL_SAFE), body=body, headers=headers)
+                response = connection.getresponse()
+                return response.status, response.headers, response.read(), response.reason
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                    ConnectionResetError, BrokenPipeError):
+                # Server closed an idle keep-alive connection; reconnect once
+                connection.close()
+                self._local.connection = None
+                if attempt == 2:
+                    raise
+
+    def close(self):
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+
+
+TRANSPORTS = {"requests": RequestsTransport, "http.client": HttpClientTransport}
+
+
+# Codecs -----------------------------------------------------------------
+
+class JsonCodec:
+    name = "json"
+
+    def encode(self, data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    def decode(self, body: bytes) -> Any:
+        return json.loads(body)
+
+
+class OrjsonCodec:
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def encode(self, data: Any) -> bytes:
+        return self._orjson.dumps(data)
+
+    def decode(self, body: bytes) -> Any:
+        return self._orjson.loads(body)
+
+
+CODECS = {"json": JsonCodec, "orjson": OrjsonCodec}
+
+
+def available_codecs() -> List[str]:
+    """Codec names whose dependencies are installed"""
+    names = []
+    for name, codec in CODECS.items():
+        try:
+            codec()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+# Client -----------------------------------------------------------------
+
+class LoadClient:
+    """make_request() equivalent over a transport and codec"""
+
+    def __init__(self, transport, codec=None, harness=None, headers: Optional[Dict[str, str]] = None):
+        self.transport = transport
+        self.codec = codec or JsonCodec()
+        self.harness = harness
+        self.headers = {"Content-Type": "application/json"}
+        if headers:
+            self.headers.update(headers)
+        if harness is not None and hasattr(transport, "session"):
+            harness.instrument(transport.session)
+
+    @classmethod
+    def create(cls, base_url: str, transport: str = "requests", codec: str = "json", harness=None,
+               pool_size: int = 10, timeout: float = 30.0) -> "LoadClient":
+        return cls(TRANSPORTS[transport](base_url, timeout=timeout, pool_size=pool_size),
+                   CODECS[codec](), harness)
+
+    def request(self, method: str, endpoint: str, data: Any = None, expect_success: bool = True,
+                headers: Optional[Dict[str, str]] = None) -> TestResult:
+        """Send one request and record its result"""
+        request_headers = self.headers if not headers else {**self.headers, **headers}
+        body = self.codec.encode(data) if data is not None else None
+        live = self.harness.live if self.harness is not None else None
+        if live:
+            live.request_started()
+        start_time = time.perf_counter()
+        try:
+            status, response_headers, content, reason = self.transport.send(method, endpoint, body,
+                                                                            request_headers)
+        except Exception as e:
+            result = TestResult(endpoint, method, False, 0, None, str(e), time.perf_counter() - start_time)
+        else:
+            execution_time = time.perf_counter() - start_time
+            response_data = None
+            if content:
+                try:
+                    response_data = self.codec.decode(content)
+                except ValueError:
+                    response_data = content.decode("utf-8", "replace")
+            success = status < 400 if expect_success else status >= 400
+            error_message = None
+            if not success:
+                if isinstance(response_data, dict) and "detail" in response_data:
+                    error_message = str(response_data["detail"])
+                elif isinstance(response_data, dict) and "message" in response_data:
+                    error_message = response_data["message"]
+                else:
+                    error_message = f"HTTP {status}: {reason}"
+            result = TestResult(endpoint, method, success, status, response_data, error_message,
+                                execution_time, timing_from_headers(response_headers))
+        if self.harness is not None:
+            self.harness.record(result, in_flight=live is not None)
+        return result
+
+    def close(self):
+        self.transport.close()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+ROBOT Load Profiles
+
+Open-loop load generator with configurable shapes, followed by a
+saturation analysis per endpoint template and for the whole mix:
+
+    ramp    rate climbs linearly from --rate to --peak-rate over --duration
+    step    --steps plateaus of --step-duration, from --rate up by --step-rate
+    spike   --rate, jumping to --peak-rate at --spike-at for --spike-duration
+    soak    constant --rate for --duration
+
+    python3 load_profiles.py ramp --rate 1 --peak-rate 60 --duration 300
+    python3 load_profiles.py step --rate 5 --step-rate 5 --steps 8 --step-duration 30 --mix read
+    python3 load_profiles.py spike --rate 5 --peak-rate 80 --spike-at 60 --spike-duration 15 --duration 180
+    python3 load_profiles.py soak --rate 10 --duration 3600 --mix read
+
+Arrivals are Poisson (or evenly spaced with --arrivals uniform) at the
+profile's current rate and never wait for earlier responses, so latency
+is measured from each request's scheduled start. Arrivals beyond 4 x
+--concurrency pending requests are shed: counted as errors and recorded
+at the client timeout, as no response ever came. Mixes:
+
+    read    GET /orders (list and filtered)
+    write   POST /orders with synthetic payloads
+    orders  80% read / 20% write (default)
+
+POST /orders creates real orders on the target; point --target at a
+disposable deployment for write mixes.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+from async_client import AsyncLoadClient
+from harness import HarnessRun
+from route_templates import endpoint_template
+from saturation_analysis import WindowRecorder, MIX, analyze, print_capacity
+from synthetic_data import SyntheticDataGenerator, UKRAINIAN_STATUSES
+
+BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
+
+MIN_RATE = 0.1  # requests/s used where a profile's rate is zero
+
+
+@dataclass
+class LoadProfile:
+    """Offered request rate as a function of time"""
+    name: str
+    duration: float
+    rate: Callable[[float], float]
+    spike: Optional[Tuple[float, float]] = None  # (start, end) for spike profiles
+
+    def peak(self, step: float = 1.0) -> float:
+        return max(self.rate(t * step) for t in range(int(self.duration / step) + 1))
+
+
+def ramp(start_rate: float, end_rate: float, duration: float) -> LoadProfile:
+    return LoadProfile("ramp", duration, lambda t: start_rate + (end_rate - start_rate) * min(t / duration, 1.0))
+
+
+def step(start_rate: float, step_rate: float, steps: int, step_duration: float) -> LoadProfile:
+    return LoadProfile("step", steps * step_duration,
+                       lambda t: start_rate + step_rate * min(int(t // step_duration), steps - 1))
+
+
+def spike(base_rate: float, peak_rate: float, spike_at: float, spike_duration: float,
+          duration: float) -> LoadProfile:
+    end = spike_at + spike_duration
+    return LoadProfile("spike", duration, lambda t: peak_rate if spike_at <= t < end else base_rate,
+                       spike=(spike_at, end))
+
+
+def soak(rate: float, duration: float) -> LoadProfile:
+    return LoadProfile("soak", duration, lambda t: rate)
+
+
+def arrival_times(profile: LoadProfile, poisson: bool = True, seed: int = 0):
+    """Offsets (seconds) of scheduled requests; the rate is re-read at every arrival"""
+    rng = random.Random(seed)
+    t = 0.0
+    while True:
+        rate = max(profile.rate(t), MIN_RATE)
+        t += rng.expovariate(rate) if poisson else 1.0 / rate
+        if t >= profile.duration:
+            return
+        yield t
+
+
+class RequestMix:
+    """Weighted choice of request factories"""
+
+    def __init__(self, entries: List[Tuple[float, Callable[[], Tuple[str, str, Any]]]], seed: int = 0):
+        total = sum(weight for weight, _ in entries)
+        self.cumulative = []
+        running = 0.0
+        for weight, factory in entries:
+            running += weight / total
+            self.cumulative.append((running, factory))
+        self.rng = random.Random(seed)
+
+    def next(self) -> Tuple[str, str, Any]:
+        x = self.rng.random()
+        for bound, factory in self.cumulative:
+            if x <= bound:
+                return factory()
+        return self.cumulative[-1][1]()
+
+
+def build_mix(name: str, seed: int = 0) -> RequestMix:
+    rng = random.Random(seed)
+    generator = SyntheticDataGenerator(seed=seed)
+    generator.generate_menu()
+    payloads = generator.iter_order_records(10 ** 9, batch_size=500, payload_only=True)
+
+    def list_orders():
+        return "GET", "/orders?limit=50", None
+
+    def filtered_orders():
+        return "GET", f"/orders?status={rng.choice(UKRAINIAN_STATUSES)}", None
+
+    def create_order():
+        return "POST", "/orders", next(payloads)
+
+    reads = [(0.6, list_orders), (0.4, filtered_orders)]
+    if name == "read":
+        return RequestMix(reads, seed)
+    if name == "write":
+        return RequestMix([(1.0, create_order)], seed)
+    if name == "orders":
+        return RequestMix([(0.48, list_orders), (0.32, filtered_orders), (0.2, create_order)], seed)
+    raise ValueError(f"Unknown mix '{name}'")
+
+
+MIXES = ["read", "write", "orders"]
+
+
+async def run_profile(profile: LoadProfile, client: AsyncLoadClient, mix: RequestMix,
+                      recorder: WindowRecorder, poisson: bool = True, seed: int = 0) -> Dict[str, Any]:
+    """Fire the profile's arrivals; returns run counters"""
+    start = time.perf_counter()
+    pending = set()
+    max_pending = client.concurrency * 4
+    counters = {"scheduled": 0, "shed": 0}
+    live = client.harness.live if client.harness is not None else None
+
+    async def fire(method: str, endpoint: str, data: Any, scheduled_at: float, template: str):
+        result = await client.request(method, endpoint, data)
+        response_time = time.perf_counter() - start - scheduled_at
+        recorder.completed(template, scheduled_at, response_time, result.success)
+
+    for offset in arrival_times(profile, poisson, seed):
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if live:
+            live.set_target_rate(profile.rate(offset))
+        method, endpoint, data = mix.next()
+        template = endpoint_template(method, endpoint)
+        recorder.offered(template, offset)
+        counters["scheduled"] += 1
+        if len(pending) >= max_pending:
+            # The target (or this client) cannot keep up: count the arrival as failed
+            # instead of queueing without bound, censored at the client timeout since
+            # it never got a response
+            counters["shed"] += 1
+            recorder.completed(template, offset, client.timeout, False)
+            continue
+        task = asyncio.ensure_future(fire(method, endpoint, data, offset, template))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.wait(pending)
+    counters["elapsed"] = time.perf_counter() - start
+    return counters
+
+
+def p99_budget(harness: HarnessRun, template: str) -> Optional[float]:
+    """p99 budget for a template (or its query-less route) from the SLO file"""
+    if not harness.budgets:
+        return None
+    for key in (template, template.partition("?")[0]):
+        targets = harness.budgets.get(key)
+        if targets and "p99" in targets:
+            return targets["p99"]
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a ROBOT load profile and find the saturation knee")
+    parser.add_argument("profile", choices=["ramp", "step", "spike", "soak"])
+    parser.add_argument("--rate", type=float, default=1.0, help="start/base rate (req/s)")
+    parser.add_argument("--peak-rate", type=float, default=50.0, help="ramp end / spike rate (req/s)")
+    parser.add_argument("--duration", type=float, default=300.0, help="seconds (ramp, spike, soak)")
+    parser.add_argument("--step-rate", type=float, default=5.0, help="rate added per step")
+    parser.add_argument("--steps", type=int, default=8)
+    parser.add_argument("--step-duration", type=float, default=30.0)
+    parser.add_argument("--spike-at", type=float, default=60.0)
+    parser.add_argument("--spike-duration", type=float, default=15.0)
+    parser.add_argument("--mix", choices=MIXES, default="orders")
+    parser.add_argument("--arrivals", choices=["poisson", "uniform"], default="poisson")
+    parser.add_argument("--window", type=float, default=5.0, help="analysis window (s)")
+    parser.add_argument("--concurrency", type=int, default=64, help="max requests in flight")
+    parser.add_argument("--transport", default="requests", choices=["requests", "http.client"])
+    parser.add_argument("--target", default=BASE_URL)
+    parser.add_argument("--p99-limit", type=float, help="latency limit for sustainable throughput (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--windows", action="store_true", help="print every analysis window")
+    args = parser.parse_args()
+
+    if args.profile == "ramp":
+        profile = ramp(args.rate, args.peak_rate, args.duration)
+    elif args.profile == "step":
+        profile = step(args.rate, args.step_rate, args.steps, args.step_duration)
+    elif args.profile == "spike":
+        profile = spike(args.rate, args.peak_rate, args.spike_at, args.spike_duration, args.duration)
+    else:
+        profile = soak(args.rate, args.duration)
+
+    harness = HarnessRun.from_env(f"load_{profile.name}", target_url=args.target)
+    client = AsyncLoadClient.create(args.target, args.concurrency, args.transport, harness=harness)
+    recorder = WindowRecorder(args.window)
+    print(f"🚀 {profile.name} profile: {profile.duration:.0f}s, peak {profile.peak():.1f} req/s, "
+          f"{args.mix} mix, {args.arrivals} arrivals, concurrency {args.concurrency}")
+    try:
+        counters = asyncio.run(run_profile(profile, client, build_mix(args.mix, args.seed), recorder,
+                                           args.arrivals == "poisson", args.seed))
+    finally:
+        client.close()
+    harness.close()
+
+    print(f"\n📊 {counters['scheduled']:,} requests scheduled in {counters['elapsed']:.0f}s"
+          + (f", {counters['shed']:,} shed (more than {args.concurrency * 4} pending)" if counters["shed"] else ""))
+    keys = sorted(key for key in recorder.windows if key != MIX) + [MIX]
+    for key in keys:
+        limit = args.p99_limit if args.p99_limit is not None else p99_budget(harness, key)
+        report = analyze(key, recorder.windows[key], args.window, limit, profile.spike,
+                         soak=profile.name == "soak")
+        print_capacity(report, show_windows=args.windows and key == MIX)
+    exit(0 if harness.passed_slos else 1)
+
+
+if __name__ == "__main__":
+    main()
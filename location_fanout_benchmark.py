@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+ROBOT Multi-Location Fan-Out Benchmark
+
+Chains push the same change to all their locations at once. This
+benchmark applies a delivery-fee change (PUT /locations/{id}/delivery-settings)
+and an opening-hours change (PUT /locations/{id}) to N locations at each of
+a series of concurrency levels:
+
+    python3 location_fanout_benchmark.py --locations 100 --target http://localhost:8000
+    python3 location_fanout_benchmark.py --concurrency 1,4,16 --operations delivery-settings
+
+For every operation and level it reports the end-to-end fan-out time, the
+time until GET /locations shows the change on every location
+(propagation), per-request latency and errors, then picks the level with
+the shortest end-to-end time that produced no errors. Levels above the
+first one that errors are skipped unless --keep-going is given.
+
+The API cannot create locations, so the fan-out targets the deployment's
+existing ones; when there are fewer than --locations, they are reused
+round-robin. Every location's original settings are read first and put
+back at the end unless --no-restore is given.
+"""
+
+import argparse
+import asyncio
+import copy
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List
+
+from async_client import AsyncLoadClient
+from harness import HarnessRun
+from latency_histogram import LatencyHistogram
+
+BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
+
+DELIVERY_SETTINGS = "delivery-settings"
+LOCATION = "location"
+OPERATIONS = [DELIVERY_SETTINGS, LOCATION]
+
+DEFAULT_CONCURRENCY = [1, 2, 4, 8, 16, 32, 64]
+
+LOCATION_FIELDS = ["name", "address", "phone", "hours", "socials"]
+
+DEFAULT_DELIVERY_SETTINGS = [
+    {"method": "pickup", "enabled": True, "delivery_fee": 0.0},
+    {"method": "courier", "enabled": True, "delivery_fee": 5.0},
+    {"method": "self", "enabled": False, "delivery_fee": 0.0}
+]
+
+DEFAULT_HOURS = {day: {"open": "09:00", "close": "22:00"} for day in ("mon", "tue", "wed", "thu", "fri", "sat", "sun")}
+
+
+@dataclass
+class FanOutResult:
+    operation: str
+    concurrency: int
+    requests: int
+    errors: int
+    elapsed: float                  # first request sent -> last response
+    propagation: Optional[float]    # first request sent -> change visible everywhere
+    latency: LatencyHistogram
+
+    @property
+    def clean(self) -> bool:
+        return self.errors == 0
+
+
+def courier_fee(settings: Any) -> Optional[float]:
+    for method in settings or []:
+        if isinstance(method, dict) and method.get("method") == "courier":
+            return method.get("delivery_fee")
+    return None
+
+
+def closing_time(location: Dict[str, Any]) -> Optional[str]:
+    hours = location.get("hours") or {}
+    monday = hours.get("mon") or {}
+    return monday.get("close")
+
+
+class LocationFanOut:
+    def __init__(self, client: AsyncLoadClient, locations: int = 100, propagation_timeout: float = 30.0):
+        self.client = client
+        self.n_locations = locations
+        self.propagation_timeout = propagation_timeout
+        self.originals: Dict[str, Dict[str, Any]] = {}
+        self.targets: List[str] = []
+
+    async def load(self) -> bool:
+        """Read the existing locations and pick the fan-out targets"""
+        result = await self.client.request("GET", "/locations")
+        locations = result.response_data if isinstance(result.response_data, list) else []
+        self.originals = {loc["id"]: loc for loc in locations if isinstance(loc, dict) and loc.get("id")}
+        if not self.originals:
+            return False
+        ids = list(self.originals)
+        self.targets = [ids[i % len(ids)] for i in range(self.n_locations)]
+        if len(ids) < self.n_locations:
+            print(f"⚠️ Only {len(ids)} locations exist; each is updated up to "
+                  f"{-(-self.n_locations // len(ids))} times per fan-out")
+        return True
+
+    def _body(self, operation: str, location_id: str, step: int) -> Any:
+        """Request body for the `step`-th change; each step sets a distinct value"""
+        original = self.originals[location_id]
+        if operation == DELIVERY_SETTINGS:
+            settings = copy.deepcopy(original.get("delivery_settings") or DEFAULT_DELIVERY_SETTINGS)
+            if courier_fee(settings) is None:
+                settings.append({"method": "courier", "enabled": True, "delivery_fee": 0.0})
+            for method in settings:
+                if method.get("method") == "courier":
+                    method["delivery_fee"] = self._fee(step)
+            return settings
+        body = {key: copy.deepcopy(original[key]) for key in LOCATION_FIELDS if original.get(key) is not None}
+        hours = body.setdefault("hours", copy.deepcopy(DEFAULT_HOURS))
+        for day in hours.values():
+            if isinstance(day, dict):
+                day["close"] = self._close(step)
+        return body
+
+    @staticmethod
+    def _fee(step: int) -> float:
+        return 40.0 + step * 0.5
+
+    @staticmethod
+    def _close(step: int) -> str:
+        minutes = 21 * 60 + step % 120
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+    def _endpoint(self, operation: str, location_id: str) -> str:
+        suffix = "/delivery-settings" if operation == DELIVERY_SETTINGS else ""
+        return f"/locations/{location_id}{suffix}"
+
+    async def _visible(self, operation: str, step: int) -> bool:
+        result = await self.client.request("GET", "/locations")
+        if not isinstance(result.response_data, list):
+            return False
+        current = {loc.get("id"): loc for loc in result.response_data if isinstance(loc, dict)}
+        for location_id in set(self.targets):
+            loc = current.get(location_id) or {}
+            if operation == DELIVERY_SETTINGS:
+                if courier_fee(loc.get("delivery_settings")) != self._fee(step):
+                    return False
+            elif closing_time(loc) != self._close(step):
+                return False
+        return True
+
+    async def fan_out(self, operation: str, concurrency: int, step: int) -> FanOutResult:
+        semaphore = asyncio.Semaphore(concurrency)
+        latency = LatencyHistogram()
+        errors = 0
+
+        async def put(location_id: str):
+            nonlocal errors
+            async with semaphore:
+                result = await self.client.request("PUT", self._endpoint(operation, location_id),
+                                                   self._body(operation, location_id, step))
+            if result.success:
+                latency.record(result.execution_time)
+            else:
+                errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(put(location_id) for location_id in self.targets))
+        elapsed = time.perf_counter() - start
+
+        propagation = None
+        delay = 0.05
+        while time.perf_counter() - start < elapsed + self.propagation_timeout:
+            if await self._visible(operation, step):
+                propagation = time.perf_counter() - start
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+        return FanOutResult(operation, concurrency, len(self.targets), errors, elapsed, propagation, latency)
+
+    async def restore(self, concurrency: int) -> int:
+        """Put every location's original settings back; returns the failures"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def put(endpoint: str, body: Any) -> bool:
+            async with semaphore:
+                return (await self.client.request("PUT", endpoint, body)).success
+
+        requests = []
+        for location_id, original in self.originals.items():
+            if location_id not in self.targets:
+                continue
+            body = {key: original[key] for key in LOCATION_FIELDS if original.get(key) is not None}
+            requests.append(put(f"/locations/{location_id}", body))
+            if original.get("delivery_settings") is not None:
+                requests.append(put(f"/locations/{location_id}/delivery-settings", original["delivery_settings"]))
+        results = await asyncio.gather(*requests)
+        return results.count(False)
+
+
+def best_level(results: List[FanOutResult]) -> Optional[FanOutResult]:
+    return min((r for r in results if r.clean), key=lambda r: r.elapsed, default=None)
+
+
+def print_operation(operation: str, results: List[FanOutResult]):
+    print(f"\n🏪 {operation} fan-out to {results[0].requests} locations:")
+    print(f"   {'conc.':>5}{'total':>9}{'visible':>9}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>8}")
+    for r in results:
+        h = r.latency
+        latencies = "".join(f"{h.percentile(p) * 1000:>7.0f}ms" for p in (50, 95, 99)) if h.count else f"{'-':>27}"
+        visible = f"{r.propagation:>8.2f}s" if r.propagation is not None else f"{'never':>9}"
+        print(f"   {r.concurrency:>5}{r.elapsed:>8.2f}s{visible}{r.requests / r.elapsed:>8.1f}{latencies}{r.errors:>8,}")
+    best = best_level(results)
+    if best:
+        serial = next((r for r in results if r.concurrency == 1 and r.clean), None)
+        speedup = f", {serial.elapsed / best.elapsed:.1f}x faster than one at a time" if serial and best is not serial else ""
+        print(f"   ✅ Best concurrency {best.concurrency}: {best.elapsed:.2f}s end to end without errors{speedup}")
+    else:
+        print("   ❌ Every concurrency level produced errors")
+    if any(r.propagation is None for r in results):
+        print("   ⚠️ Some fan-outs never became visible in GET /locations")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fanning location changes out to many ROBOT locations")
+    parser.add_argument("--locations", type=int, default=100, help="locations to update per fan-out")
+    parser.add_argument("--concurrency", default=",".join(map(str, DEFAULT_CONCURRENCY)),
+                        help="comma-separated concurrency levels")
+    parser.add_argument("--operations", default=",".join(OPERATIONS), help=f"comma-separated: {', '.join(OPERATIONS)}")
+    parser.add_argument("--propagation-timeout", type=float, default=30.0,
+                        help="seconds to wait for GET /locations to show a fan-out")
+    parser.add_argument("--keep-going", action="store_true", help="also try levels above the first that errors")
+    parser.add_argument("--no-restore", action="store_true", help="leave the last change in place")
+    parser.add_argument("--transport", default="requests", choices=["requests", "http.client"])
+    parser.add_argument("--target", default=BASE_URL)
+    args = parser.parse_args()
+
+    operations = [op.strip() for op in args.operations.split(",") if op.strip()]
+    unknown = set(operations) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+    levels = sorted({int(c) for c in args.concurrency.split(",")})
+
+    harness = HarnessRun.from_env("location_fanout", target_url=args.target)
+    client = AsyncLoadClient.create(args.target, max(levels), args.transport, harness=harness)
+    fanout = LocationFanOut(client, args.locations, args.propagation_timeout)
+    results: Dict[str, List[FanOutResult]] = {}
+    restore_failures = 0
+
+    async def run():
+        nonlocal restore_failures
+        if not await fanout.load():
+            print("❌ GET /locations returned no locations to update")
+            return
+        try:
+            step = 0
+            for operation in operations:
+                results[operation] = []
+                for level in levels:
+                    step += 1
+                    result = await fanout.fan_out(operation, level, step)
+                    results[operation].append(result)
+                    if not result.clean and not args.keep_going:
+                        break
+        finally:
+            if not args.no_restore:
+                best = [best_level(r) for r in results.values()]
+                restore_failures = await fanout.restore(min((b.concurrency for b in best if b), default=1))
+
+    try:
+        asyncio.run(run())
+    finally:
+        client.close()
+    harness.close()
+    for operation, operation_results in results.items():
+        print_operation(operation, operation_results)
+    if restore_failures:
+        print(f"\n⚠️ {restore_failures} requests failed while restoring the original location settings")
+    clean = results and all(best_level(r) for r in results.values())
+    exit(0 if harness.passed_slos and clean and not restore_failures else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+ROBOT Lunch-Rush Availability Storm
+
+When a dish sells out, staff "86" it with PATCH /items/{id}/availability
+(the web app's updateItemAvailability call) and every open menu refetches
+GET /items?categoryId=... at once. This scenario builds a large menu, puts
+--readers menu readers on it and runs three phases:
+
+    baseline   readers only: each reader refetches its category every
+               --read-interval seconds (jittered)
+    storm      plus availability toggles at --toggle-rate per second; each
+               toggle makes the category's readers refetch immediately
+               (up to --fanout of them)
+    cooldown   readers only again
+
+    python3 lunch_rush_storm.py --target http://localhost:8000
+    python3 lunch_rush_storm.py --items 400 --categories 16 --readers 3000 --toggle-rate 5 --storm 120
+
+Reported:
+- toggle latency
+- observation lag: from a toggle's acknowledgement until the first
+  refetch of its category shows the new availability, and the share of
+  refetches that still returned the old value
+- read-path latency per phase and how far the storm degraded it
+
+Toggles favour popular dishes and flip an item to the opposite of its
+last acknowledged state. Reads beyond 4 x --concurrency pending are shed
+and counted rather than queued. The menu's categories and items are
+created up front and deleted at the end unless --keep is given.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, Any, Optional, List
+
+from async_client import AsyncLoadClient
+from harness import HarnessRun
+from latency_histogram import LatencyHistogram
+from synthetic_data import SyntheticDataGenerator
+
+BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
+
+BASELINE = "baseline"
+STORM = "storm"
+COOLDOWN = "cooldown"
+PHASES = [BASELINE, STORM, COOLDOWN]
+
+CATEGORY_NAMES = {"ua": "Меню {}", "pl": "Menu {}", "en": "Menu {}", "by": "Меню {}"}
+
+
+class MenuItem:
+    __slots__ = ("id", "category_id", "available", "version", "weight", "busy")
+
+    def __init__(self, item_id: str, category_id: str, available: bool, weight: float):
+        self.id = item_id
+        self.category_id = category_id
+        self.available = available
+        self.version = 0      # acknowledged toggles so far
+        self.weight = weight  # popularity, for choosing what sells out
+        self.busy = False     # a toggle is in flight
+
+
+class AvailabilityStorm:
+    """Menu readers and availability toggles sharing one client"""
+
+    def __init__(self, client: AsyncLoadClient, readers: int = 2000, read_interval: float = 10.0,
+                 toggle_rate: float = 2.0, fanout: int = 200, observe_timeout: float = 10.0, seed: int = 0):
+        self.client = client
+        self.readers = readers
+        self.read_interval = read_interval
+        self.toggle_rate = toggle_rate
+        self.fanout = fanout
+        self.observe_timeout = observe_timeout
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.items: List[MenuItem] = []
+        self.category_ids: List[str] = []
+        self.phase = BASELINE
+
+        self.toggle_latency = LatencyHistogram()
+        self.observation_lag = LatencyHistogram()
+        self.read_latency: Dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in PHASES}
+        self.counters = {"toggles": 0, "toggle_errors": 0, "reads": 0, "read_errors": 0, "shed": 0,
+                         "refetches": 0, "stale": 0, "unobserved": 0}
+        self._pending: set = set()
+        self._subscribers: Dict[str, int] = {}  # category -> readers refetching on a toggle
+
+    async def setup(self, n_items: int, n_categories: int) -> bool:
+        generator = SyntheticDataGenerator(seed=self.seed)
+        menu = generator.generate_menu(n_items, n_categories)
+        records = list(menu.records())
+        synthetic_categories = sorted({r["category_id"] for r in records})
+
+        async def create(endpoint: str, payload: Dict[str, Any]) -> Optional[str]:
+            result = await self.client.request("POST", endpoint, payload)
+            return result.response_data.get("id") if result.success and isinstance(result.response_data, dict) else None
+
+        created = await asyncio.gather(*(
+            create("/categories", {"name": {lang: name.format(i + 1) for lang, name in CATEGORY_NAMES.items()},
+                                   "visible": True})
+            for i in range(len(synthetic_categories))))
+        category_map = {synthetic: real for synthetic, real in zip(synthetic_categories, created) if real}
+        self.category_ids = list(category_map.values())
+
+        records = [r for r in records if r["category_id"] in category_map]
+        bodies = [{**{k: v for k, v in r.items() if k != "id"}, "category_id": category_map[r["category_id"]]}
+                  for r in records]
+        item_ids = await asyncio.gather(*(create("/items", body) for body in bodies))
+        # Zipf-like popularity like the synthetic order mix: a few dishes sell out most
+        for rank, (body, item_id) in enumerate(zip(bodies, item_ids), start=1):
+            if item_id:
+                self.items.append(MenuItem(item_id, body["category_id"], body["available"], 1.0 / rank ** 1.1))
+        self.rng.shuffle(self.items)
+        # Readers spread over categories by menu size; a toggle wakes at most --fanout of them
+        for item in self.items:
+            self._subscribers[item.category_id] = self._subscribers.get(item.category_id, 0) + 1
+        for category_id, size in self._subscribers.items():
+            self._subscribers[category_id] = max(1, min(self.readers * size // len(self.items), self.fanout))
+        return bool(self.items)
+
+    async def cleanup(self):
+        await asyncio.gather(*(self.client.request("DELETE", f"/items/{item.id}") for item in self.items))
+        await asyncio.gather(*(self.client.request("DELETE", f"/categories/{c}") for c in self.category_ids))
+
+    def _submit(self, coroutine) -> Optional[asyncio.Future]:
+        """Schedule a request, or shed it when too much work is pending"""
+        if len(self._pending) >= self.client.concurrency * 4:
+            coroutine.close()
+            self.counters["shed"] += 1
+            return None
+        task = asyncio.ensure_future(coroutine)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return task
+
+    async def read(self, category_id: str) -> Optional[List[Dict[str, Any]]]:
+        phase = self.phase
+        result = await self.client.request("GET", f"/items?categoryId={category_id}")
+        self.counters["reads"] += 1
+        if not result.success or not isinstance(result.response_data, list):
+            self.counters["read_errors"] += 1
+            return None
+        self.read_latency[phase].record(result.execution_time)
+        return result.response_data
+
+    async def refetch(self, item: MenuItem, version: int, expected: bool, acked_at: float, observed: List[bool]):
+        """One reader's immediate refetch after a toggle of `item`"""
+        items = await self.read(item.category_id)
+        if items is None or item.version != version:
+            return  # failed, or a later toggle of the item makes this one moot
+        self.counters["refetches"] += 1
+        row = next((i for i in items if isinstance(i, dict) and i.get("id") == item.id), None)
+        if row is None or row.get("available") != expected:
+            self.counters["stale"] += 1
+        elif not observed[0]:
+            observed[0] = True
+            self.observation_lag.record(time.perf_counter() - acked_at)
+
+    async def toggle(self, item: MenuItem):
+        if item.busy:
+            return  # staff do not 86 a dish twice at once
+        item.busy = True
+        try:
+            await self._toggle(item)
+        finally:
+            item.busy = False
+
+    async def _toggle(self, item: MenuItem):
+        available = not item.available
+        result = await self.client.request("PATCH", f"/items/{item.id}/availability", {"available": available})
+        self.counters["toggles"] += 1
+        if not result.success:
+            self.counters["toggle_errors"] += 1
+            return
+        acked_at = time.perf_counter()
+        self.toggle_latency.record(result.execution_time)
+        item.available = available
+        item.version += 1
+        version = item.version
+        observed = [False]
+        refetches = [self._submit(self.refetch(item, version, available, acked_at, observed))
+                     for _ in range(self._subscribers[item.category_id])]
+        refetches = [task for task in refetches if task is not None]
+        if refetches:
+            await asyncio.wait(refetches)
+        # Every immediate refetch was stale: keep one reader polling to measure the real lag
+        delay = 0.05
+        while not observed[0] and time.perf_counter() - acked_at < self.observe_timeout:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+            await self.refetch(item, version, available, acked_at, observed)
+        if not observed[0]:
+            self.counters["unobserved"] += 1
+
+    async def _poisson(self, rate: float, until: float, action):
+        start = time.perf_counter()
+        offset = 0.0
+        while True:
+            offset += self.rng.expovariate(rate)
+            if offset >= until:
+                return
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            action()
+
+    async def run(self, baseline: float, storm: float, cooldown: float) -> Dict[str, float]:
+        """Run the three phases; returns each phase's duration"""
+        read_rate = self.readers / self.read_interval
+        weights = [item.weight for item in self.items]
+
+        def background_read():
+            self._submit(self.read(self.rng.choice(self.category_ids)))
+
+        def sell_out():
+            self._submit(self.toggle(self.rng.choices(self.items, weights)[0]))
+
+        durations = {}
+        for phase, duration in ((BASELINE, baseline), (STORM, storm), (COOLDOWN, cooldown)):
+            if duration <= 0:
+                continue
+            self.phase = phase
+            start = time.perf_counter()
+            loops = [self._poisson(read_rate, duration, background_read)]
+            if phase == STORM:
+                loops.append(self._poisson(self.toggle_rate, duration, sell_out))
+            await asyncio.gather(*loops)
+            durations[phase] = time.perf_counter() - start
+        if self._pending:
+            await asyncio.wait(set(self._pending))
+        return durations
+
+
+def _percentiles(h: LatencyHistogram) -> str:
+    return (f"p50 {h.percentile(50) * 1000:.0f}ms, p95 {h.percentile(95) * 1000:.0f}ms, "
+            f"p99 {h.percentile(99) * 1000:.0f}ms")
+
+
+def print_report(storm: AvailabilityStorm, durations: Dict[str, float]):
+    c = storm.counters
+    print(f"\n🍽️ Lunch-rush availability storm: {len(storm.items):,} items in {len(storm.category_ids)} categories, "
+          f"{storm.readers:,} readers")
+    if c["toggles"]:
+        print(f"   Toggles: {c['toggles']:,} ({c['toggle_errors']:,} failed), {_percentiles(storm.toggle_latency)}")
+    if storm.observation_lag.count:
+        print(f"   Readers observed a toggle after {_percentiles(storm.observation_lag)}, "
+              f"max {storm.observation_lag.max * 1000:.0f}ms")
+    if c["refetches"]:
+        print(f"   {c['stale'] / c['refetches']:.1%} of {c['refetches']:,} refetches after a toggle were stale")
+    if c["unobserved"]:
+        print(f"   ❌ {c['unobserved']:,} toggles never became visible within {storm.observe_timeout:.0f}s")
+
+    print(f"   {'phase':<10}{'reads':>8}{'reads/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for phase in PHASES:
+        h = storm.read_latency[phase]
+        if phase in durations and h.count:
+            print(f"   {phase:<10}{h.count:>8,}{h.count / durations[phase]:>9.1f}"
+                  f"{h.percentile(50) * 1000:>7.0f}ms{h.percentile(95) * 1000:>7.0f}ms{h.percentile(99) * 1000:>7.0f}ms")
+    base, peak = storm.read_latency[BASELINE], storm.read_latency[STORM]
+    if base.count and peak.count:
+        print(f"   Read p99 during the storm is {peak.percentile(99) / max(base.percentile(99), 1e-9):.1f}x baseline")
+    failures = [(c["read_errors"], "reads failed"), (c["shed"], "requests shed (too many pending)")]
+    details = ", ".join(f"{count:,} {label}" for count, label in failures if count)
+    if details:
+        print(f"   ⚠️ {details}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a lunch-rush availability-toggle storm against the ROBOT API")
+    parser.add_argument("--items", type=int, default=200, help="menu items to create")
+    parser.add_argument("--categories", type=int, default=12)
+    parser.add_argument("--readers", type=int, default=2000, help="concurrent menu readers")
+    parser.add_argument("--read-interval", type=float, default=10.0, help="seconds between a reader's refetches")
+    parser.add_argument("--toggle-rate", type=float, default=2.0, help="availability toggles per second")
+    parser.add_argument("--fanout", type=int, default=200, help="max readers refetching after one toggle")
+    parser.add_argument("--baseline", type=float, default=30.0, help="seconds before the storm")
+    parser.add_argument("--storm", type=float, default=60.0, help="seconds of toggles")
+    parser.add_argument("--cooldown", type=float, default=30.0, help="seconds after the storm")
+    parser.add_argument("--observe-timeout", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--transport", default="requests", choices=["requests", "http.client"])
+    parser.add_argument("--target", default=BASE_URL)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="do not delete the menu afterwards")
+    args = parser.parse_args()
+
+    harness = HarnessRun.from_env("lunch_rush_storm", target_url=args.target)
+    client = AsyncLoadClient.create(args.target, args.concurrency, args.transport, harness=harness)
+    storm = AvailabilityStorm(client, args.readers, args.read_interval, args.toggle_rate, args.fanout,
+                              args.observe_timeout, args.seed)
+    durations: Dict[str, float] = {}
+
+    async def run():
+        try:
+            if not await storm.setup(args.items, args.categories):
+                print("❌ Could not create the menu")
+                return
+            print(f"🚀 {len(storm.items):,} items, {args.readers:,} readers at {args.readers / args.read_interval:.0f} "
+                  f"reads/s, {args.toggle_rate:g} toggles/s for {args.storm:.0f}s")
+            durations.update(await storm.run(args.baseline, args.storm, args.cooldown))
+        finally:
+            if not args.keep:
+                await storm.cleanup()
+
+    try:
+        asyncio.run(run())
+    finally:
+        client.close()
+    harness.close()
+    if durations:
+        print_report(storm, durations)
+    c = storm.counters
+    exit(0 if harness.passed_slos and durations and not (c["toggle_errors"] or c["unobserved"]) else 1)
+
+
+if __name__ == "__main__":
+    main()
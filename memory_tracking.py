@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+ROBOT Memory Growth Tracking
+
+Periodic memory snapshots for long (soak) runs: process RSS plus the
+tracemalloc heap grouped by call site, with a linear-growth detector that
+flags series that rise steadily across snapshots.
+
+Allocations are attributed to the innermost frame in the harness' own
+code (this directory), so bytes allocated by json/requests on behalf of
+`self.created_orders.append(...)` or a retained `response_data` are
+charged to the suite line that keeps them alive; allocations with no
+harness frame on the stack are grouped by their own file and line.
+
+Enabled with ROBOT_MEMORY_INTERVAL=<seconds>; ROBOT_MEMORY_FRAMES sets
+the traceback depth tracemalloc keeps (default 16, 0 = RSS only).
+tracemalloc slows allocation-heavy code noticeably, so keep it off for
+latency measurements.
+"""
+
+import linecache
+import os
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List, Tuple
+
+_THIS_FILE = os.path.abspath(__file__)
+HARNESS_DIR = os.path.dirname(_THIS_FILE) + os.sep
+
+DEFAULT_INTERVAL = 30.0
+DEFAULT_FRAMES = 16
+TRACKED_SITES = 20         # call sites followed per snapshot
+MIN_SNAPSHOTS = 5          # snapshots before growth is judged
+MIN_R_SQUARED = 0.8        # how linear a series must be to count as growth
+MIN_GROWTH_BYTES = 1 << 20  # ignore growth below 1 MiB over the run
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size in bytes (Linux /proc; peak RSS elsewhere), or None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+@dataclass
+class MemorySnapshot:
+    at: float                  # seconds since tracking started
+    rss: Optional[int]
+    traced: int                # bytes currently traced by tracemalloc
+    sites: Dict[str, int] = field(default_factory=dict)  # call site -> bytes
+
+
+@dataclass
+class GrowthTrend:
+    """Least-squares fit of one series over the snapshots"""
+    name: str
+    start: float
+    end: float
+    slope: float      # bytes per second
+    r_squared: float
+    growing: bool
+
+    @property
+    def per_hour(self) -> float:
+        return self.slope * 3600
+
+
+def fit_growth(name: str, times: List[float], values: List[float], min_snapshots: int = MIN_SNAPSHOTS,
+               min_r_squared: float = MIN_R_SQUARED, min_growth: float = MIN_GROWTH_BYTES) -> GrowthTrend:
+    """Flag a series as growing when it rises linearly (high R²) by a meaningful amount"""
+    n = len(values)
+    if n < 2:
+        value = values[0] if values else 0.0
+        return GrowthTrend(name, value, value, 0.0, 0.0, False)
+    mean_t = sum(times) / n
+    mean_v = sum(values) / n
+    var_t = sum((t - mean_t) ** 2 for t in times)
+    var_v = sum((v - mean_v) ** 2 for v in values)
+    cov = sum((t - mean_t) * (v - mean_v) for t, v in zip(times, values))
+    slope = cov / var_t if var_t else 0.0
+    r_squared = cov * cov / (var_t * var_v) if var_t and var_v else 0.0
+    fitted_growth = slope * (times[-1] - times[0])
+    growing = (n >= min_snapshots and slope > 0 and r_squared >= min_r_squared
+               and fitted_growth >= min_growth)
+    return GrowthTrend(name, values[0], values[-1], slope, r_squared, growing)
+
+
+def _harness_site(traceback) -> str:
+    """file:line of the innermost harness frame, else of the allocating frame"""
+    for frame in reversed(traceback):  # tracemalloc orders frames oldest first
+        if frame.filename.startswith(HARNESS_DIR) and frame.filename != _THIS_FILE:
+            return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+    frame = traceback[-1]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+@dataclass
+class MemoryReport:
+    duration: float
+    snapshots: int
+    rss: Optional[GrowthTrend]
+    traced: Optional[GrowthTrend]
+    sites: List[GrowthTrend]
+
+    @property
+    def leaking(self) -> bool:
+        return any(trend.growing for trend in [self.rss, self.traced] + self.sites if trend)
+
+
+class MemoryTracker:
+    """Takes memory snapshots from a daemon thread"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, frames: int = DEFAULT_FRAMES,
+                 tracked_sites: int = TRACKED_SITES):
+        self.interval = interval
+        self.frames = frames
+        self.tracked_sites = tracked_sites
+        self.snapshots: List[MemorySnapshot] = []
+        self.site_series: Dict[str, List[Tuple[float, int]]] = {}
+        self._started_at = 0.0
+        self._owns_tracemalloc = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["MemoryTracker"]:
+        """A started tracker when ROBOT_MEMORY_INTERVAL is set, else None"""
+        interval = os.environ.get("ROBOT_MEMORY_INTERVAL")
+        if not interval:
+            return None
+        tracker = cls(float(interval), int(os.environ.get("ROBOT_MEMORY_FRAMES", DEFAULT_FRAMES)))
+        tracker.start()
+        return tracker
+
+    def start(self):
+        if self.frames and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracemalloc = True
+        self._started_at = time.monotonic()
+        self.snapshot()
+        self._thread = threading.Thread(target=self._run, name="memory-tracker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Take a final snapshot and stop tracing"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.snapshot()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.snapshot()
+
+    def snapshot(self) -> MemorySnapshot:
+        at = time.monotonic() - self._started_at
+        sites: Dict[str, int] = {}
+        traced = 0
+        if tracemalloc.is_tracing():
+            heap = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, linecache.__file__),
+            ])
+            for stat in heap.statistics("traceback"):
+                site = _harness_site(stat.traceback)
+                sites[site] = sites.get(site, 0) + stat.size
+                traced += stat.size
+            biggest = sorted(sites, key=sites.get, reverse=True)[:self.tracked_sites]
+            # Follow the current top sites and every site followed before (absent -> 0 bytes)
+            for site in set(biggest) | set(self.site_series):
+                self.site_series.setdefault(site, []).append((at, sites.get(site, 0)))
+            sites = {site: sites[site] for site in biggest}
+        snapshot = MemorySnapshot(at, current_rss(), traced, sites)
+        self.snapshots.append(snapshot)
+        return snapshot
+
+    def report(self) -> MemoryReport:
+        times = [s.at for s in self.snapshots]
+        rss_values = [s.rss for s in self.snapshots if s.rss is not None]
+        rss = fit_growth("RSS", times[-len(rss_values):], rss_values) if rss_values else None
+        traced = fit_growth("traced heap", times, [s.traced for s in self.snapshots]) if self.frames else None
+        sites = []
+        for site, series in self.site_series.items():
+            trend = fit_growth(site, [t for t, _ in series], [size for _, size in series])
+            if trend.end > trend.start:
+                sites.append(trend)
+        sites.sort(key=lambda trend: (not trend.growing, -(trend.end - trend.start)))
+        return MemoryReport(times[-1] if times else 0.0, len(self.snapshots), rss, traced, sites)
+
+
+def _size(value: float) -> str:
+    if abs(value) < 1 << 20:
+        return f"{value / 1024:,.1f} KiB"
+    return f"{value / (1 << 20):,.1f} MiB"
+
+
+def print_report(report: MemoryReport, emit=print, limit: int = 10):
+    emit(f"\n🧠 Memory ({report.snapshots} snapshots over {report.duration:.0f}s):")
+    for trend in (report.rss, report.traced):
+        if trend is None:
+            continue
+        marker = "⚠️" if trend.growing else "✅"
+        emit(f"   {marker} {trend.name}: {_size(trend.start)} -> {_size(trend.end)} "
+             f"({_size(trend.per_hour)}/h, R²={trend.r_squared:.2f})")
+    if report.snapshots < MIN_SNAPSHOTS:
+        emit(f"   ℹ️ Growth is judged from {MIN_SNAPSHOTS} snapshots on; "
+             f"lower ROBOT_MEMORY_INTERVAL for short runs")
+    if report.sites:
+        emit("   Growth by call site:")
+        for trend in report.sites[:limit]:
+            marker = "⚠️" if trend.growing else "  "
+            emit(f"   {marker} {trend.name}: +{_size(trend.end - trend.start)} "
+                 f"({_size(trend.per_hour)}/h, R²={trend.r_squared:.2f})")
+    if report.leaking:
+        emit("   ⚠️ Linear memory growth detected")
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+ROBOT Order-Burst Simulator
+
+Drives POST /orders the way the delivery platforms do: every order source
+(resto, telegram, glovo, bolt, wolt, custom) sends Poisson arrivals at its
+share of --rate, and on top of that steady state:
+
+- an aggregator outage: orders placed on the --outage-sources platforms
+  between --outage-at and --outage-at + --outage-duration are held back
+  and dumped on the API together the moment the outage ends (a
+  correlated burst across platforms)
+- a reconnect flood: at --flood-at, a --flood-fraction of the aggregator
+  orders already delivered are redelivered at once, as webhooks are after
+  a platform reconnects
+
+    python3 order_burst_simulator.py --rate 2 --duration 300 --target http://localhost:8000
+    python3 order_burst_simulator.py --rate 5 --outage-at 60 --outage-duration 90 --flood-at 200
+    python3 order_burst_simulator.py --rate 5 --dry-run      # schedule only
+
+Each platform's payload carries its own external order id, and every
+delivery of an order (retries and redeliveries included) sends the same
+body with the same Idempotency-Key header. Retries back off exponentially
+on connection errors, 408/429 and 5xx. An external id that comes back with
+more than one order id is reported as a duplicate.
+
+Admission latency runs from the moment a platform hands an order to the
+API until the API accepts it, retries included. Queue drain time is how
+long the API took to admit the whole backlog released by the outage (or
+the flood). POST /orders creates real orders; point --target at a
+disposable deployment.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Set
+
+from async_client import AsyncLoadClient
+from harness import HarnessRun
+from latency_histogram import LatencyHistogram
+from synthetic_data import SyntheticDataGenerator, ORDER_SOURCES, SOURCE_WEIGHTS, AGGREGATOR_SOURCES
+
+BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
+
+STEADY = "steady"
+BURST = "burst"
+FLOOD = "flood"
+KINDS = [STEADY, BURST, FLOOD]
+
+# External order id format per source
+EXTERNAL_IDS = {
+    "resto": "POS-{:09d}",
+    "telegram": "tg-{:09d}",
+    "glovo": "GLV-{:09d}",
+    "bolt": "BOLT{:010d}",
+    "wolt": "wolt_{:012x}",
+    "custom": "WEB-{:09d}",
+}
+
+RETRYABLE_STATUSES = {0, 408, 425, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class Order:
+    """One order as a platform sees it; every delivery sends the same body and key"""
+    source: str
+    external_id: str
+    created_at: float    # seconds into the run when the customer placed it
+    payload: Dict[str, Any]
+    order_ids: Set[str] = field(default_factory=set)
+
+    @property
+    def idempotency_key(self) -> str:
+        return f"{self.source}:{self.external_id}"
+
+
+@dataclass
+class Delivery:
+    order: Order
+    at: float            # seconds into the run when the platform sends it
+    kind: str
+
+
+class PayloadFactory:
+    """Synthetic order payloads reshaped per source"""
+
+    def __init__(self, seed: int = 0):
+        generator = SyntheticDataGenerator(seed=seed)
+        generator.generate_menu()
+        self._records = generator.iter_order_records(10 ** 9, batch_size=2_000, payload_only=True)
+        self._by_source: Dict[str, List[Dict[str, Any]]] = {source: [] for source in ORDER_SOURCES}
+        self._rng = random.Random(seed)
+        # Time-based so that a rerun does not reuse the previous run's keys
+        self._sequence = int(time.time()) % 10 ** 5 * 10 ** 4
+
+    def _record(self, source: str) -> Dict[str, Any]:
+        # Draw from the generator's own source mix so aggregator orders keep their
+        # delivery and payment shape
+        pool = self._by_source[source]
+        while not pool:
+            record = next(self._records)
+            self._by_source[record["source"]].append(record)
+        return pool.pop()
+
+    def order(self, source: str, created_at: float) -> Order:
+        self._sequence += 1
+        external_id = EXTERNAL_IDS[source].format(self._sequence)
+        payload = self._record(source)
+        payload["external_id"] = external_id
+        if source in AGGREGATOR_SOURCES:
+            payload["platform"] = {"name": source, "order_ref": external_id}
+        elif source == "telegram":
+            payload["customer"]["telegram_id"] = self._rng.randrange(10 ** 8, 10 ** 10)
+        return Order(source, external_id, created_at, payload)
+
+
+def build_schedule(rate: float, duration: float, factory: PayloadFactory, outage_at: Optional[float] = None,
+                   outage_duration: float = 0.0, outage_sources: Set[str] = AGGREGATOR_SOURCES,
+                   flood_at: Optional[float] = None, flood_fraction: float = 0.5,
+                   seed: int = 0) -> List[Delivery]:
+    """All deliveries of the run, ordered by send time"""
+    rng = random.Random(seed)
+    outage_end = outage_at + outage_duration if outage_at is not None else None
+    deliveries = []
+    for source, weight in zip(ORDER_SOURCES, SOURCE_WEIGHTS):
+        source_rate = rate * weight
+        if source_rate <= 0:
+            continue
+        t = rng.expovariate(source_rate)
+        while t < duration:
+            order = factory.order(source, t)
+            held = outage_end is not None and source in outage_sources and outage_at <= t < outage_end
+            deliveries.append(Delivery(order, outage_end if held else t, BURST if held else STEADY))
+            t += rng.expovariate(source_rate)
+    if flood_at is not None:
+        delivered = [d.order for d in deliveries if d.at < flood_at and d.order.source in AGGREGATOR_SOURCES]
+        for order in rng.sample(delivered, int(len(delivered) * flood_fraction)):
+            deliveries.append(Delivery(order, flood_at, FLOOD))
+    deliveries.sort(key=lambda d: d.at)
+    return deliveries
+
+
+class SourceStats:
+    """Admission outcomes of one source (or one delivery kind)"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.deliveries = 0
+        self.admitted = 0
+        self.failed = 0
+        self.retries = 0
+
+
+class BurstSimulation:
+    """Sends a schedule and tracks admission, retries and backlog drain"""
+
+    def __init__(self, client: AsyncLoadClient, retries: int = 3, backoff: float = 0.5, seed: int = 0):
+        self.client = client
+        self.retries = retries
+        self.backoff = backoff
+        self.rng = random.Random(seed)
+        self.by_source: Dict[str, SourceStats] = {source: SourceStats() for source in ORDER_SOURCES}
+        self.by_kind: Dict[str, SourceStats] = {kind: SourceStats() for kind in KINDS}
+        self.drained: Dict[str, float] = {}      # kind -> seconds into the run its last delivery settled
+        self.released: Dict[str, float] = {}     # kind -> seconds into the run its backlog was sent
+        self.peak_pending = 0
+        self.start = 0.0
+
+    async def deliver(self, delivery: Delivery):
+        order = delivery.order
+        headers = {"Idempotency-Key": order.idempotency_key}
+        stats = (self.by_source[order.source], self.by_kind[delivery.kind])
+        admitted = False
+        for attempt in range(self.retries + 1):
+            if attempt:
+                for s in stats:
+                    s.retries += 1
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1) * (0.5 + self.rng.random()))
+            result = await self.client.request("POST", "/orders", order.payload, headers=headers)
+            if result.success:
+                admitted = True
+                if isinstance(result.response_data, dict) and result.response_data.get("id"):
+                    order.order_ids.add(str(result.response_data["id"]))
+                break
+            if result.status_code not in RETRYABLE_STATUSES:
+                break
+        settled = time.perf_counter() - self.start
+        for s in stats:
+            s.deliveries += 1
+            if admitted:
+                s.admitted += 1
+                s.latency.record(settled - delivery.at)
+            else:
+                s.failed += 1
+        if delivery.kind != STEADY:
+            self.drained[delivery.kind] = max(self.drained.get(delivery.kind, 0.0), settled)
+
+    async def run(self, deliveries: List[Delivery]) -> float:
+        """Send every delivery at its time; returns the elapsed seconds"""
+        self.start = time.perf_counter()
+        pending = set()
+        for delivery in deliveries:
+            delay = self.start + delivery.at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if delivery.kind != STEADY:
+                self.released.setdefault(delivery.kind, delivery.at)
+            # Bursts are meant to queue: pending work is bounded by the schedule itself
+            task = asyncio.ensure_future(self.deliver(delivery))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            self.peak_pending = max(self.peak_pending, len(pending))
+        if pending:
+            await asyncio.wait(pending)
+        return time.perf_counter() - self.start
+
+    def duplicates(self, deliveries: List[Delivery]) -> List[Order]:
+        """Orders the API created more than once"""
+        seen = {id(d.order): d.order for d in deliveries}
+        return [order for order in seen.values() if len(order.order_ids) > 1]
+
+
+def _latency_columns(h: LatencyHistogram) -> str:
+    if not h.count:
+        return f"{'-':>9}{'-':>9}{'-':>9}{'-':>9}"
+    return "".join(f"{value * 1000:>7.0f}ms" for value in
+                   (h.percentile(50), h.percentile(95), h.percentile(99), h.max))
+
+
+def print_schedule(deliveries: List[Delivery], duration: float):
+    counts: Dict[str, Dict[str, int]] = {}
+    for d in deliveries:
+        by_kind = counts.setdefault(d.order.source, {})
+        by_kind[d.kind] = by_kind.get(d.kind, 0) + 1
+    print(f"\n🗓️ Schedule: {len(deliveries):,} deliveries over {duration:.0f}s")
+    for source in ORDER_SOURCES:
+        if source in counts:
+            details = ", ".join(f"{counts[source].get(kind, 0):,} {kind}" for kind in KINDS
+                                if counts[source].get(kind))
+            print(f"   {source:<9} {details}")
+
+
+def print_report(simulation: BurstSimulation, deliveries: List[Delivery], elapsed: float):
+    print(f"\n🛵 Order admission ({elapsed:.0f}s, peak {simulation.peak_pending:,} orders pending):")
+    print(f"   {'':<9}{'sent':>7}{'admitted':>10}{'failed':>8}{'retries':>9}"
+          f"{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    rows = [(source, simulation.by_source[source]) for source in ORDER_SOURCES]
+    rows += [(f"[{kind}]", simulation.by_kind[kind]) for kind in KINDS]
+    for name, s in rows:
+        if s.deliveries:
+            print(f"   {name:<9}{s.deliveries:>7,}{s.admitted:>10,}{s.failed:>8,}{s.retries:>9,}"
+                  f"{_latency_columns(s.latency)}")
+    for kind in (BURST, FLOOD):
+        if kind in simulation.released:
+            backlog = simulation.by_kind[kind].deliveries
+            drain = simulation.drained.get(kind, simulation.released[kind]) - simulation.released[kind]
+            print(f"   ⏱️ {kind} backlog of {backlog:,} orders drained in {drain:.1f}s "
+                  f"({backlog / drain if drain > 0 else float('inf'):,.1f} orders/s)")
+    steady = simulation.by_kind[STEADY].latency
+    burst = simulation.by_kind[BURST].latency
+    if steady.count and burst.count:
+        print(f"   Burst p99 is {burst.percentile(99) / max(steady.percentile(99), 1e-9):.1f}x the steady-state p99")
+    duplicates = simulation.duplicates(deliveries)
+    if duplicates:
+        print(f"   ❌ {len(duplicates):,} orders were created more than once despite the Idempotency-Key, e.g. "
+              + ", ".join(f"{o.external_id} -> {len(o.order_ids)}" for o in duplicates[:5]))
+    elif simulation.by_kind[FLOOD].admitted or any(s.retries for s in simulation.by_kind.values()):
+        print("   ✅ No duplicate orders from retries or redeliveries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate delivery-platform order bursts against POST /orders")
+    parser.add_argument("--rate", type=float, default=2.0, help="steady orders/s across all sources")
+    parser.add_argument("--duration", type=float, default=300.0, help="seconds of steady arrivals")
+    parser.add_argument("--outage-at", type=float, help="seconds into the run the aggregator outage starts")
+    parser.add_argument("--outage-duration", type=float, default=60.0)
+    parser.add_argument("--outage-sources", default=",".join(sorted(AGGREGATOR_SOURCES)),
+                        help="comma-separated sources affected by the outage")
+    parser.add_argument("--flood-at", type=float, help="seconds into the run of the reconnect flood")
+    parser.add_argument("--flood-fraction", type=float, default=0.5,
+                        help="share of delivered aggregator orders redelivered by the flood")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--backoff", type=float, default=0.5, help="first retry delay (s), doubled per retry")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--transport", default="requests", choices=["requests", "http.client"])
+    parser.add_argument("--target", default=BASE_URL)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dry-run", action="store_true", help="print the schedule without sending")
+    args = parser.parse_args()
+
+    outage_sources = {s.strip() for s in args.outage_sources.split(",") if s.strip()}
+    unknown = outage_sources - set(ORDER_SOURCES)
+    if unknown:
+        parser.error(f"unknown sources: {', '.join(sorted(unknown))}")
+    deliveries = build_schedule(args.rate, args.duration, PayloadFactory(args.seed), args.outage_at,
+                                args.outage_duration, outage_sources, args.flood_at, args.flood_fraction,
+                                args.seed)
+    print_schedule(deliveries, args.duration)
+    if args.dry_run:
+        return
+
+    harness = HarnessRun.from_env("order_burst", target_url=args.target)
+    client = AsyncLoadClient.create(args.target, args.concurrency, args.transport, harness=harness,
+                                    timeout=args.timeout)
+    simulation = BurstSimulation(client, args.retries, args.backoff, args.seed)
+    try:
+        elapsed = asyncio.run(simulation.run(deliveries))
+    finally:
+        client.close()
+    harness.close()
+    print_report(simulation, deliveries, elapsed)
+    failed = sum(s.failed for s in simulation.by_source.values())
+    exit(0 if harness.passed_slos and not failed and not simulation.duplicates(deliveries) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+ROBOT Order Totals Integrity Verification
+
+This script checks the money invariants of fetched orders in one vectorized
+pass over NumPy arrays:
+
+    item subtotal  = (price + packaging_price) * quantity
+    order subtotal = sum(item subtotals)
+    order total    = subtotal + delivery_fee
+
+It can be used from the test suites or run over an NDJSON dump of orders.
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Iterable, Iterator, Callable
+
+import numpy as np
+
+DEFAULT_TOLERANCE = 0.01  # one kopeck of rounding slack
+
+
+@dataclass
+class OrderArrays:
+    """Numeric order fields flattened into arrays (NaN marks a missing value)"""
+    order_ids: List[str]
+    line_offsets: np.ndarray
+    line_price: np.ndarray
+    line_packaging: np.ndarray
+    line_quantity: np.ndarray
+    line_subtotal: np.ndarray
+    subtotal: np.ndarray
+    delivery_fee: np.ndarray
+    total: np.ndarray
+
+
+@dataclass
+class IntegrityReport:
+    """Outcome of an integrity check"""
+    orders_checked: int = 0
+    lines_checked: int = 0
+    line_errors: int = 0
+    subtotal_errors: int = 0
+    total_errors: int = 0
+    offending: Dict[str, List[str]] = field(default_factory=dict)
+    execution_time: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return not self.offending
+
+    def merge(self, other: "IntegrityReport"):
+        self.orders_checked += other.orders_checked
+        self.lines_checked += other.lines_checked
+        self.line_errors += other.line_errors
+        self.subtotal_errors += other.subtotal_errors
+        self.total_errors += other.total_errors
+        for order_id, reasons in other.offending.items():
+            self.offending.setdefault(order_id, []).extend(reasons)
+        self.execution_time += other.execution_time
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def load_order_arrays(orders: List[Dict[str, Any]]) -> OrderArrays:
+    """Flatten order dicts into arrays
+
+    Accepts both the create-payload shape (items[].subtotal, subtotal, total)
+    and the `Order` type shape (items[].total, total_amount).
+    """
+    order_ids = []
+    counts = []
+    price, packaging, quantity, line_subtotal = [], [], [], []
+    subtotal, delivery_fee, total = [], [], []
+
+    for n, order in enumerate(orders):
+        order_ids.append(str(order.get("id", order.get("order_number", f"#{n}"))))
+        items = order.get("items") or []
+        counts.append(len(items))
+        for item in items:
+            price.append(item.get("price"))
+            packaging.append(item.get("packaging_price") or 0.0)
+            quantity.append(item.get("quantity"))
+            line_subtotal.append(item.get("subtotal", item.get("total")))
+        subtotal.append(order.get("subtotal"))
+        fee = order.get("delivery_fee")
+        if fee is None and isinstance(order.get("delivery"), dict):
+            fee = order["delivery"].get("delivery_fee")
+        delivery_fee.append(fee if fee is not None else 0.0)
+        total.append(order.get("total", order.get("total_amount")))
+
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    def column(values: List[Any]) -> np.ndarray:
+        try:
+            return np.array(values, dtype=np.float64)  # None becomes NaN
+        except (TypeError, ValueError):
+            return np.array([_number(v) for v in values], dtype=np.float64)
+
+    return OrderArrays(
+        order_ids=order_ids,
+        line_offsets=offsets,
+        line_price=column(price),
+        line_packaging=column(packaging),
+        line_quantity=column(quantity),
+        line_subtotal=column(line_subtotal),
+        subtotal=column(subtotal),
+        delivery_fee=column(delivery_fee),
+        total=column(total)
+    )
+
+
+def _differs(a: np.ndarray, b: np.ndarray, tolerance: float) -> np.ndarray:
+    """|a - b| above the tolerance, compared in whole kopecks so float error cannot tip it"""
+    return np.abs(np.rint(a * 100) - np.rint(b * 100)) > np.rint(tolerance * 100)
+
+
+def verify_arrays(arrays: OrderArrays, tolerance: float = DEFAULT_TOLERANCE) -> IntegrityReport:
+    """Check every line-item and order total at once"""
+    start_time = time.time()
+    n_orders = len(arrays.order_ids)
+    report = IntegrityReport(orders_checked=n_orders, lines_checked=len(arrays.line_price))
+    if n_orders == 0:
+        return report
+
+    counts = np.diff(arrays.line_offsets)
+    line_order = np.repeat(np.arange(n_orders), counts)
+
+    # Line items: (price + packaging) * quantity == subtotal
+    expected_line = (arrays.line_price + arrays.line_packaging) * arrays.line_quantity
+    bad_line = _differs(expected_line, arrays.line_subtotal, tolerance)
+    bad_line |= np.isnan(expected_line) | np.isnan(arrays.line_subtotal)
+
+    # Orders: sum of line subtotals == subtotal (when the order reports one)
+    line_sum = np.bincount(line_order, weights=np.nan_to_num(arrays.line_subtotal), minlength=n_orders)
+    has_subtotal = ~np.isnan(arrays.subtotal)
+    bad_subtotal = has_subtotal & _differs(line_sum, arrays.subtotal, tolerance)
+
+    # Orders: subtotal + delivery_fee == total
+    subtotal = np.where(has_subtotal, arrays.subtotal, line_sum)
+    bad_total = np.isnan(arrays.total) | _differs(subtotal + arrays.delivery_fee, arrays.total, tolerance)
+
+    report.line_errors = int(bad_line.sum())
+    report.subtotal_errors = int(bad_subtotal.sum())
+    report.total_errors = int(bad_total.sum())
+
+    for j in np.flatnonzero(bad_line):
+        order = line_order[j]
+        position = j - arrays.line_offsets[order]
+        report.offending.setdefault(arrays.order_ids[order], []).append(
+            f"item {position}: ({arrays.line_price[j]} + {arrays.line_packaging[j]}) x "
+            f"{arrays.line_quantity[j]} != {arrays.line_subtotal[j]}"
+        )
+    for i in np.flatnonzero(bad_subtotal):
+        report.offending.setdefault(arrays.order_ids[i], []).append(
+            f"subtotal {arrays.subtotal[i]} != items sum {line_sum[i]:.2f}"
+        )
+    for i in np.flatnonzero(bad_total):
+        report.offending.setdefault(arrays.order_ids[i], []).append(
+            f"total {arrays.total[i]} != subtotal {subtotal[i]:.2f} + delivery {arrays.delivery_fee[i]}"
+        )
+
+    report.execution_time = time.time() - start_time
+    return report
+
+
+def verify_orders(orders: List[Dict[str, Any]], tolerance: float = DEFAULT_TOLERANCE) -> IntegrityReport:
+    """Verify a list of order dicts (e.g. a GET /orders response)"""
+    start_time = time.time()
+    report = verify_arrays(load_order_arrays(orders), tolerance)
+    report.execution_time = time.time() - start_time
+    return report
+
+
+def verify_stream(orders: Iterable[Dict[str, Any]], chunk_size: int = 50_000,
+                  tolerance: float = DEFAULT_TOLERANCE) -> IntegrityReport:
+    """Verify an arbitrarily long stream of orders in fixed-size chunks"""
+    report = IntegrityReport()
+    chunk = []
+    for order in orders:
+        chunk.append(order)
+        if len(chunk) >= chunk_size:
+            report.merge(verify_orders(chunk, tolerance))
+            chunk = []
+    if chunk:
+        report.merge(verify_orders(chunk, tolerance))
+    return report
+
+
+def print_report(report: IntegrityReport, limit: int = 10, emit: Callable[[str], Any] = print):
+    """Print a report in the test suites' style"""
+    rate = report.orders_checked / report.execution_time if report.execution_time else 0
+    emit(f"   🧮 Checked {report.orders_checked} orders / {report.lines_checked} items "
+         f"in {report.execution_time:.3f}s ({rate:,.0f} orders/s)")
+    if report.passed:
+        emit("   ✅ Order totals are consistent")
+        return
+    emit(f"   ❌ {len(report.offending)} orders with inconsistent totals "
+         f"(items: {report.line_errors}, subtotals: {report.subtotal_errors}, totals: {report.total_errors})")
+    for order_id, reasons in list(report.offending.items())[:limit]:
+        emit(f"     - {order_id}: {'; '.join(reasons)}")
+
+
+def _read_ndjson(paths: List[str]) -> Iterator[Dict[str, Any]]:
+    for path in paths:
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        with stream:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def main():
+    """Verify orders from NDJSON files"""
+    parser = argparse.ArgumentParser(description="Verify ROBOT order totals")
+    parser.add_argument("paths", nargs="*", default=["-"], help="NDJSON files ('-' for stdin)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print("🔒 Verifying order totals integrity")
+    report = verify_stream(_read_ndjson(args.paths), args.chunk_size, args.tolerance)
+    print_report(report)
+    exit(0 if report.passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,10 @@ import uuid
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 
+from harness import HarnessRun
+from route_templates import normalize_endpoint, split_template
+from server_timing import ResponseTiming, capture_timing
+
 # API Configuration
 BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
 API_BASE = BASE_URL
@@ -78,27 +82,36 @@ class TestResult:
     response_data: Any
     error_message: Optional[str] = None
     execution_time: float = 0.0
+    timing: Optional[ResponseTiming] = None
+
+def format_result(result: TestResult) -> str:
+    """Format a test result for the log (runs on the sink's writer thread)"""
+    status = "✅ PASS" if result.success else "❌ FAIL"
+    lines = [f"{status} {result.method} {result.endpoint} ({result.status_code}) - {result.execution_time:.3f}s"]
+    if result.error_message:
+        lines.append(f"   Error: {result.error_message}")
+    if result.success and result.response_data:
+        if isinstance(result.response_data, dict):
+            lines.append(f"   Response keys: {list(result.response_data.keys())}")
+        elif isinstance(result.response_data, list):
+            lines.append(f"   Response: Array with {len(result.response_data)} items")
+    return "\n".join(lines)
 
 class OrdersApiComprehensiveTester:
     def __init__(self):
         self.session = requests.Session()
         self.auth_token = None
         self.test_results: List[TestResult] = []
+        self.harness = HarnessRun.from_env("orders_api_comprehensive", formatter=format_result, target_url=API_BASE)
+        self.harness.instrument(self.session)
+        self.sink = self.harness.sink
         self.created_order_id = None
         self.backend_accessible = False
         
     def log_result(self, result: TestResult):
-        """Log test result and print status"""
+        """Record test result; output is written off the hot path by the sink"""
         self.test_results.append(result)
-        status = "✅ PASS" if result.success else "❌ FAIL"
-        print(f"{status} {result.method} {result.endpoint} ({result.status_code}) - {result.execution_time:.3f}s")
-        if result.error_message:
-            print(f"   Error: {result.error_message}")
-        if result.success and result.response_data:
-            if isinstance(result.response_data, dict):
-                print(f"   Response keys: {list(result.response_data.keys())}")
-            elif isinstance(result.response_data, list):
-                print(f"   Response: Array with {len(result.response_data)} items")
+        self.harness.record(result)
     
     def make_request(self, method: str, endpoint: str, data: Dict = None, 
                     headers: Dict = None, expect_success: bool = True, timeout: int = 10) -> TestResult:
@@ -153,7 +166,8 @@ class OrdersApiComprehensiveTester:
                 status_code=response.status_code,
                 response_data=response_data,
                 error_message=error_message,
-                execution_time=execution_time
+                execution_time=execution_time,
+                timing=capture_timing(response)
             )
             
         except Exception as e:
@@ -170,7 +184,7 @@ class OrdersApiComprehensiveTester:
     
     def test_backend_connectivity(self):
         """Test backend connectivity and health"""
-        print("\n🏥 Testing Backend Connectivity...")
+        self.sink.note("\n🏥 Testing Backend Connectivity...")
         
         # Test health endpoint
         result = self.make_request("GET", "/health", timeout=5)
@@ -178,9 +192,9 @@ class OrdersApiComprehensiveTester:
         
         if result.success:
             self.backend_accessible = True
-            print("   ✅ Backend is accessible and healthy")
+            self.sink.note("   ✅ Backend is accessible and healthy")
         else:
-            print("   ❌ Backend is not accessible or unhealthy")
+            self.sink.note("   ❌ Backend is not accessible or unhealthy")
             
         # Test API documentation endpoint
         result = self.make_request("GET", "/docs", timeout=5)
@@ -194,7 +208,7 @@ class OrdersApiComprehensiveTester:
     
     def test_orders_api_endpoints(self):
         """Test Orders API endpoints implementation"""
-        print("\n📋 Testing Orders API Endpoints...")
+        self.sink.note("\n📋 Testing Orders API Endpoints...")
         
         # Test GET /orders (basic retrieval)
         result = self.make_request("GET", "/orders")
@@ -211,7 +225,7 @@ class OrdersApiComprehensiveTester:
         if result.success and result.response_data:
             if isinstance(result.response_data, dict) and 'id' in result.response_data:
                 self.created_order_id = result.response_data['id']
-                print(f"   📝 Created order ID: {self.created_order_id}")
+                self.sink.note(f"   📝 Created order ID: {self.created_order_id}")
         
         # Test POST /api/orders (with /api prefix)
         if not self.created_order_id:
@@ -221,11 +235,11 @@ class OrdersApiComprehensiveTester:
             if result.success and result.response_data:
                 if isinstance(result.response_data, dict) and 'id' in result.response_data:
                     self.created_order_id = result.response_data['id']
-                    print(f"   📝 Created order ID (via /api): {self.created_order_id}")
+                    self.sink.note(f"   📝 Created order ID (via /api): {self.created_order_id}")
     
     def test_orders_filtering(self):
         """Test Orders API filtering capabilities"""
-        print("\n🔍 Testing Orders API Filtering...")
+        self.sink.note("\n🔍 Testing Orders API Filtering...")
         
         # Test filtering by Ukrainian statuses
         for status in UKRAINIAN_STATUSES:
@@ -256,7 +270,7 @@ class OrdersApiComprehensiveTester:
     
     def test_single_order_operations(self):
         """Test single order operations"""
-        print("\n🔧 Testing Single Order Operations...")
+        self.sink.note("\n🔧 Testing Single Order Operations...")
         
         # Test GET single order (if we have an order ID)
         if self.created_order_id:
@@ -276,7 +290,7 @@ class OrdersApiComprehensiveTester:
     
     def test_order_status_updates(self):
         """Test order status updates with Ukrainian statuses"""
-        print("\n🔄 Testing Order Status Updates...")
+        self.sink.note("\n🔄 Testing Order Status Updates...")
         
         if self.created_order_id:
             # Test each Ukrainian status update
@@ -296,7 +310,7 @@ class OrdersApiComprehensiveTester:
     
     def test_order_data_validation(self):
         """Test order data validation"""
-        print("\n✅ Testing Order Data Validation...")
+        self.sink.note("\n✅ Testing Order Data Validation...")
         
         # Test Ukrainian delivery types
         delivery_types = ["доставка", "особистий відбір"]
@@ -319,7 +333,7 @@ class OrdersApiComprehensiveTester:
     
     def test_authentication_requirements(self):
         """Test authentication requirements for orders endpoints"""
-        print("\n🔐 Testing Authentication Requirements...")
+        self.sink.note("\n🔐 Testing Authentication Requirements...")
         
         # Save current auth token
         old_token = self.auth_token
@@ -345,7 +359,7 @@ class OrdersApiComprehensiveTester:
     
     def test_existing_api_functionality(self):
         """Test existing API functionality to ensure it's still working"""
-        print("\n🔄 Testing Existing API Functionality...")
+        self.sink.note("\n🔄 Testing Existing API Functionality...")
         
         # Test categories endpoint (should exist from previous tests)
         result = self.make_request("GET", "/categories")
@@ -374,19 +388,24 @@ class OrdersApiComprehensiveTester:
         ukrainian_status_support = False
         
         for result in self.test_results:
-            if "/orders" in result.endpoint and result.success:
-                if result.method == "GET" and "?" not in result.endpoint and result.endpoint.count("/") == 1:
-                    orders_endpoints_found = True
-                elif result.method == "POST" and result.endpoint.count("/") == 1:
-                    orders_create_working = True
-                elif result.method == "GET" and "?" in result.endpoint:
+            if not result.success:
+                continue
+            path, params = split_template(normalize_endpoint(result.endpoint))
+            if path != "/orders" and not path.startswith("/orders/"):
+                continue
+            if result.method == "GET" and path == "/orders":
+                if params:
                     orders_filtering_working = True
-                elif result.method == "PATCH" and "/status" in result.endpoint:
-                    orders_status_update_working = True
-                
-                # Check for Ukrainian status support
-                if any(status in str(result.response_data) for status in UKRAINIAN_STATUSES):
-                    ukrainian_status_support = True
+                else:
+                    orders_endpoints_found = True
+            elif result.method == "POST" and path == "/orders":
+                orders_create_working = True
+            elif result.method == "PATCH" and path == "/orders/{id}/status":
+                orders_status_update_working = True
+            
+            # Check for Ukrainian status support
+            if any(status in str(result.response_data) for status in UKRAINIAN_STATUSES):
+                ukrainian_status_support = True
         
         print(f"   Orders endpoints exist: {'✅ YES' if orders_endpoints_found else '❌ NO'}")
         print(f"   Order creation working: {'✅ YES' if orders_create_working else '❌ NO'}")
@@ -412,29 +431,36 @@ class OrdersApiComprehensiveTester:
         
         try:
             # Test backend connectivity first
-            if not self.test_backend_connectivity():
-                print("❌ Backend is not accessible. Cannot proceed with Orders API testing.")
+            with self.harness.step("test_backend_connectivity"):
+                backend_accessible = self.test_backend_connectivity()
+            if not backend_accessible:
+                self.sink.note("❌ Backend is not accessible. Cannot proceed with Orders API testing.")
                 return self.generate_summary(start_time)
             
-            # Test existing functionality to ensure backend is working
-            self.test_existing_api_functionality()
-            
-            # Test Orders API implementation
-            self.test_orders_api_endpoints()
-            self.test_orders_filtering()
-            self.test_single_order_operations()
-            self.test_order_status_updates()
-            self.test_order_data_validation()
-            self.test_authentication_requirements()
+            # Test existing functionality to ensure backend is working,
+            # then the Orders API implementation
+            steps = [
+                self.test_existing_api_functionality,
+                self.test_orders_api_endpoints,
+                self.test_orders_filtering,
+                self.test_single_order_operations,
+                self.test_order_status_updates,
+                self.test_order_data_validation,
+                self.test_authentication_requirements
+            ]
+            for step in steps:
+                with self.harness.step(step.__name__):
+                    step()
             
         except Exception as e:
-            print(f"❌ Test execution error: {str(e)}")
+            self.sink.note(f"❌ Test execution error: {str(e)}")
         
         return self.generate_summary(start_time)
     
     def generate_summary(self, start_time):
         """Generate comprehensive test summary"""
         total_time = time.time() - start_time
+        self.harness.close()
         
         # Print summary
         print(f"\n📊 Orders API Comprehensive Test Summary")
@@ -451,10 +477,7 @@ class OrdersApiComprehensiveTester:
         orders_status = self.analyze_orders_api_status()
         
         if failed > 0:
-            print(f"\n❌ Failed Tests:")
-            for result in self.test_results:
-                if not result.success:
-                    print(f"   {result.method} {result.endpoint}: {result.error_message}")
+            self.sink.print_recent_failures()
         
         return {
             "passed": passed,
@@ -481,6 +504,10 @@ def main():
     else:
         print("❌ Orders API endpoints not found - need to be implemented")
     
+    if not tester.harness.passed_slos:
+        print("❌ SLO budgets violated")
+        exit(1)
+    
     return summary
 
 if __name__ == "__main__":
@@ -13,6 +13,8 @@ import uuid
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 
+from route_templates import succeeded_routes
+
 # API Configuration
 BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
 API_BASE = BASE_URL
@@ -349,14 +351,15 @@ class OrdersApiTester:
         orders_create_working = False
         orders_filtering_working = False
         
-        for result in self.test_results:
-            if "/orders" in result.endpoint and result.success:
-                if result.method == "GET" and "?" not in result.endpoint:
-                    orders_endpoints_found = True
-                elif result.method == "POST":
-                    orders_create_working = True
-                elif "?" in result.endpoint:
-                    orders_filtering_working = True
+        for method, path, filtered in succeeded_routes(self.test_results):
+            if path != "/orders" and not path.startswith("/orders/"):
+                continue
+            if method == "GET" and not filtered:
+                orders_endpoints_found = True
+            elif method == "POST":
+                orders_create_working = True
+            elif filtered:
+                orders_filtering_working = True
         
         print(f"\n📋 Orders API Analysis:")
         print(f"   Orders endpoints exist: {'✅ YES' if orders_endpoints_found else '❌ NO'}")
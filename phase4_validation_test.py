@@ -8,17 +8,42 @@ the Phase 4 frontend bug fixes for the ROBOT Admin Panel.
 
 import requests
 import json
+import os
 import time
 import uuid
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, List
 
+from harness import HarnessRun
+from polling import poll_until, VisibilityStats
+from regression_detection import compare_runs, print_report
+from server_timing import ResponseTiming, capture_timing
+from slo import print_report as print_slo_report
+
 # API Configuration
 BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
 
+# Latency samples per endpoint in test_api_performance
+PERF_SAMPLES = int(os.environ.get("ROBOT_PERF_SAMPLES", "10"))
+
+@dataclass
+class TestResult:
+    endpoint: str
+    method: str
+    success: bool
+    status_code: int
+    response_data: Any
+    error_message: Optional[str] = None
+    execution_time: float = 0.0
+    timing: Optional[ResponseTiming] = None
+
 class Phase4ValidationTester:
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({"Content-Type": "application/json"})
+        self.visibility = VisibilityStats()
+        self.harness = HarnessRun.from_env("phase4_validation", target_url=BASE_URL)
+        self.harness.instrument(self.session)
         
     def test_categories_real_time_updates(self):
         """Test categories API for real-time update support"""
@@ -42,16 +67,21 @@ class Phase4ValidationTester:
         if response.status_code == 201:
             category_id = response.json()['id']
             
-            # Test immediate retrieval (real-time availability)
-            get_response = self.session.get(f"{BASE_URL}/categories")
-            categories = get_response.json() if get_response.status_code == 200 else []
-            created_category = next((cat for cat in categories if cat['id'] == category_id), None)
+            # Test retrieval (real-time availability), polling until the write is visible
+            def find_created_category():
+                get_response = self.session.get(f"{BASE_URL}/categories")
+                categories = get_response.json() if get_response.status_code == 200 else []
+                return next((cat for cat in categories if cat['id'] == category_id), None)
+            
+            poll = poll_until(find_created_category, timeout=5.0)
+            self.visibility.record("POST /categories → GET /categories", poll)
+            created_category = poll.value
             
             if created_category:
-                print(f"✅ REAL-TIME RETRIEVAL: Category immediately available in list")
+                print(f"✅ REAL-TIME RETRIEVAL: Category available in list after {poll.elapsed:.3f}s ({poll.attempts} reads)")
                 print(f"   Category: {created_category['name']['ua']}")
             else:
-                print(f"❌ REAL-TIME ISSUE: Category not immediately available")
+                print(f"❌ REAL-TIME ISSUE: Category not available within {poll.elapsed:.1f}s")
             
             # Test update for modal editing
             update_data = {
@@ -251,39 +281,71 @@ class Phase4ValidationTester:
         return False
     
     def test_api_performance(self):
-        """Test API performance for responsive UI"""
+        """Test API performance for responsive UI
+
+        Each endpoint is sampled PERF_SAMPLES times. With a benchmark history
+        (ROBOT_HISTORY_DB) the latency distributions are compared with the
+        previous Phase 4 run by the regression gate; without one, the
+        endpoints' SLO budgets (slo_budgets.json) decide.
+        """
         print("\n⚡ Testing API Performance...")
         
         start_time = time.time()
         
         # Test rapid sequential requests (simulating real-time UI updates)
         endpoints = [
-            "/categories",
-            "/items", 
-            "/locations",
-            "/media/sign-upload"
+            ("GET", "/categories"),
+            ("GET", "/items"),
+            ("GET", "/locations"),
+            ("POST", "/media/sign-upload")
         ]
         
-        response_times = []
-        for endpoint in endpoints:
-            req_start = time.time()
-            if endpoint == "/media/sign-upload":
-                response = self.session.post(f"{BASE_URL}{endpoint}", json={})
-            else:
-                response = self.session.get(f"{BASE_URL}{endpoint}")
-            req_time = time.time() - req_start
-            response_times.append(req_time)
-            print(f"   {endpoint}: {response.status_code} ({req_time:.3f}s)")
+        # Interleave rounds so slow drift of the dyno hits every endpoint alike
+        for _ in range(PERF_SAMPLES):
+            for method, endpoint in endpoints:
+                req_start = time.time()
+                response = self.session.request(method, f"{BASE_URL}{endpoint}",
+                                                json={} if method == "POST" else None)
+                req_time = time.time() - req_start
+                self.harness.record(TestResult(endpoint, method, response.status_code < 400,
+                                               response.status_code, None, execution_time=req_time,
+                                               timing=capture_timing(response)))
+        self.harness.sink.flush()
         
         total_time = time.time() - start_time
-        avg_response_time = sum(response_times) / len(response_times)
+        current = {f"{method} {endpoint}": self.harness.endpoints[f"{method} {endpoint}"].histogram
+                   for method, endpoint in endpoints}
         
-        print(f"✅ Performance Summary:")
+        print(f"✅ Performance Summary ({PERF_SAMPLES} samples per endpoint):")
         print(f"   Total time: {total_time:.3f}s")
-        print(f"   Average response: {avg_response_time:.3f}s")
-        print(f"   All under 1s: {all(t < 1.0 for t in response_times)}")
+        for name, histogram in current.items():
+            summary = histogram.summary()
+            print(f"   {name}: p50 {summary['p50']:.3f}s, p95 {summary['p95']:.3f}s, max {summary['max']:.3f}s")
+        
+        baseline = self.performance_baseline()
+        if baseline is None:
+            slo_report = self.harness.check_slos(list(current))
+            if slo_report is None:
+                print("   No baseline run or SLO budgets - nothing to compare against")
+                return True
+            print_slo_report(slo_report)
+            return slo_report.passed
         
-        return avg_response_time < 0.5  # Good performance threshold
+        report = compare_runs(baseline, current)
+        print_report(report)
+        return report.passed
+    
+    def performance_baseline(self) -> Optional[Dict[str, Any]]:
+        """Endpoint histograms of the previous Phase 4 run, if recorded"""
+        history = self.harness.history
+        if history is None:
+            return None
+        try:
+            run = history.resolve_run("latest", self.harness.suite)
+        except LookupError:
+            return None
+        print(f"   Baseline: run #{run['id']} ({(run['git_sha'] or '-')[:8]})")
+        return history.run_histograms(run["id"])
     
     def run_phase4_validation(self):
         """Run all Phase 4 validation tests"""
@@ -305,7 +367,10 @@ class Phase4ValidationTester:
         results = []
         for test_name, test_func in tests:
             try:
-                result = test_func()
+                with self.harness.step(test_name) as step:
+                    result = test_func()
+                    if not result:
+                        step.fail(f"{test_name} validation failed")
                 results.append((test_name, result))
                 print(f"{'✅' if result else '❌'} {test_name}: {'PASS' if result else 'FAIL'}")
             except Exception as e:
@@ -313,6 +378,7 @@ class Phase4ValidationTester:
                 print(f"❌ {test_name}: ERROR - {str(e)}")
         
         total_time = time.time() - start_time
+        self.harness.close()
         passed = sum(1 for _, result in results if result)
         total = len(results)
         
@@ -321,12 +387,14 @@ class Phase4ValidationTester:
         print(f"⏱️ Execution time: {total_time:.2f}s")
         print(f"✅ Passed: {passed}/{total}")
         print(f"📈 Success rate: {(passed/total*100):.1f}%")
+        self.visibility.print_summary()
         
         if passed == total:
             print(f"\n🎉 All Phase 4 backend validations passed!")
             print(f"🚀 Backend ready for Phase 4 frontend bug fixes")
         else:
             print(f"\n⚠️ Some validations failed - review needed")
+            self.harness.sink.print_recent_failures()
             
         return passed, total
 
@@ -334,7 +402,7 @@ def main():
     tester = Phase4ValidationTester()
     passed, total = tester.run_phase4_validation()
     
-    if passed == total:
+    if passed == total and tester.harness.passed_slos:
         exit(0)
     else:
         exit(1)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+ROBOT Test Polling Helpers
+
+Replaces fixed time.sleep() delays in the test suites with "wait until the
+condition holds" polling (exponential backoff + deadline). A virtual clock
+can be selected for offline runs (ROBOT_CLOCK=virtual), where waiting
+advances time instantly instead of burning wall-clock time.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Callable
+
+
+class RealClock:
+    """Monotonic wall clock"""
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class VirtualClock:
+    """Clock whose sleep() advances time instantly"""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+
+    def now(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            self._now += seconds
+
+    def advance(self, seconds: float):
+        self.sleep(seconds)
+
+
+_default_clock = None
+
+
+def get_clock():
+    """Return the process-wide clock selected by ROBOT_CLOCK (real|virtual)"""
+    global _default_clock
+    if _default_clock is None:
+        mode = os.environ.get("ROBOT_CLOCK", "real").lower()
+        _default_clock = VirtualClock() if mode == "virtual" else RealClock()
+    return _default_clock
+
+
+def set_clock(clock):
+    """Override the process-wide clock (e.g. for replay runs)"""
+    global _default_clock
+    _default_clock = clock
+
+
+@dataclass
+class PollResult:
+    """Outcome of poll_until"""
+    satisfied: bool
+    value: Any
+    attempts: int
+    elapsed: float  # time until the condition held (or until the deadline)
+
+
+def poll_until(probe: Callable[[], Any], condition: Callable[[Any], bool] = bool,
+               timeout: float = 10.0, initial_delay: float = 0.05, max_delay: float = 1.0,
+               backoff: float = 2.0, clock=None) -> PollResult:
+    """Call probe() until condition(value) holds or the deadline passes
+
+    The first probe runs immediately; subsequent probes wait initial_delay,
+    growing by `backoff` up to max_delay, never sleeping past the deadline.
+    """
+    clock = clock or get_clock()
+    start = clock.now()
+    deadline = start + timeout
+    delay = initial_delay
+    attempts = 0
+
+    while True:
+        value = probe()
+        attempts += 1
+        if condition(value):
+            return PollResult(True, value, attempts, clock.now() - start)
+        remaining = deadline - clock.now()
+        if remaining <= 0:
+            return PollResult(False, value, attempts, clock.now() - start)
+        clock.sleep(min(delay, remaining))
+        delay = min(delay * backoff, max_delay)
+
+
+@dataclass
+class VisibilityStats:
+    """Collects "time to visibility" measurements for writes"""
+    samples: Dict[str, List[float]] = field(default_factory=dict)
+    timeouts: Dict[str, int] = field(default_factory=dict)
+
+    def record(self, name: str, result: PollResult):
+        if result.satisfied:
+            self.samples.setdefault(name, []).append(result.elapsed)
+        else:
+            self.timeouts[name] = self.timeouts.get(name, 0) + 1
+
+    def print_summary(self):
+        if not self.samples and not self.timeouts:
+            return
+        print(f"\n👁️ Time to Visibility:")
+        for name in sorted(set(self.samples) | set(self.timeouts)):
+            values = sorted(self.samples.get(name, []))
+            timeouts = self.timeouts.get(name, 0)
+            if values:
+                p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+                print(f"   {name}: avg {sum(values) / len(values):.3f}s, p95 {p95:.3f}s, "
+                      f"max {values[-1]:.3f}s ({len(values)} samples, {timeouts} timeouts)")
+            else:
+                print(f"   {name}: never visible ({timeouts} timeouts)")
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+ROBOT Sampling Profiler
+
+Low-overhead statistical profiler for harness runs. A daemon thread wakes
+every few milliseconds, reads the stack of every other thread with
+sys._current_frames() and charges each stack with the CPU time its thread
+used since the previous sample (per-thread CPU clocks, Linux/BSD), so
+threads blocked on the network or a lock do not show up. On platforms
+without per-thread clocks, or with --mode wall, every sample counts one
+interval of wall time instead.
+
+Each process that opens a HarnessRun with profiling enabled writes
+
+    <dir>/<suite>-<pid>.collapsed   collapsed stacks ("a;b;c <µs>"), the
+                                    input format of flamegraph.pl/speedscope
+    <dir>/<suite>-<pid>.svg         a self-contained flamegraph
+
+Enable it for one suite from the command line:
+
+    python3 profiler.py complete_orders_api_test.py
+    python3 profiler.py --interval 5 --mode wall --out profiles phase4_validation_test.py
+
+or for every run with ROBOT_PROFILE_DIR=<dir> (ROBOT_PROFILE_INTERVAL_MS,
+ROBOT_PROFILE_MODE). Re-render a collapsed file with --render <file>.
+At the default 10ms interval the overhead is well under 2%; measure it
+with `python3 self_benchmark.py --profiler-overhead`.
+"""
+
+import argparse
+import html
+import os
+import runpy
+import sys
+import threading
+import time
+import zlib
+from typing import Dict, Optional, List, Tuple
+
+DEFAULT_INTERVAL = 0.01  # seconds between samples
+CPU = "cpu"
+WALL = "wall"
+
+
+def _frame_label(code) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _thread_cpu_clock(ident: int) -> Optional[int]:
+    try:
+        return time.pthread_getcpuclockid(ident)
+    except (AttributeError, OSError, OverflowError):
+        return None
+
+
+class SamplingProfiler:
+    """Samples all threads' stacks from a background thread"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, mode: str = CPU, directory: str = "profiles"):
+        if mode not in (CPU, WALL):
+            raise ValueError(f"Unknown profiling mode '{mode}', expected '{CPU}' or '{WALL}'")
+        if mode == CPU and _thread_cpu_clock(threading.get_ident()) is None:
+            mode = WALL
+        self.interval = interval
+        self.mode = mode
+        self.directory = directory
+        self.samples = 0
+        self.stacks: Dict[Tuple[str, tuple], int] = {}  # (thread name, code objects root->leaf) -> µs
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._cpu_seen: Dict[int, Tuple[int, int]] = {}  # thread ident -> (clock id, last ns)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["SamplingProfiler"]:
+        """A started profiler when ROBOT_PROFILE_DIR is set, else None"""
+        directory = os.environ.get("ROBOT_PROFILE_DIR")
+        if not directory:
+            return None
+        interval_ms = float(os.environ.get("ROBOT_PROFILE_INTERVAL_MS", DEFAULT_INTERVAL * 1000))
+        profiler = cls(interval_ms / 1000.0, os.environ.get("ROBOT_PROFILE_MODE", CPU), directory)
+        profiler.start()
+        return profiler
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="robot-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.duration = time.perf_counter() - self.started_at
+
+    def _run(self):
+        own = threading.get_ident()
+        wall_weight = int(self.interval * 1e6)
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                weight = self._cpu_delta(ident) if self.mode == CPU else wall_weight
+                if weight <= 0:
+                    continue
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                key = (names.get(ident, str(ident)), tuple(reversed(codes)))
+                self.stacks[key] = self.stacks.get(key, 0) + weight
+            self.samples += 1
+
+    def _cpu_delta(self, ident: int) -> int:
+        """Microseconds of CPU the thread used since it was last sampled"""
+        seen = self._cpu_seen.get(ident)
+        clock = seen[0] if seen else _thread_cpu_clock(ident)
+        if clock is None:
+            return 0
+        try:
+            now = time.clock_gettime_ns(clock)
+        except OSError:  # thread exited between enumeration and the read
+            self._cpu_seen.pop(ident, None)
+            return 0
+        self._cpu_seen[ident] = (clock, now)
+        return (now - seen[1]) // 1000 if seen else 0
+
+    def collapsed(self) -> Dict[str, int]:
+        """"thread;outer;...;leaf" -> µs, merging stacks with equal labels"""
+        labels: Dict[object, str] = {}
+        merged: Dict[str, int] = {}
+        for (thread_name, codes), weight in list(self.stacks.items()):
+            parts = [thread_name.replace(";", ":")]
+            for code in codes:
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                parts.append(label)
+            line = ";".join(parts)
+            merged[line] = merged.get(line, 0) + weight
+        return merged
+
+    def write(self, name: str) -> List[str]:
+        """Write <name>.collapsed and <name>.svg into the output directory; returns the paths"""
+        os.makedirs(self.directory, exist_ok=True)
+        stacks = self.collapsed()
+        collapsed_path = os.path.join(self.directory, f"{name}.collapsed")
+        write_collapsed(stacks, collapsed_path)
+        svg_path = os.path.join(self.directory, f"{name}.svg")
+        unit = "CPU" if self.mode == CPU else "wall"
+        title = f"{name}: {self.samples} samples every {self.interval * 1000:g}ms, {unit} time"
+        with open(svg_path, "w", encoding="utf-8") as f:
+            f.write(render_flamegraph(stacks, title))
+        return [collapsed_path, svg_path]
+
+
+def write_collapsed(stacks: Dict[str, int], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        for line, weight in sorted(stacks.items()):
+            f.write(f"{line} {weight}\n")
+
+
+def read_collapsed(path: str) -> Dict[str, int]:
+    stacks: Dict[str, int] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stack, _, weight = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] = stacks.get(stack, 0) + int(weight)
+    return stacks
+
+
+# Flamegraph -------------------------------------------------------------
+
+class _Node:
+    __slots__ = ("children", "total")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.total = 0
+
+
+def _color(label: str) -> str:
+    """Stable warm colour per function name"""
+    h = zlib.crc32(label.split(" (")[0].encode("utf-8"))
+    return f"rgb({205 + h % 50},{80 + (h >> 8) % 130},{(h >> 16) % 55})"
+
+
+def render_flamegraph(stacks: Dict[str, int], title: str = "", width: int = 1200,
+                      frame_height: int = 16, min_width: float = 0.3) -> str:
+    """Self-contained SVG flamegraph (root at the bottom) of collapsed stacks"""
+    root = _Node()
+    for line, weight in stacks.items():
+        node = root
+        node.total += weight
+        for label in line.split(";"):
+            node = node.children.setdefault(label, _Node())
+            node.total += weight
+
+    def depth_of(node: _Node) -> int:
+        return 1 + max((depth_of(child) for child in node.children.values()), default=0)
+
+    depth = depth_of(root)
+    top = 40
+    height = top + depth * frame_height + 10
+    scale = (width - 20) / root.total if root.total else 0.0
+    unit_total = root.total
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="Verdana, sans-serif" font-size="11">',
+        f'<rect width="100%" height="100%" fill="#f8f8f8"/>',
+        f'<text x="{width / 2}" y="22" text-anchor="middle" font-size="15">{html.escape(title)}</text>',
+    ]
+
+    def draw(label: str, node: _Node, x: float, level: int):
+        w = node.total * scale
+        if w < min_width:
+            return
+        y = height - 10 - (level + 1) * frame_height
+        share = node.total / unit_total if unit_total else 0.0
+        tooltip = html.escape(f"{label} ({node.total / 1000:,.1f} ms, {share:.2%})")
+        parts.append(f'<g><title>{tooltip}</title><rect x="{x:.2f}" y="{y}" width="{w:.2f}" '
+                     f'height="{frame_height - 1}" fill="{_color(label)}" rx="2"/>')
+        max_chars = int((w - 6) / 7)
+        if max_chars >= 3:
+            text = label if len(label) <= max_chars else label[:max_chars - 2] + ".."
+            parts.append(f'<text x="{x + 3:.2f}" y="{y + frame_height - 4}">{html.escape(text)}</text>')
+        parts.append("</g>")
+        child_x = x
+        for child_label, child in sorted(node.children.items()):
+            draw(child_label, child, child_x, level + 1)
+            child_x += child.total * scale
+
+    draw("all", root, 10.0, 0)
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile a ROBOT suite with the sampling profiler")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL * 1000, help="sampling interval (ms)")
+    parser.add_argument("--mode", choices=[CPU, WALL], default=CPU)
+    parser.add_argument("--out", default="profiles", help="output directory")
+    parser.add_argument("--render", metavar="COLLAPSED", help="render an existing collapsed file to SVG")
+    parser.add_argument("suite", nargs="?", help="suite script to run")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the suite")
+    args = parser.parse_args()
+
+    if args.render:
+        svg_path = os.path.splitext(args.render)[0] + ".svg"
+        with open(svg_path, "w", encoding="utf-8") as f:
+            f.write(render_flamegraph(read_collapsed(args.render), os.path.basename(args.render)))
+        print(f"🔥 Flamegraph written: {svg_path}")
+        return
+    if not args.suite:
+        parser.error("a suite script or --render is required")
+
+    # Every HarnessRun in this process and in worker processes it starts picks these up
+    os.environ["ROBOT_PROFILE_DIR"] = args.out
+    os.environ["ROBOT_PROFILE_INTERVAL_MS"] = str(args.interval)
+    os.environ["ROBOT_PROFILE_MODE"] = args.mode
+    sys.argv = [args.suite] + args.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.suite)))
+    runpy.run_path(args.suite, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
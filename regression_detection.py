@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+ROBOT Benchmark Regression Detection
+
+Compares two sets of latency measurements per endpoint template, given
+either as raw samples or as LatencyHistograms:
+
+- Mann-Whitney U test (normal approximation with tie correction) for a
+  shift in the latency distribution;
+- Cliff's delta as the effect size (positive = candidate is slower);
+- bootstrap confidence intervals for the change in p50/p95/p99.
+
+An endpoint is "regressed" or "improved" only when the Holm-adjusted
+p-value is below alpha AND the effect size reaches min_effect, so alpha
+bounds the chance that a run with no real change fails the gate.
+
+    python3 regression_detection.py history latest~1 latest [--db robot_history.db]
+    python3 regression_detection.py exports baseline.jsonl candidate.jsonl
+
+Exits 1 when any endpoint regressed.
+"""
+
+import argparse
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple, Iterable, Union
+
+import numpy as np
+
+from latency_histogram import LatencyHistogram, BUCKETS, bucket_index, bucket_midpoint
+
+IMPROVED = "improved"
+UNCHANGED = "unchanged"
+REGRESSED = "regressed"
+INSUFFICIENT = "insufficient data"
+
+PERCENTILES = (50, 95, 99)
+
+# Cliff's delta magnitude thresholds (Romano et al.)
+EFFECT_SIZES = [(0.147, "negligible"), (0.33, "small"), (0.474, "medium"), (math.inf, "large")]
+
+Measurements = Union[LatencyHistogram, Iterable[float]]
+
+
+@dataclass
+class ComparisonConfig:
+    """Tunables of the regression gate"""
+    alpha: float = 0.01           # family-wise false-positive rate across endpoints
+    min_effect: float = 0.147     # |Cliff's delta| below this is never flagged
+    min_samples: int = 5          # per side
+    bootstrap: int = 2000         # bootstrap resamples
+    confidence: float = 0.95      # bootstrap CI level
+    correction: str = "holm"      # holm | none
+    seed: int = 0
+
+
+@dataclass
+class EndpointComparison:
+    endpoint: str
+    baseline_n: int
+    candidate_n: int
+    p_value: float = 1.0
+    adjusted_p: float = 1.0
+    effect: float = 0.0
+    # percentile -> (baseline, candidate, ci_low, ci_high) of candidate - baseline, seconds
+    percentiles: Dict[int, Tuple[float, float, float, float]] = field(default_factory=dict)
+    verdict: str = INSUFFICIENT
+
+    @property
+    def effect_label(self) -> str:
+        for limit, label in EFFECT_SIZES:
+            if abs(self.effect) < limit:
+                return label
+        return "large"
+
+
+@dataclass
+class ComparisonReport:
+    endpoints: List[EndpointComparison]
+    config: ComparisonConfig
+
+    def by_verdict(self, verdict: str) -> List[EndpointComparison]:
+        return [c for c in self.endpoints if c.verdict == verdict]
+
+    @property
+    def passed(self) -> bool:
+        return not self.by_verdict(REGRESSED)
+
+
+def _distribution(measurements: Measurements, max_points: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted distinct values and their counts
+
+    Large raw sample sets are folded into histogram buckets so bootstrap
+    memory stays bounded; bucket error (±1%) is far below network noise.
+    """
+    if not isinstance(measurements, LatencyHistogram):
+        values, counts = np.unique(np.asarray(list(measurements), dtype=float), return_counts=True)
+        if len(values) <= max_points:
+            return values, counts
+        folded = np.bincount([bucket_index(v) for v in values], weights=counts, minlength=BUCKETS)
+        buckets = np.nonzero(folded)[0]
+        return np.array([bucket_midpoint(i) for i in buckets]), folded[buckets].astype(np.int64)
+    nonzero = [(bucket_midpoint(i), c) for i, c in enumerate(measurements.counts) if c]
+    if not nonzero:
+        return np.empty(0), np.empty(0, dtype=np.int64)
+    values, counts = zip(*nonzero)
+    return np.asarray(values), np.asarray(counts, dtype=np.int64)
+
+
+def mann_whitney(a: Tuple[np.ndarray, np.ndarray], b: Tuple[np.ndarray, np.ndarray]) -> Tuple[float, float]:
+    """Two-sided Mann-Whitney U test on (values, counts) distributions
+
+    Returns (p_value, cliffs_delta) with delta = P(b > a) - P(a > b).
+    """
+    values_a, counts_a = a
+    values_b, counts_b = b
+    n1, n2 = int(counts_a.sum()), int(counts_b.sum())
+    values = np.union1d(values_a, values_b)
+    ca = np.zeros(len(values), dtype=np.int64)
+    cb = np.zeros(len(values), dtype=np.int64)
+    ca[np.searchsorted(values, values_a)] = counts_a
+    cb[np.searchsorted(values, values_b)] = counts_b
+    ties = ca + cb
+    midranks = np.cumsum(ties) - ties + (ties + 1) / 2.0
+    u_a = float((ca * midranks).sum()) - n1 * (n1 + 1) / 2.0
+    pairs = n1 * n2
+    delta = 1.0 - 2.0 * u_a / pairs
+
+    n = n1 + n2
+    tie_term = float((ties.astype(float) ** 3 - ties).sum()) / (n * (n - 1))
+    variance = pairs / 12.0 * ((n + 1) - tie_term)
+    if variance <= 0:
+        return 1.0, delta
+    z = (abs(u_a - pairs / 2.0) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2))), delta
+
+
+def _percentile_of(values: np.ndarray, cumulative: np.ndarray, n: int, p: float) -> np.ndarray:
+    """Nearest-rank percentile along the last axis of cumulative counts"""
+    rank = max(1, math.ceil(n * p / 100.0))
+    return values[(cumulative >= rank).argmax(axis=-1)]
+
+
+def bootstrap_percentiles(a, b, percentiles=PERCENTILES, resamples: int = 2000,
+                          confidence: float = 0.95, rng=None) -> Dict[int, Tuple[float, float, float, float]]:
+    """Point estimates and bootstrap CIs of candidate - baseline per percentile"""
+    rng = rng or np.random.default_rng(0)
+    (values_a, counts_a), (values_b, counts_b) = a, b
+    n1, n2 = int(counts_a.sum()), int(counts_b.sum())
+    boot_a = np.cumsum(rng.multinomial(n1, counts_a / n1, size=resamples), axis=1)
+    boot_b = np.cumsum(rng.multinomial(n2, counts_b / n2, size=resamples), axis=1)
+    cum_a, cum_b = np.cumsum(counts_a), np.cumsum(counts_b)
+    tail = (1 - confidence) / 2 * 100
+    result = {}
+    for p in percentiles:
+        diffs = _percentile_of(values_b, boot_b, n2, p) - _percentile_of(values_a, boot_a, n1, p)
+        low, high = np.percentile(diffs, [tail, 100 - tail])
+        result[p] = (float(_percentile_of(values_a, cum_a, n1, p)), float(_percentile_of(values_b, cum_b, n2, p)),
+                     float(low), float(high))
+    return result
+
+
+def holm_adjust(p_values: List[float]) -> List[float]:
+    """Holm-Bonferroni step-down adjusted p-values"""
+    m = len(p_values)
+    order = sorted(range(m), key=lambda i: p_values[i])
+    adjusted = [1.0] * m
+    running = 0.0
+    for rank, i in enumerate(order):
+        running = max(running, min(1.0, (m - rank) * p_values[i]))
+        adjusted[i] = running
+    return adjusted
+
+
+def compare_endpoint(endpoint: str, baseline: Measurements, candidate: Measurements,
+                     config: Optional[ComparisonConfig] = None, rng=None) -> EndpointComparison:
+    """Unadjusted comparison of one endpoint (verdict assigned by compare_runs)"""
+    config = config or ComparisonConfig()
+    a, b = _distribution(baseline), _distribution(candidate)
+    comparison = EndpointComparison(endpoint, int(a[1].sum()), int(b[1].sum()))
+    if comparison.baseline_n < config.min_samples or comparison.candidate_n < config.min_samples:
+        return comparison
+    comparison.p_value, comparison.effect = mann_whitney(a, b)
+    comparison.percentiles = bootstrap_percentiles(a, b, resamples=config.bootstrap,
+                                                   confidence=config.confidence, rng=rng)
+    return comparison
+
+
+def compare_runs(baseline: Dict[str, Measurements], candidate: Dict[str, Measurements],
+                 config: Optional[ComparisonConfig] = None) -> ComparisonReport:
+    """Compare every endpoint present in both runs and classify it"""
+    config = config or ComparisonConfig()
+    rng = np.random.default_rng(config.seed)
+    comparisons = [compare_endpoint(endpoint, baseline[endpoint], candidate[endpoint], config, rng)
+                   for endpoint in sorted(set(baseline) & set(candidate))]
+    tested = [c for c in comparisons if c.percentiles]
+    p_values = [c.p_value for c in tested]
+    adjusted = holm_adjust(p_values) if config.correction == "holm" else p_values
+    for comparison, p in zip(tested, adjusted):
+        comparison.adjusted_p = p
+        if p < config.alpha and abs(comparison.effect) >= config.min_effect:
+            comparison.verdict = REGRESSED if comparison.effect > 0 else IMPROVED
+        else:
+            comparison.verdict = UNCHANGED
+    return ComparisonReport(comparisons, config)
+
+
+def print_report(report: ComparisonReport, emit=print):
+    icons = {IMPROVED: "🟢", UNCHANGED: "⚪", REGRESSED: "🔴", INSUFFICIENT: "⚫"}
+    config = report.config
+    emit(f"🔬 Regression check (alpha={config.alpha}, {config.correction} correction, "
+         f"min |effect|={config.min_effect}, {config.confidence:.0%} bootstrap CIs)")
+    for c in report.endpoints:
+        emit(f"   {icons[c.verdict]} {c.endpoint}: {c.verdict.upper()} "
+             f"(n={c.baseline_n}→{c.candidate_n}"
+             + (f", p={c.adjusted_p:.2g}, δ={c.effect:+.2f} {c.effect_label})" if c.percentiles else ")"))
+        for p, (base, cand, low, high) in c.percentiles.items():
+            emit(f"      p{p}: {base * 1000:.1f}ms → {cand * 1000:.1f}ms "
+                 f"(Δ {(cand - base) * 1000:+.1f}ms, CI [{low * 1000:+.1f}, {high * 1000:+.1f}]ms)")
+    counts = {v: len(report.by_verdict(v)) for v in (REGRESSED, IMPROVED, UNCHANGED, INSUFFICIENT)}
+    emit(f"   Regressed: {counts[REGRESSED]}, improved: {counts[IMPROVED]}, "
+         f"unchanged: {counts[UNCHANGED]}, insufficient data: {counts[INSUFFICIENT]}")
+
+
+def load_export_samples(path: str) -> Dict[str, List[float]]:
+    """Per-template latency samples from a result_export JSON Lines file"""
+    from route_templates import endpoint_template
+    samples: Dict[str, List[float]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("kind") == "request" and record.get("success"):
+                template = endpoint_template(record["method"], record["endpoint"])
+                samples.setdefault(template, []).append(record["execution_time"])
+    return samples
+
+
+def load_history_histograms(db: str, ref: str, suite: Optional[str] = None) -> Dict[str, Any]:
+    from benchmark_history import BenchmarkHistory
+    history = BenchmarkHistory(db)
+    try:
+        return history.run_histograms(history.resolve_run(ref, suite)["id"])
+    finally:
+        history.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROBOT benchmark regression gate")
+    parser.add_argument("--alpha", type=float, default=ComparisonConfig.alpha,
+                        help="family-wise false-positive rate (default: %(default)s)")
+    parser.add_argument("--min-effect", type=float, default=ComparisonConfig.min_effect,
+                        help="minimum |Cliff's delta| to flag (default: %(default)s)")
+    parser.add_argument("--min-samples", type=int, default=ComparisonConfig.min_samples)
+    parser.add_argument("--bootstrap", type=int, default=ComparisonConfig.bootstrap)
+    parser.add_argument("--confidence", type=float, default=ComparisonConfig.confidence)
+    parser.add_argument("--correction", choices=["holm", "none"], default=ComparisonConfig.correction)
+    parser.add_argument("--seed", type=int, default=0)
+    sub = parser.add_subparsers(dest="source", required=True)
+
+    p = sub.add_parser("history", help="compare two runs from the benchmark history")
+    p.add_argument("baseline")
+    p.add_argument("candidate")
+    p.add_argument("--db", default=os.environ.get("ROBOT_HISTORY_DB", "robot_history.db"))
+    p.add_argument("--suite")
+
+    p = sub.add_parser("exports", help="compare two result_export JSON Lines files")
+    p.add_argument("baseline")
+    p.add_argument("candidate")
+
+    args = parser.parse_args()
+    config = ComparisonConfig(alpha=args.alpha, min_effect=args.min_effect, min_samples=args.min_samples,
+                              bootstrap=args.bootstrap, confidence=args.confidence,
+                              correction=args.correction, seed=args.seed)
+    if args.source == "history":
+        try:
+            baseline = load_history_histograms(args.db, args.baseline, args.suite)
+            candidate = load_history_histograms(args.db, args.candidate, args.suite)
+        except LookupError as e:
+            print(f"❌ {e}")
+            exit(2)
+    else:
+        baseline = load_export_samples(args.baseline)
+        candidate = load_export_samples(args.candidate)
+
+    report = compare_runs(baseline, candidate, config)
+    print_report(report)
+    exit(0 if report.passed else 1)
+
+
+if __name__ == "__main__":
+    main()
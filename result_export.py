@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+ROBOT Test Result Exporters
+
+Streams one record per request and one per test step to JSON Lines, CSV
+and JUnit XML files while a suite runs. Records are written through
+immediately (nothing is accumulated in memory), so CI and dashboards can
+ingest long load runs without parsing stdout.
+
+Enabled with ROBOT_EXPORT_DIR; ROBOT_EXPORT_FORMATS selects the formats
+(default: jsonl,csv,junit).
+"""
+
+import csv
+import json
+import os
+import time
+from typing import Dict, Any, Optional, List
+from xml.sax.saxutils import quoteattr
+
+FORMATS = ["jsonl", "csv", "junit"]
+
+CSV_COLUMNS = ["kind", "timestamp", "suite", "step", "method", "endpoint", "status_code",
+               "success", "execution_time", "server_time", "network_time", "error_message",
+               "requests", "failures"]
+
+
+def request_record(suite: str, step: Optional[str], result) -> Dict[str, Any]:
+    """Flatten a TestResult into an export record"""
+    timing = getattr(result, "timing", None)
+    server_time = timing.server_time if timing is not None else None
+    return {
+        "kind": "request",
+        "timestamp": time.time(),
+        "suite": suite,
+        "step": step,
+        "method": result.method,
+        "endpoint": result.endpoint,
+        "status_code": result.status_code,
+        "success": result.success,
+        "execution_time": round(result.execution_time, 6),
+        "server_time": round(server_time, 6) if server_time is not None else None,
+        "network_time": round(timing.network_time(result.execution_time), 6) if server_time is not None else None,
+        "error_message": result.error_message
+    }
+
+
+def step_record(suite: str, step: str, passed: bool, duration: float, requests: int = 0,
+                failures: int = 0, error: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "kind": "step",
+        "timestamp": time.time(),
+        "suite": suite,
+        "step": step,
+        "success": passed,
+        "execution_time": round(duration, 6),
+        "error_message": error,
+        "requests": requests,
+        "failures": failures
+    }
+
+
+class JsonLinesExporter:
+    """One JSON document per line"""
+
+    def __init__(self, path: str, flush_every: int = 1000):
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8")
+        self.flush_every = flush_every
+        self.count = 0
+
+    def write(self, record: Dict[str, Any]):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class CsvExporter:
+    """Requests and steps in one CSV with a `kind` column"""
+
+    def __init__(self, path: str, flush_every: int = 1000):
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+        self.writer.writeheader()
+        self.flush_every = flush_every
+        self.count = 0
+
+    def write(self, record: Dict[str, Any]):
+        self.writer.writerow(record)
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class JUnitXmlExporter:
+    """JUnit XML written incrementally, one <testcase> per request and per step
+
+    Test counts are not known up front, so <testsuite> carries no count
+    attributes; CI parsers (Jenkins, GitLab, GitHub actions) count the
+    <testcase> elements themselves.
+    """
+
+    def __init__(self, path: str, suite: str, flush_every: int = 1000):
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8")
+        self.flush_every = flush_every
+        self.count = 0
+        started = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n')
+        self.file.write(f'  <testsuite name={quoteattr(suite)} timestamp="{started}">\n')
+
+    def write(self, record: Dict[str, Any]):
+        if record["kind"] == "request":
+            classname = f"{record['suite']}.{record['step'] or 'requests'}"
+            name = f"{record['method']} {record['endpoint']}"
+        else:
+            classname = record["suite"]
+            name = record["step"]
+        case = f'    <testcase classname={quoteattr(classname)} name={quoteattr(name)} time="{record["execution_time"]:.6f}"'
+        if record["success"]:
+            self.file.write(case + "/>\n")
+        else:
+            message = record.get("error_message")
+            if not message:
+                message = (f"HTTP {record['status_code']}" if record["kind"] == "request"
+                           else f"{record['failures']} of {record['requests']} requests failed")
+            self.file.write(f"{case}>\n      <failure message={quoteattr(str(message))}/>\n    </testcase>\n")
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.file.flush()
+
+    def close(self):
+        self.file.write("  </testsuite>\n</testsuites>\n")
+        self.file.close()
+
+
+class ResultExporter:
+    """Fans records out to every configured exporter"""
+
+    def __init__(self, suite: str, directory: str, formats: Optional[List[str]] = None):
+        self.suite = suite
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, f"{suite}-{time.strftime('%Y%m%d-%H%M%S')}")
+        self.exporters = []
+        for fmt in formats or FORMATS:
+            if fmt == "jsonl":
+                self.exporters.append(JsonLinesExporter(f"{stem}.jsonl"))
+            elif fmt == "csv":
+                self.exporters.append(CsvExporter(f"{stem}.csv"))
+            elif fmt == "junit":
+                self.exporters.append(JUnitXmlExporter(f"{stem}.xml", suite))
+            else:
+                raise ValueError(f"Unknown export format '{fmt}', expected one of {FORMATS}")
+
+    @classmethod
+    def from_env(cls, suite: str) -> Optional["ResultExporter"]:
+        """Create an exporter from ROBOT_EXPORT_DIR/ROBOT_EXPORT_FORMATS, or None if disabled"""
+        directory = os.environ.get("ROBOT_EXPORT_DIR")
+        if not directory:
+            return None
+        formats = [f.strip() for f in os.environ.get("ROBOT_EXPORT_FORMATS", ",".join(FORMATS)).split(",") if f.strip()]
+        return cls(suite, directory, formats)
+
+    @property
+    def paths(self) -> List[str]:
+        return [exporter.path for exporter in self.exporters]
+
+    def record_request(self, result, step: Optional[str] = None):
+        record = request_record(self.suite, step, result)
+        for exporter in self.exporters:
+            exporter.write(record)
+
+    def record_step(self, step: str, passed: bool, duration: float, requests: int = 0,
+                    failures: int = 0, error: Optional[str] = None):
+        record = step_record(self.suite, step, passed, duration, requests, failures, error)
+        for exporter in self.exporters:
+            exporter.write(record)
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
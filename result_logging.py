@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+ROBOT Test Result Logging Sink
+
+Buffered, low-overhead replacement for printing every request result.
+Results are recorded on the hot path with a couple of counter updates and
+a deque append; formatting and writing happen in batches on a background
+writer thread.
+
+Levels (ROBOT_LOG_LEVEL):
+    quiet    - nothing per request, only the final summary
+    progress - a single self-updating progress line
+    failures - one line per failed request
+    full     - every request plus suite notes (the original output)
+
+Run `python3 result_logging.py --benchmark` to measure per-request harness
+overhead at each level.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Optional, List, Callable
+
+QUIET = "quiet"
+PROGRESS = "progress"
+FAILURES = "failures"
+FULL = "full"
+LEVELS = [QUIET, PROGRESS, FAILURES, FULL]
+
+_NOTE = object()  # marker for free-form suite output
+
+
+def format_result(result) -> str:
+    """Default formatter: the suites' "✅ PASS METHOD endpoint" line"""
+    status = "✅ PASS" if result.success else "❌ FAIL"
+    line = f"{status} {result.method} {result.endpoint} ({result.status_code}) - {result.execution_time:.3f}s"
+    if result.error_message:
+        line += f"\n   Error: {result.error_message}"
+    return line
+
+
+class ResultSink:
+    """Records results and writes them asynchronously in batches"""
+
+    def __init__(self, level: str = FULL, stream=None, formatter: Callable[[Any], str] = format_result,
+                 ring_size: int = 100, flush_interval: float = 0.1):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown log level '{level}', expected one of {LEVELS}")
+        self.level = level
+        self.stream = stream or sys.stdout
+        self.formatter = formatter
+        self.flush_interval = flush_interval
+        self.total = 0
+        self.failed = 0
+        self.recent_failures = deque(maxlen=ring_size)
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._started_at = time.monotonic()
+        self._progress_shown = False
+        self._writer = None
+        if level != QUIET:
+            self._writer = threading.Thread(target=self._run, name="result-sink", daemon=True)
+            self._writer.start()
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "ResultSink":
+        """Create a sink using ROBOT_LOG_LEVEL (default: full)"""
+        return cls(level=os.environ.get("ROBOT_LOG_LEVEL", FULL).lower(), **kwargs)
+
+    # Hot path -------------------------------------------------------------
+
+    def record(self, result):
+        """Record one request result"""
+        self.total += 1
+        if not result.success:
+            self.failed += 1
+            self.recent_failures.append(result)
+            if self.level == FAILURES or self.level == FULL:
+                self._pending.append(result)
+        elif self.level == FULL:
+            self._pending.append(result)
+
+    def note(self, text: str):
+        """Queue free-form suite output (shown at the full level only)"""
+        if self.level == FULL:
+            self._pending.append((_NOTE, text))
+
+    # Writer side ----------------------------------------------------------
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self._drain()
+
+    def _drain(self):
+        with self._lock:
+            if self.level == PROGRESS:
+                self._write_progress()
+                return
+            pending = self._pending
+            if not pending:
+                return
+            chunk = []
+            while pending:
+                item = pending.popleft()
+                if type(item) is tuple and item[0] is _NOTE:
+                    chunk.append(item[1])
+                else:
+                    chunk.append(self.formatter(item))
+            self.stream.write("\n".join(chunk) + "\n")
+            self.stream.flush()
+
+    def _write_progress(self):
+        elapsed = time.monotonic() - self._started_at
+        rate = self.total / elapsed if elapsed > 0 else 0.0
+        self.stream.write(f"\r⏳ {self.total} requests | ✅ {self.total - self.failed} | "
+                          f"❌ {self.failed} | {rate:,.0f} req/s")
+        self.stream.flush()
+        self._progress_shown = True
+
+    def flush(self):
+        """Write everything recorded so far (call before printing summaries)"""
+        if self.level == QUIET:
+            return
+        self._drain()
+        if self._progress_shown:
+            with self._lock:
+                self.stream.write("\n")
+                self.stream.flush()
+                self._progress_shown = False
+
+    def close(self):
+        """Stop the writer thread after a final flush"""
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        self.flush()
+
+    def print_recent_failures(self, limit: Optional[int] = None):
+        """Print the ring buffer of the most recent failures"""
+        failures: List[Any] = list(self.recent_failures)[-limit:] if limit else list(self.recent_failures)
+        if not failures:
+            return
+        print(f"\n❌ Last {len(failures)} failures (of {self.failed}):")
+        for result in failures:
+            print(f"   {result.method} {result.endpoint} ({result.status_code}): {result.error_message}")
+
+
+@dataclass
+class _BenchResult:
+    endpoint: str
+    method: str
+    success: bool
+    status_code: int
+    response_data: Any
+    error_message: Optional[str] = None
+    execution_time: float = 0.0
+
+
+def _legacy_log_result(result):
+    """The original per-request print(), kept as the benchmark baseline"""
+    status = "✅ PASS" if result.success else "❌ FAIL"
+    print(f"{status} {result.method} {result.endpoint} ({result.status_code}) - {result.execution_time:.3f}s")
+    if result.error_message:
+        print(f"   Error: {result.error_message}")
+    if result.success and result.response_data:
+        if isinstance(result.response_data, dict):
+            if 'id' in result.response_data:
+                print(f"   Order ID: {result.response_data['id']}")
+
+
+def run_benchmark(n: int = 200_000, failure_rate: float = 0.02):
+    """Measure per-request overhead of each level, writing to /dev/null"""
+    results = [
+        _BenchResult(
+            endpoint=f"/orders/{i:08d}/status", method="PATCH",
+            success=(i % int(1 / failure_rate)) != 0, status_code=200,
+            response_data={"id": f"{i:08d}", "status": "у реалізації"},
+            error_message=None, execution_time=0.042
+        )
+        for i in range(n)
+    ]
+    for result in results:
+        if not result.success:
+            result.status_code, result.error_message = 500, "Internal Server Error"
+
+    print(f"⚡ Result logging overhead ({n:,} requests, {failure_rate:.0%} failures)")
+    print(f"   {'mode':<16}{'hot path':>14}{'incl. writes':>16}")
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull
+        try:
+            start = time.perf_counter()
+            for result in results:
+                _legacy_log_result(result)
+            legacy = (time.perf_counter() - start) / n
+        finally:
+            sys.stdout = stdout
+        print(f"   {'print (legacy)':<16}{legacy * 1e6:>11.2f} µs{legacy * 1e6:>13.2f} µs")
+
+        for level in LEVELS:
+            sink = ResultSink(level=level, stream=devnull)
+            start = time.perf_counter()
+            for result in results:
+                sink.record(result)
+            hot = (time.perf_counter() - start) / n
+            sink.close()
+            total = (time.perf_counter() - start) / n
+            print(f"   {level:<16}{hot * 1e6:>11.2f} µs{total * 1e6:>13.2f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROBOT result logging sink")
+    parser.add_argument("--benchmark", action="store_true", help="measure per-request overhead per level")
+    parser.add_argument("-n", "--requests", type=int, default=200_000)
+    args = parser.parse_args()
+    if args.benchmark:
+        run_benchmark(args.requests)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
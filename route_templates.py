@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+ROBOT Route Templates
+
+Maps concrete request endpoints to the API's route templates so results
+can be aggregated per route instead of per raw URL:
+
+    /orders/4f1c.../status                  -> /orders/{id}/status
+    /categories/abc                         -> /categories/{id}
+    /orders?status=нове&source=resto        -> /orders?status&source
+
+Known routes are compiled into a segment trie (static segments win over
+parameters), so matching costs one dict lookup per path segment. Query
+values are dropped and keys are put in the route's declared order, so
+"?source=a&status=b" and "?status=b&source=a" share a template. Paths
+outside the known routes fall back to replacing id-like segments.
+"""
+
+import re
+from typing import Dict, Optional, List, Set, Tuple
+
+API_PREFIX = "/api"
+
+ROUTES = [
+    "/health",
+    "/docs",
+    "/openapi.json",
+    "/me",
+    "/auth/telegram/verify",
+    "/auth/logout",
+    "/orders",
+    "/orders/stats/summary",
+    "/orders/{id}",
+    "/orders/{id}/status",
+    "/categories",
+    "/categories/reorder",
+    "/categories/{id}",
+    "/items",
+    "/items/{id}",
+    "/items/{id}/availability",
+    "/locations",
+    "/locations/{id}",
+    "/locations/{id}/delivery-settings",
+    "/media/sign-upload",
+    "/settings/delivery",
+    "/settings/locations",
+]
+
+# Declared query parameters per route, in template order
+QUERY_PARAMS = {
+    "/orders": ["status", "source", "location_id", "date_from", "date_to", "limit", "offset"],
+    "/items": ["categoryId"],
+}
+
+_ID_SEGMENT = re.compile(r"/(?:[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|[0-9a-fA-F]{24}|\d+)(?=/|$)")
+
+
+class _Node:
+    __slots__ = ("children", "param", "template")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.param: Optional["_Node"] = None
+        self.template: Optional[str] = None
+
+
+class RouteTrie:
+    """Compiled matcher over a set of route templates"""
+
+    def __init__(self, routes: List[str], query_params: Optional[Dict[str, List[str]]] = None):
+        self.root = _Node()
+        self.query_order: Dict[str, Dict[str, int]] = {}
+        for route in routes:
+            self.add(route, (query_params or {}).get(route))
+
+    def add(self, route: str, query_params: Optional[List[str]] = None):
+        node = self.root
+        for segment in _segments(route):
+            if segment.startswith("{") and segment.endswith("}"):
+                if node.param is None:
+                    node.param = _Node()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, _Node())
+        node.template = route
+        if query_params:
+            self.query_order[route] = {key: i for i, key in enumerate(query_params)}
+
+    def match(self, path: str) -> Optional[str]:
+        """Template of a concrete path, or None if no route matches"""
+        return self._match(self.root, _segments(path), 0)
+
+    def _match(self, node: _Node, segments: List[str], i: int) -> Optional[str]:
+        if i == len(segments):
+            return node.template
+        child = node.children.get(segments[i])
+        if child is not None:
+            template = self._match(child, segments, i + 1)
+            if template is not None:
+                return template
+        if node.param is not None:
+            return self._match(node.param, segments, i + 1)
+        return None
+
+    def normalize(self, endpoint: str) -> str:
+        """Path + query template of a concrete endpoint"""
+        path, _, query = endpoint.partition("?")
+        template = self.match(path)
+        if template is None:
+            template = _ID_SEGMENT.sub("/{id}", path.rstrip("/") or "/")
+        if not query:
+            return template
+        keys = {pair.partition("=")[0] for pair in query.split("&") if pair}
+        if not keys:
+            return template
+        order = self.query_order.get(template, {})
+        ranked = sorted(keys, key=lambda key: (order.get(key, len(order)), key))
+        return template + "?" + "&".join(ranked)
+
+
+def _segments(path: str) -> List[str]:
+    return [segment for segment in path.split("/") if segment]
+
+
+def _with_api_prefix(routes: List[str]) -> List[str]:
+    return routes + [API_PREFIX + route for route in routes]
+
+
+_default_trie = RouteTrie(
+    _with_api_prefix(ROUTES),
+    {**QUERY_PARAMS, **{API_PREFIX + route: keys for route, keys in QUERY_PARAMS.items()}}
+)
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """"/orders/<uuid>/status" -> "/orders/{id}/status" using the known ROBOT routes"""
+    return _default_trie.normalize(endpoint)
+
+
+def endpoint_template(method: str, endpoint: str) -> str:
+    """"PATCH /orders/<uuid>/status" -> "PATCH /orders/{id}/status" """
+    return f"{method} {_default_trie.normalize(endpoint)}"
+
+
+def known_template(method: str, endpoint: str) -> Optional[str]:
+    """endpoint_template() for paths on a known ROBOT route, None for anything else"""
+    if _default_trie.match(endpoint.partition("?")[0]) is None:
+        return None
+    return endpoint_template(method, endpoint)
+
+
+def split_template(template: str) -> Tuple[str, List[str]]:
+    """"/orders?status&source" -> ("/orders", ["status", "source"]); API prefix removed"""
+    path, _, query = template.partition("?")
+    if path.startswith(API_PREFIX + "/"):
+        path = path[len(API_PREFIX):]
+    return path, query.split("&") if query else []
+
+
+def succeeded_routes(results) -> Set[Tuple[str, str, bool]]:
+    """(method, path template, has query) of every successful result
+
+    For feature checks like "did any PATCH /orders/{id}/status succeed";
+    /api-prefixed endpoints count as their unprefixed route.
+    """
+    routes = set()
+    for result in results:
+        if result.success:
+            path, params = split_template(normalize_endpoint(result.endpoint))
+            routes.add((result.method, path, bool(params)))
+    return routes
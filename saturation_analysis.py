@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+ROBOT Saturation Analysis
+
+Turns windowed load-test measurements into capacity numbers:
+
+- the saturation knee: the offered load at which p99 latency (or the
+  error rate) stops growing gently and bends upward, found with a
+  two-segment least-squares fit of p99 against offered load
+- the maximum sustainable throughput: the highest achieved throughput of
+  any window that kept up with its offered load, stayed under the error
+  ceiling and kept p99 under the latency limit (the endpoint's SLO p99
+  budget when one exists, else 3x the p99 seen at the lowest loads)
+- for spikes, how long p99 took to recover after the spike; for soaks,
+  the p99 drift over the run
+
+Latencies are response times measured from each request's scheduled
+start, so time spent queued in the client counts (no coordinated
+omission).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, List, Tuple
+
+from latency_histogram import LatencyHistogram
+from memory_tracking import fit_growth
+
+MIN_WINDOW_REQUESTS = 5   # windows with fewer completions are not analysed
+MAX_ERROR_RATE = 0.01
+KEEP_UP_RATIO = 0.9       # achieved/offered below this means the system fell behind
+BASELINE_FACTOR = 3.0     # default p99 limit as a multiple of the low-load p99
+KNEE_SLOPE_RATIO = 3.0    # right-segment slope must be this much steeper
+
+MIX = "all requests"
+
+
+class WindowStats:
+    """Counters and response-time histogram of one key in one time window"""
+
+    __slots__ = ("offered", "completed", "errors", "histogram")
+
+    def __init__(self):
+        self.offered = 0
+        self.completed = 0
+        self.errors = 0
+        self.histogram = LatencyHistogram()
+
+
+class WindowRecorder:
+    """Buckets scheduled requests and their outcomes into fixed time windows"""
+
+    def __init__(self, window: float = 5.0):
+        self.window = window
+        self.windows: Dict[str, Dict[int, WindowStats]] = {}  # key -> window index -> stats
+
+    def _stats(self, key: str, index: int) -> WindowStats:
+        by_window = self.windows.setdefault(key, {})
+        stats = by_window.get(index)
+        if stats is None:
+            stats = by_window[index] = WindowStats()
+        return stats
+
+    def offered(self, key: str, scheduled_at: float):
+        """A request was scheduled `scheduled_at` seconds into the run"""
+        index = int(scheduled_at // self.window)
+        for name in (key, MIX):
+            self._stats(name, index).offered += 1
+
+    def completed(self, key: str, scheduled_at: float, response_time: float, success: bool):
+        index = int(scheduled_at // self.window)
+        for name in (key, MIX):
+            stats = self._stats(name, index)
+            stats.completed += 1
+            stats.histogram.record(response_time)
+            if not success:
+                stats.errors += 1
+
+
+@dataclass
+class WindowPoint:
+    start: float          # seconds into the run
+    offered_rate: float   # requests/s scheduled
+    achieved_rate: float  # successful requests/s completed
+    error_rate: float
+    p50: float
+    p95: float
+    p99: float
+    requests: int
+
+
+@dataclass
+class Knee:
+    offered_rate: float
+    slope_before: float   # seconds of p99 per req/s below the knee
+    slope_after: float
+
+
+@dataclass
+class CapacityReport:
+    key: str
+    points: List[WindowPoint]
+    knee: Optional[Knee]
+    error_knee: Optional[float]         # first offered rate with sustained errors
+    p99_limit: float
+    max_sustainable: Optional[float]    # req/s
+    recovered: Optional[bool] = None       # spike profiles
+    recovery_time: Optional[float] = None  # seconds from the spike's end
+    drift_per_hour: Optional[float] = None  # p99 seconds/hour (soak profiles)
+    drift_r_squared: Optional[float] = None
+
+
+def window_points(windows: Dict[int, WindowStats], window: float) -> List[WindowPoint]:
+    points = []
+    for index in sorted(windows):
+        stats = windows[index]
+        if stats.completed < MIN_WINDOW_REQUESTS:
+            continue
+        h = stats.histogram
+        points.append(WindowPoint(index * window, stats.offered / window,
+                                  (stats.completed - stats.errors) / window, stats.errors / stats.completed,
+                                  h.percentile(50), h.percentile(95), h.percentile(99), stats.completed))
+    return points
+
+
+def _line_sse(xs: List[float], ys: List[float]) -> Tuple[float, float]:
+    """(slope, sum of squared residuals) of a least-squares line"""
+    n = len(xs)
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x if var_x else 0.0
+    sse = sum((y - (mean_y + slope * (x - mean_x))) ** 2 for x, y in zip(xs, ys))
+    return slope, sse
+
+
+def find_knee(xs: List[float], ys: List[float], min_segment: int = 3) -> Optional[Knee]:
+    """Offered load where y bends upward, by the best two-segment linear fit"""
+    pairs = sorted(zip(xs, ys))
+    if len(pairs) < 2 * min_segment:
+        return None
+    xs, ys = [p[0] for p in pairs], [p[1] for p in pairs]
+    best = None
+    for k in range(min_segment, len(xs) - min_segment + 1):
+        if xs[k - 1] == xs[-1] or xs[0] == xs[k - 1]:
+            continue
+        left_slope, left_sse = _line_sse(xs[:k], ys[:k])
+        right_slope, right_sse = _line_sse(xs[k:], ys[k:])
+        if best is None or left_sse + right_sse < best[0]:
+            best = (left_sse + right_sse, k, left_slope, right_slope)
+    if best is None:
+        return None
+    _, k, left_slope, right_slope = best
+    baseline = sorted(ys[:k])[k // 2]
+    if right_slope <= 0 or right_slope < KNEE_SLOPE_RATIO * max(left_slope, 0.0) or max(ys[k:]) < 1.5 * baseline:
+        return None
+    return Knee(xs[k], left_slope, right_slope)
+
+
+def analyze(key: str, windows: Dict[int, WindowStats], window: float, p99_limit: Optional[float] = None,
+            spike: Optional[Tuple[float, float]] = None, soak: bool = False) -> CapacityReport:
+    """Capacity report for one endpoint template (or the whole mix)
+
+    `spike` is (start, end) of the spike in seconds into the run.
+    """
+    points = window_points(windows, window)
+    if not points:
+        return CapacityReport(key, [], None, None, p99_limit or 0.0, None)
+    by_load = sorted(points, key=lambda p: p.offered_rate)
+    low = by_load[:max(1, len(by_load) // 5)]
+    baseline = sorted(p.p99 for p in low)[len(low) // 2]
+    limit = p99_limit if p99_limit is not None else baseline * BASELINE_FACTOR
+
+    healthy = [p for p in points if p.error_rate <= MAX_ERROR_RATE and p.p99 <= limit
+               and p.achieved_rate >= KEEP_UP_RATIO * p.offered_rate * (1 - p.error_rate)]
+    max_sustainable = max((p.achieved_rate for p in healthy), default=None)
+
+    error_knee = None
+    erroring = [p for p in by_load if p.error_rate > MAX_ERROR_RATE]
+    if erroring:
+        threshold = erroring[0].offered_rate
+        # Sustained: most windows at or above this load error too
+        above = [p for p in by_load if p.offered_rate >= threshold]
+        if sum(p.error_rate > MAX_ERROR_RATE for p in above) >= len(above) / 2:
+            error_knee = threshold
+
+    report = CapacityReport(key, points, find_knee([p.offered_rate for p in points], [p.p99 for p in points]),
+                            error_knee, limit, max_sustainable)
+    if spike is not None:
+        before = [p.p99 for p in points if p.start + window <= spike[0]]
+        if before:
+            calm = sorted(before)[len(before) // 2] * 1.5
+            after = [p for p in points if p.start >= spike[1]]
+            recovered = next((p for p in after if p.p99 <= calm), None)
+            report.recovered = recovered is not None
+            report.recovery_time = recovered.start - spike[1] if recovered else None
+    if soak and len(points) >= 2:
+        trend = fit_growth("p99", [p.start for p in points], [p.p99 for p in points], min_growth=0.0)
+        report.drift_per_hour, report.drift_r_squared = trend.per_hour, trend.r_squared
+    return report
+
+
+def print_capacity(report: CapacityReport, emit=print, show_windows: bool = False):
+    emit(f"\n📈 {report.key}:")
+    if not report.points:
+        emit("   No window had enough completed requests to analyse")
+        return
+    if show_windows:
+        emit(f"   {'t':>7}{'offered':>10}{'achieved':>10}{'errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+        for p in report.points:
+            emit(f"   {p.start:>6.0f}s{p.offered_rate:>10.1f}{p.achieved_rate:>10.1f}{p.error_rate:>8.1%}"
+                 f"{p.p50 * 1000:>7.0f}ms{p.p95 * 1000:>7.0f}ms{p.p99 * 1000:>7.0f}ms")
+    if report.knee:
+        emit(f"   🔺 Latency knee at ~{report.knee.offered_rate:.1f} req/s offered "
+             f"(p99 slope {report.knee.slope_before * 1000:.2f} -> {report.knee.slope_after * 1000:.2f} ms per req/s)")
+    else:
+        emit("   No latency knee within the offered load range")
+    if report.error_knee is not None:
+        emit(f"   ❌ Errors above {MAX_ERROR_RATE:.0%} from ~{report.error_knee:.1f} req/s offered")
+    if report.max_sustainable is not None:
+        emit(f"   ✅ Max sustainable throughput: {report.max_sustainable:.1f} req/s "
+             f"(p99 ≤ {report.p99_limit * 1000:.0f}ms, errors ≤ {MAX_ERROR_RATE:.0%})")
+    else:
+        emit(f"   ⚠️ No window met p99 ≤ {report.p99_limit * 1000:.0f}ms with errors ≤ {MAX_ERROR_RATE:.0%}")
+    if report.recovered:
+        emit(f"   ⏱️ p99 recovered {report.recovery_time:.0f}s after the spike")
+    elif report.recovered is False:
+        emit("   ⚠️ p99 did not recover to its pre-spike level before the run ended")
+    if report.drift_per_hour is not None:
+        emit(f"   p99 drift {report.drift_per_hour * 1000:+.1f} ms/h (R²={report.drift_r_squared:.2f})")
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+ROBOT Harness Self-Benchmark
+
+Measures the load client's own ceiling: the full request path (encode,
+send, decode, success check, HarnessRun.record with logging and the
+per-endpoint histogram update) is driven against a local null HTTP
+server that answers instantly with canned /orders and /items bodies.
+
+For every transport x codec x log level combination it reports the
+maximum requests/s one core can drive (requests / client CPU time) and
+the latency the client adds on top of a raw-socket floor. Backend
+latencies measured by the load modes are only meaningful well above
+these numbers.
+
+    python3 self_benchmark.py                       # full matrix
+    python3 self_benchmark.py --requests 5000 --levels quiet full
+    python3 self_benchmark.py --profiler-overhead   # cost of the sampling profiler
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import time
+from typing import Dict, Any, List, Tuple
+
+from harness import HarnessRun
+from latency_histogram import LatencyHistogram
+from load_client import LoadClient, TRANSPORTS, available_codecs
+from profiler import SamplingProfiler, DEFAULT_INTERVAL
+from result_logging import ResultSink, LEVELS
+from synthetic_data import SyntheticDataGenerator
+
+ORDER_ID = "5f0c6a52-3b8e-4c1e-9a57-2d7f1b6e8c41"
+CATEGORY_ID = "cat_1"
+
+# Request mix per cycle, roughly the shape of the orders suites
+MIX = [
+    ("GET", "/api/orders?limit=50", None),
+    ("GET", f"/api/items?categoryId={CATEGORY_ID}", None),
+    ("POST", "/api/orders", "order"),
+    ("PATCH", f"/api/orders/{ORDER_ID}/status", {"status": "у реалізації"}),
+]
+
+
+# Null server ------------------------------------------------------------
+
+def canned_bodies(page_size: int = 50, menu_size: int = 200) -> Dict[str, bytes]:
+    """Realistic response bodies built once from the synthetic data generator"""
+    generator = SyntheticDataGenerator(seed=7)
+    menu = generator.generate_menu(menu_size)
+    orders = list(generator.generate_orders(page_size).records(menu, generator.tenant_ids,
+                                                               generator.location_ids))
+    encode = lambda value: json.dumps(value, ensure_ascii=False).encode("utf-8")
+    return {
+        "GET /api/orders": encode(orders),
+        "GET /api/items": encode(list(menu.records())),
+        "POST /api/orders": encode(orders[0]),
+        "PATCH /api/orders": encode({"id": ORDER_ID, "status": "у реалізації"}),
+        "*": b"{}",
+    }
+
+
+class NullHttpProtocol(asyncio.Protocol):
+    """Minimal HTTP/1.1 keep-alive responder returning canned bodies"""
+
+    def __init__(self, responses: Dict[str, bytes]):
+        self.responses = responses
+        self.buffer = b""
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data: bytes):
+        self.buffer += data
+        while True:
+            head_end = self.buffer.find(b"\r\n\r\n")
+            if head_end < 0:
+                return
+            head = self.buffer[:head_end].decode("latin-1")
+            length = 0
+            for line in head.split("\r\n")[1:]:
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            if len(self.buffer) < head_end + 4 + length:
+                return
+            self.buffer = self.buffer[head_end + 4 + length:]
+            method, path = head.split(" ", 2)[:2]
+            self.transport.write(self._response(method, path))
+
+    def _response(self, method: str, path: str) -> bytes:
+        route = path.split("?")[0]
+        key = f"{method} {route}"
+        if method == "PATCH":
+            key = f"PATCH {route.rsplit('/', 2)[0]}"
+        return self.responses.get(key, self.responses["*"])
+
+
+def _serve(port_queue, page_size: int):
+    bodies = canned_bodies(page_size)
+    responses = {
+        key: (b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+              b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+        for key, body in bodies.items()
+    }
+
+    async def run():
+        server = await asyncio.get_running_loop().create_server(
+            lambda: NullHttpProtocol(responses), "127.0.0.1", 0)
+        port_queue.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(run())
+
+
+def start_null_server(page_size: int = 50) -> Tuple[multiprocessing.Process, int]:
+    """Run the null server in its own process so its CPU is not charged to the client"""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(port_queue, page_size), daemon=True)
+    process.start()
+    return process, port_queue.get(timeout=30)
+
+
+# Measurements -----------------------------------------------------------
+
+def _summary(name: str, latencies: LatencyHistogram, n: int, wall: float, cpu: float) -> Dict[str, Any]:
+    return {
+        "config": name,
+        "requests": n,
+        "rps": n / wall if wall > 0 else 0.0,
+        "rps_per_core": n / cpu if cpu > 0 else float("inf"),
+        "cpu_us": cpu / n * 1e6,
+        "p50": latencies.percentile(50),
+        "p99": latencies.percentile(99),
+    }
+
+
+def measure_floor(port: int, n: int, order_body: bytes) -> Dict[str, Any]:
+    """Raw keep-alive socket with pre-built requests: the server + loopback floor"""
+    requests = []
+    for method, path, data in MIX:
+        body = order_body if data == "order" else json.dumps(data).encode() if data else b""
+        requests.append(f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+                        f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    latencies = LatencyHistogram()
+
+    def exchange(request: bytes):
+        sock.sendall(request)
+        data = b""
+        while b"\r\n\r\n" not in data:
+            data += sock.recv(65536)
+        head, _, body = data.partition(b"\r\n\r\n")
+        length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+        while len(body) < length:
+            body += sock.recv(65536)
+
+    for i in range(min(n, 200)):
+        exchange(requests[i % len(requests)])
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for i in range(n):
+        start = time.perf_counter()
+        exchange(requests[i % len(requests)])
+        latencies.record(time.perf_counter() - start)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    sock.close()
+    return _summary("raw socket (floor)", latencies, n, wall, cpu)
+
+
+def measure_config(port: int, n: int, transport: str, codec: str, level: str,
+                   order_payload: Dict[str, Any], devnull, profiler: SamplingProfiler = None) -> Dict[str, Any]:
+    """Full client path for one transport/codec/log level"""
+    harness = HarnessRun("self_benchmark", ResultSink(level=level, stream=devnull), profiler=profiler)
+    client = LoadClient.create(f"http://127.0.0.1:{port}", transport, codec, harness)
+    mix = [(method, path, order_payload if data == "order" else data) for method, path, data in MIX]
+    latencies = LatencyHistogram()
+
+    for i in range(min(n, 200)):
+        method, path, data = mix[i % len(mix)]
+        client.request(method, path, data)
+    if profiler:
+        profiler.start()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for i in range(n):
+        method, path, data = mix[i % len(mix)]
+        start = time.perf_counter()
+        result = client.request(method, path, data)
+        latencies.record(time.perf_counter() - start)
+        if not result.success:
+            raise RuntimeError(f"{method} {path} failed against the null server: {result.error_message}")
+    harness.sink.flush()
+    if profiler:
+        profiler.stop()
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    client.close()
+    harness.sink.close()
+    return _summary(f"{transport} / {codec} / {level}", latencies, n, wall, cpu)
+
+
+def measure_profiler_overhead(port: int, n: int, order_payload: Dict[str, Any], devnull,
+                              interval: float = DEFAULT_INTERVAL, rounds: int = 5) -> Tuple[float, float, int]:
+    """CPU per request with and without the sampling profiler, alternating to cancel drift
+
+    Returns (median µs/request without, median µs/request with, samples taken).
+    """
+    plain, profiled, samples = [], [], 0
+    for _ in range(rounds):
+        plain.append(measure_config(port, n, "http.client", "json", "quiet", order_payload, devnull)["cpu_us"])
+        profiler = SamplingProfiler(interval)
+        profiled.append(measure_config(port, n, "http.client", "json", "quiet", order_payload, devnull,
+                                       profiler)["cpu_us"])
+        samples += profiler.samples
+    return statistics.median(plain), statistics.median(profiled), samples
+
+
+def print_results(floor: Dict[str, Any], results: List[Dict[str, Any]]):
+    print(f"\n⚡ Harness self-benchmark ({floor['requests']:,} requests per config, "
+          f"{len(MIX)}-request mix, 1 client thread)")
+    print(f"   {'config':<34}{'req/s':>9}{'req/s/core':>12}{'CPU/req':>11}{'p50':>10}{'p99':>10}"
+          f"{'added p50':>12}")
+    for row in [floor] + results:
+        added = row["p50"] - floor["p50"]
+        added_text = "" if row is floor else f"{added * 1e6:>9.0f} µs"
+        print(f"   {row['config']:<34}{row['rps']:>9,.0f}{row['rps_per_core']:>12,.0f}"
+              f"{row['cpu_us']:>8.0f} µs{row['p50'] * 1e6:>7.0f} µs{row['p99'] * 1e6:>7.0f} µs{added_text:>12}")
+    best = max(results, key=lambda row: row["rps_per_core"])
+    print(f"\n   Ceiling: {best['rps_per_core']:,.0f} req/s per core ({best['config']}); "
+          f"latencies below ~{best['p99'] * 1e3:.2f}ms are within client overhead")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the ROBOT load client's own overhead")
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="measured requests per config")
+    parser.add_argument("--transports", nargs="+", choices=list(TRANSPORTS), default=list(TRANSPORTS))
+    parser.add_argument("--codecs", nargs="+", default=None, help="default: all installed codecs")
+    parser.add_argument("--levels", nargs="+", choices=LEVELS, default=LEVELS)
+    parser.add_argument("--page-size", type=int, default=50, help="orders in the canned GET /orders body")
+    parser.add_argument("--json", dest="json_out", help="also write the results to this JSON file")
+    parser.add_argument("--profiler-overhead", action="store_true",
+                        help="only measure the sampling profiler's overhead (http.client / json / quiet)")
+    parser.add_argument("--profile-interval", type=float, default=DEFAULT_INTERVAL * 1000,
+                        help="profiler sampling interval for --profiler-overhead (ms)")
+    args = parser.parse_args()
+
+    codecs = args.codecs or available_codecs()
+    missing = [codec for codec in codecs if codec not in available_codecs()]
+    if missing:
+        parser.error(f"codec(s) not available: {', '.join(missing)}")
+
+    generator = SyntheticDataGenerator(seed=11)
+    generator.generate_menu()
+    order_payload = next(generator.iter_order_records(1, payload_only=True))
+    order_body = json.dumps(order_payload, ensure_ascii=False).encode("utf-8")
+
+    server, port = start_null_server(args.page_size)
+    if args.profiler_overhead:
+        try:
+            with open(os.devnull, "w", encoding="utf-8") as devnull:
+                plain, profiled, samples = measure_profiler_overhead(
+                    port, max(args.requests, 20000), order_payload, devnull, args.profile_interval / 1000.0)
+        finally:
+            server.terminate()
+            server.join()
+        overhead = profiled / plain - 1.0
+        verdict = "✅" if overhead < 0.02 else "⚠️"
+        print(f"\n🔥 Sampling profiler overhead at {args.profile_interval:g}ms ({samples} samples): "
+              f"{plain:.0f} µs -> {profiled:.0f} µs CPU per request, {verdict} {overhead:+.2%}")
+        return
+    try:
+        floor = measure_floor(port, args.requests, order_body)
+        results = []
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            for transport in args.transports:
+                for codec in codecs:
+                    for level in args.levels:
+                        results.append(measure_config(port, args.requests, transport, codec, level,
+                                                      order_payload, devnull))
+    finally:
+        server.terminate()
+        server.join()
+
+    print_results(floor, results)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"floor": floor, "results": results}, f, indent=2)
+        print(f"📁 Results written: {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+ROBOT Server Timing Capture
+
+Keeps a whitelist of response headers on each result and derives how much
+of a request's latency was spent inside the server, so reports can split
+latency into server time and network/queueing time (client-observed
+latency minus server time).
+
+Server time is taken from, in order of preference:
+    Server-Timing     largest `dur` entry, or the `total` entry if present
+                      (`service` when a router forwards Heroku's
+                      connect/service timings as Server-Timing entries)
+    X-Response-Time   "12.3ms", "0.0123s" or a bare number of milliseconds
+    X-Runtime         seconds (Rails/Rack convention)
+
+ROBOT_CAPTURE_HEADERS overrides the captured header whitelist (comma
+separated).
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List
+
+DEFAULT_CAPTURE_HEADERS = ["Server-Timing", "X-Response-Time", "X-Runtime", "X-Request-ID",
+                           "Via", "Content-Length"]
+
+_DURATION = re.compile(r"^\s*([0-9]*\.?[0-9]+)\s*(ms|s|us|µs)?\s*$", re.IGNORECASE)
+
+
+@dataclass
+class ResponseTiming:
+    """Captured headers and server-side timing of one response"""
+    headers: Dict[str, str] = field(default_factory=dict)
+    server_timing: Dict[str, float] = field(default_factory=dict)  # metric name -> seconds
+    server_time: Optional[float] = None  # seconds spent in the server, if reported
+
+    def network_time(self, total: float) -> Optional[float]:
+        """Client-observed latency not accounted for by the server"""
+        if self.server_time is None:
+            return None
+        return max(total - self.server_time, 0.0)
+
+
+def capture_headers_from_env() -> List[str]:
+    value = os.environ.get("ROBOT_CAPTURE_HEADERS")
+    if not value:
+        return DEFAULT_CAPTURE_HEADERS
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+CAPTURE_HEADERS = capture_headers_from_env()
+
+
+def parse_server_timing(value: str) -> Dict[str, float]:
+    """Parse a Server-Timing header into {metric: seconds}
+
+    `db;dur=53.2, app;desc="render";dur=47.2, cache;desc="hit"` ->
+    {"db": 0.0532, "app": 0.0472}; metrics without `dur` are skipped.
+    """
+    metrics = {}
+    for entry in _split_list(value):
+        parts = [part.strip() for part in entry.split(";")]
+        name = parts[0]
+        if not name:
+            continue
+        for param in parts[1:]:
+            key, _, raw = param.partition("=")
+            if key.strip().lower() == "dur":
+                try:
+                    metrics[name] = float(raw.strip().strip('"')) / 1000.0
+                except ValueError:
+                    pass
+                break
+    return metrics
+
+
+def parse_duration(value: str, default_unit: str = "ms") -> Optional[float]:
+    """"12.3ms" / "0.0123s" / "12.3" (default_unit) -> seconds"""
+    match = _DURATION.match(value)
+    if not match:
+        return None
+    number = float(match.group(1))
+    unit = (match.group(2) or default_unit).lower()
+    return number / {"s": 1.0, "ms": 1e3, "us": 1e6, "µs": 1e6}[unit]
+
+
+def _split_list(value: str) -> List[str]:
+    """Split a header list on commas outside quoted strings"""
+    items, current, quoted = [], [], False
+    for char in value:
+        if char == '"':
+            quoted = not quoted
+        if char == "," and not quoted:
+            items.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    items.append("".join(current).strip())
+    return [item for item in items if item]
+
+
+def server_time_of(headers, server_timing: Dict[str, float]) -> Optional[float]:
+    """Seconds spent in the server according to the response headers, or None"""
+    if server_timing:
+        for name in ("total", "service"):
+            if name in server_timing:
+                return server_timing[name]
+        return max(server_timing.values())
+    for name, unit in (("x-response-time", "ms"), ("x-runtime", "s")):
+        for key, value in headers.items():
+            if key.lower() == name:
+                seconds = parse_duration(value, unit)
+                if seconds is not None:
+                    return seconds
+    return None
+
+
+def timing_from_headers(response_headers, header_names: Optional[List[str]] = None) -> ResponseTiming:
+    """Build a ResponseTiming from a case-insensitive header mapping"""
+    headers = {}
+    for name in header_names or CAPTURE_HEADERS:
+        value = response_headers.get(name)
+        if value is not None:
+            headers[name] = value
+    raw = response_headers.get("Server-Timing")
+    server_timing = parse_server_timing(raw) if raw else {}
+    return ResponseTiming(headers, server_timing, server_time_of(response_headers, server_timing))
+
+
+def capture_timing(response, header_names: Optional[List[str]] = None) -> ResponseTiming:
+    """Build a ResponseTiming from a requests.Response"""
+    return timing_from_headers(response.headers, header_names)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+ROBOT Service Level Objectives
+
+Evaluates per-endpoint budgets from a declarative JSON file against the
+latency histograms and counters a HarnessRun collected. Budgets are keyed
+by "METHOD /template" as produced by route_templates.endpoint_template; a key
+without a query string also covers its query variants ("GET /orders"
+includes "GET /orders?status"). Supported targets per endpoint:
+
+    p50, p90, p95, p99, max, mean   latency ceilings in seconds
+    error_rate                      ceiling on the failed/total fraction
+    min_throughput                  floor in requests/second over the run
+    min_requests                    minimum samples before latency/throughput
+                                    targets are enforced (default 1)
+
+The file is ROBOT_SLO_FILE, or slo_budgets.json next to this module;
+ROBOT_SLO_FILE=none disables evaluation.
+
+    python3 slo.py --check            validate the budget file
+"""
+
+import argparse
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List
+
+from latency_histogram import LatencyHistogram
+
+DEFAULT_BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "slo_budgets.json")
+
+LATENCY_TARGETS = ["mean", "max"]
+_PERCENTILE = re.compile(r"p(\d{1,2}(?:\.\d+)?)")
+OTHER_TARGETS = ["error_rate", "min_throughput", "min_requests"]
+
+
+@dataclass
+class SloCheck:
+    """One target of one endpoint budget"""
+    endpoint: str
+    target: str
+    limit: float
+    actual: Optional[float]
+    requests: int
+    passed: bool
+    skipped: bool = False
+
+    def describe(self) -> str:
+        if self.skipped:
+            return f"{self.endpoint} {self.target}: skipped ({self.requests} requests)"
+        if self.target == "error_rate":
+            return (f"{self.endpoint} error_rate: {self.actual:.2%} "
+                    f"{'≤' if self.passed else '>'} {self.limit:.2%} budget (n={self.requests})")
+        if self.target == "min_throughput":
+            return (f"{self.endpoint} throughput: {self.actual:.2f} req/s "
+                    f"{'≥' if self.passed else '<'} {self.limit:.2f} req/s budget (n={self.requests})")
+        over = (self.actual - self.limit) / self.limit * 100 if self.limit else 0.0
+        return (f"{self.endpoint} {self.target}: {self.actual:.3f}s "
+                f"{'≤' if self.passed else '>'} {self.limit:.3f}s budget ({over:+.1f}%, n={self.requests})")
+
+
+@dataclass
+class SloReport:
+    source: str
+    checks: List[SloCheck]
+    unbudgeted: List[str]
+
+    @property
+    def violations(self) -> List[SloCheck]:
+        return [c for c in self.checks if not c.passed]
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
+
+def validate_budgets(budgets: Dict[str, Any]):
+    """Raise ValueError on malformed keys or targets"""
+    for endpoint, targets in budgets.items():
+        if not re.fullmatch(r"[A-Z]+ /\S*", endpoint):
+            raise ValueError(f"Budget key '{endpoint}' must look like 'GET /orders/{{id}}'")
+        if not isinstance(targets, dict) or not targets:
+            raise ValueError(f"Budget for '{endpoint}' must be a non-empty object")
+        for target, limit in targets.items():
+            if target not in LATENCY_TARGETS + OTHER_TARGETS and not _PERCENTILE.fullmatch(target):
+                raise ValueError(f"Unknown target '{target}' for '{endpoint}'")
+            if not isinstance(limit, (int, float)) or limit < 0:
+                raise ValueError(f"Target '{target}' for '{endpoint}' must be a non-negative number")
+
+
+def load_budgets(path: Optional[str] = None) -> Optional[Dict[str, Dict[str, float]]]:
+    """Load the budget file (see module docstring), or None when disabled/absent"""
+    if path is None:
+        path = os.environ.get("ROBOT_SLO_FILE", DEFAULT_BUDGET_FILE)
+    if not path or path.lower() == "none" or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    budgets = data.get("endpoints", {})
+    validate_budgets(budgets)
+    return budgets
+
+
+def _covered(budget_key: str, template: str) -> bool:
+    if template == budget_key:
+        return True
+    return "?" not in budget_key and template.partition("?")[0] == budget_key
+
+
+def evaluate(budgets: Dict[str, Dict[str, float]], endpoints: Dict[str, Any], duration: float,
+             source: str = "") -> SloReport:
+    """Check every budget against per-template stats (objects with histogram/requests/errors)"""
+    checks = []
+    covered = set()
+    for key, targets in budgets.items():
+        histogram = LatencyHistogram()
+        requests = errors = 0
+        for template, stats in endpoints.items():
+            if _covered(key, template):
+                covered.add(template)
+                histogram.merge(stats.histogram)
+                requests += stats.requests
+                errors += stats.errors
+        enough = requests >= targets.get("min_requests", 1)
+        for target, limit in targets.items():
+            if target == "min_requests":
+                continue
+            if target == "error_rate":
+                if not requests:
+                    checks.append(SloCheck(key, target, limit, None, 0, True, skipped=True))
+                    continue
+                actual = errors / requests
+                checks.append(SloCheck(key, target, limit, actual, requests, actual <= limit))
+                continue
+            if not enough:
+                checks.append(SloCheck(key, target, limit, None, requests, True, skipped=True))
+                continue
+            if target == "min_throughput":
+                actual = requests / duration if duration > 0 else 0.0
+                checks.append(SloCheck(key, target, limit, actual, requests, actual >= limit))
+                continue
+            if target == "mean":
+                actual = histogram.mean
+            elif target == "max":
+                actual = histogram.max
+            else:
+                actual = histogram.percentile(float(_PERCENTILE.fullmatch(target).group(1)))
+            checks.append(SloCheck(key, target, limit, actual, requests, actual <= limit))
+    unbudgeted = sorted(set(endpoints) - covered)
+    return SloReport(source, checks, unbudgeted)
+
+
+def print_report(report: SloReport, emit=print):
+    evaluated = [c for c in report.checks if not c.skipped]
+    skipped = len(report.checks) - len(evaluated)
+    emit(f"\n🎯 SLO Budgets ({os.path.basename(report.source) or 'inline'}):")
+    for check in report.violations:
+        emit(f"   ❌ {check.describe()}")
+    met = len(evaluated) - len(report.violations)
+    emit(f"   {'✅' if report.passed else '⚠️'} {met}/{len(evaluated)} targets met"
+         + (f", {skipped} skipped (no traffic)" if skipped else ""))
+    if report.unbudgeted:
+        emit(f"   ℹ️ No budget for: {', '.join(report.unbudgeted)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROBOT SLO budgets")
+    parser.add_argument("--file", default=os.environ.get("ROBOT_SLO_FILE", DEFAULT_BUDGET_FILE))
+    parser.add_argument("--check", action="store_true", help="validate the budget file")
+    args = parser.parse_args()
+    if not args.check:
+        parser.print_help()
+        return
+    try:
+        budgets = load_budgets(args.file)
+    except (ValueError, json.JSONDecodeError) as e:
+        print(f"❌ {args.file}: {e}")
+        exit(1)
+    if budgets is None:
+        print(f"❌ No budget file at {args.file}")
+        exit(1)
+    targets = sum(len(t) for t in budgets.values())
+    print(f"✅ {args.file}: {len(budgets)} endpoints, {targets} targets")
+
+
+if __name__ == "__main__":
+    main()
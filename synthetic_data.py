@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+ROBOT Synthetic Data Generator
+
+This script generates realistic menu items and orders for load testing.
+Records are produced in seeded, vectorized NumPy batches and can be
+streamed as NDJSON or saved as columnar .npz batches.
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional, List, Iterator
+
+import numpy as np
+
+# Domain constants (kept in sync with orders_api_comprehensive_test.py)
+UKRAINIAN_STATUSES = ["нове", "у реалізації", "виконано"]
+ORDER_SOURCES = ["resto", "telegram", "glovo", "bolt", "wolt", "custom"]
+PAYMENT_STATUSES = ["оплачено", "неоплачено"]
+DELIVERY_TYPES = ["доставка", "особистий відбір"]
+LANGUAGES = ["ua", "pl", "en", "by"]
+
+# Share of orders per source; aggregators never produce pickup orders
+SOURCE_WEIGHTS = [0.34, 0.22, 0.16, 0.12, 0.11, 0.05]
+AGGREGATOR_SOURCES = {"glovo", "bolt", "wolt"}
+
+# Default business hours (same shape as TEST_LOCATION_UPDATE)
+DEFAULT_HOURS = {
+    "mon": {"open": "08:00", "close": "23:00"},
+    "tue": {"open": "08:00", "close": "23:00"},
+    "wed": {"open": "08:00", "close": "23:00"},
+    "thu": {"open": "08:00", "close": "23:00"},
+    "fri": {"open": "08:00", "close": "24:00"},
+    "sat": {"open": "09:00", "close": "24:00"},
+    "sun": {"open": "09:00", "close": "22:00"}
+}
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+# Dish catalogue: names in ua/pl/en/by and a typical price in UAH
+DISHES = [
+    ({"ua": "Борщ український", "pl": "Barszcz ukraiński", "en": "Ukrainian Borscht", "by": "Украінскі борш"}, 65.0),
+    ({"ua": "Вареники з картоплею", "pl": "Pierogi z ziemniakami", "en": "Potato Dumplings", "by": "Вареннікі з бульбай"}, 55.0),
+    ({"ua": "Вареники з вишнею", "pl": "Pierogi z wiśniami", "en": "Cherry Dumplings", "by": "Вареннікі з вішняй"}, 60.0),
+    ({"ua": "Піца Маргарита", "pl": "Pizza Margherita", "en": "Margherita Pizza", "by": "Піца Маргарыта"}, 180.0),
+    ({"ua": "Піца Пепероні", "pl": "Pizza Pepperoni", "en": "Pepperoni Pizza", "by": "Піца Пеперані"}, 210.0),
+    ({"ua": "Хліб житній домашній", "pl": "Chleb żytni domowy", "en": "Homemade Rye Bread", "by": "Хлеб жытні хатні"}, 25.0),
+    ({"ua": "Деруни зі сметаною", "pl": "Placki ziemniaczane ze śmietaną", "en": "Potato Pancakes with Sour Cream", "by": "Дранікі са смятанай"}, 85.0),
+    ({"ua": "Голубці", "pl": "Gołąbki", "en": "Cabbage Rolls", "by": "Галубцы"}, 95.0),
+    ({"ua": "Котлета по-київськи", "pl": "Kotlet po kijowsku", "en": "Chicken Kyiv", "by": "Кацлета па-кіеўску"}, 145.0),
+    ({"ua": "Салат Олів'є", "pl": "Sałatka jarzynowa", "en": "Olivier Salad", "by": "Салата Алівье"}, 70.0),
+    ({"ua": "Сирники", "pl": "Serniczki", "en": "Cottage Cheese Pancakes", "by": "Сырнікі"}, 75.0),
+    ({"ua": "Тірамісу класичний", "pl": "Tiramisu klasyczne", "en": "Classic Tiramisu", "by": "Тырамісу класічны"}, 85.0),
+    ({"ua": "Бургер з яловичиною", "pl": "Burger wołowy", "en": "Beef Burger", "by": "Бургер з ялавічынай"}, 165.0),
+    ({"ua": "Суп-локшина", "pl": "Rosół z makaronem", "en": "Chicken Noodle Soup", "by": "Суп-локшына"}, 60.0),
+    ({"ua": "Узвар", "pl": "Kompot z suszu", "en": "Dried Fruit Compote", "by": "Узвар"}, 30.0),
+    ({"ua": "Лимонад домашній", "pl": "Lemoniada domowa", "en": "Homemade Lemonade", "by": "Ліманад хатні"}, 45.0),
+]
+
+# Variants multiply the catalogue so large menus don't repeat names
+VARIANTS = [
+    ({"ua": "", "pl": "", "en": "", "by": ""}, 1.0),
+    ({"ua": " (велика порція)", "pl": " (duża porcja)", "en": " (large)", "by": " (вялікая порцыя)"}, 1.4),
+    ({"ua": " (мала порція)", "pl": " (mała porcja)", "en": " (small)", "by": " (малая порцыя)"}, 0.7),
+    ({"ua": " від шефа", "pl": " od szefa kuchni", "en": " by the chef", "by": " ад шэфа"}, 1.25),
+    ({"ua": " веган", "pl": " wegańskie", "en": " vegan", "by": " веган"}, 1.1),
+]
+
+DESCRIPTION_TEMPLATES = {
+    "ua": "{} за рецептом нашої кухні",
+    "pl": "{} według przepisu naszej kuchni",
+    "en": "{} made to our kitchen's recipe",
+    "by": "{} па рэцэпце нашай кухні"
+}
+
+FIRST_NAMES = ["Олександр", "Марія", "Андрій", "Олена", "Іван", "Наталія", "Дмитро", "Ірина",
+               "Сергій", "Юлія", "Роман", "Оксана", "Тарас", "Катерина", "Богдан", "Софія"]
+LAST_NAMES = ["Петренко", "Іваненко", "Шевченко", "Коваленко", "Бондаренко", "Ткаченко",
+              "Кравченко", "Олійник", "Мельник", "Поліщук", "Савченко", "Руденко"]
+STREETS = ["вул. Хрещатик", "вул. Саксаганського", "просп. Перемоги", "вул. Велика Васильківська",
+           "бул. Лесі Українки", "вул. Антоновича", "вул. Ярославів Вал"]
+PHONE_OPERATORS = [50, 63, 66, 67, 68, 73, 93, 95, 96, 97, 98, 99]
+
+QUANTITIES = np.array([1, 2, 3, 4, 5])
+QUANTITY_WEIGHTS = np.array([0.62, 0.24, 0.08, 0.04, 0.02])
+PACKAGING_KOPECKS = np.array([0, 100, 200, 300, 500])
+PACKAGING_WEIGHTS = np.array([0.3, 0.25, 0.25, 0.12, 0.08])
+DELIVERY_FEE_KOPECKS = np.array([2500, 3000, 4000, 5000])
+DELIVERY_FEE_WEIGHTS = np.array([0.35, 0.35, 0.2, 0.1])
+
+
+def _hhmm_to_seconds(value: str) -> int:
+    """Convert "HH:MM" (including "24:00") to seconds after midnight"""
+    hours, minutes = value.split(":")
+    return int(hours) * 3600 + int(minutes) * 60
+
+
+def _kopecks_to_float(values: np.ndarray) -> np.ndarray:
+    """Convert integer kopecks to UAH floats rounded to 2 decimals"""
+    return np.round(values / 100.0, 2)
+
+
+def _uuid_strings(raw: np.ndarray) -> List[str]:
+    """Format an (n, 16) uint8 array as version-4 UUID strings"""
+    raw = raw.copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    h = raw.tobytes().hex()
+    return [f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+            for i in range(0, len(h), 32)]
+
+
+def _iso_strings(timestamps: np.ndarray) -> List[str]:
+    """Format unix timestamps as ISO-8601 UTC strings (NaN becomes None)"""
+    missing = np.isnan(timestamps)
+    seconds = np.where(missing, 0, timestamps).astype("datetime64[s]")
+    formatted = np.char.add(np.datetime_as_string(seconds, unit="s"), "Z").tolist()
+    if missing.any():
+        for i in np.flatnonzero(missing):
+            formatted[i] = None
+    return formatted
+
+
+@dataclass
+class ItemBatch:
+    """Columnar batch of menu items"""
+    ids: np.ndarray              # (n, 16) uint8 uuid bytes
+    category_ids: np.ndarray     # (n, 16) uint8 uuid bytes
+    dish_idx: np.ndarray
+    variant_idx: np.ndarray
+    price_kopecks: np.ndarray
+    packaging_kopecks: np.ndarray
+    available: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dish_idx)
+
+    def name(self, i: int) -> Dict[str, str]:
+        dish, _ = DISHES[self.dish_idx[i]]
+        variant, _ = VARIANTS[self.variant_idx[i]]
+        return {lang: dish[lang] + variant[lang] for lang in LANGUAGES}
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Yield item records shaped like the `Item` API type"""
+        prices = _kopecks_to_float(self.price_kopecks).tolist()
+        packaging = _kopecks_to_float(self.packaging_kopecks).tolist()
+        available = self.available.tolist()
+        ids = _uuid_strings(self.ids)
+        category_ids = _uuid_strings(self.category_ids)
+        for i in range(len(self)):
+            name = self.name(i)
+            yield {
+                "id": ids[i],
+                "category_id": category_ids[i],
+                "name": name,
+                "description": {lang: DESCRIPTION_TEMPLATES[lang].format(name[lang]) for lang in LANGUAGES},
+                "price": prices[i],
+                "packaging_price": packaging[i],
+                "available": available[i]
+            }
+
+
+@dataclass
+class OrderBatch:
+    """Columnar batch of orders with a flattened line-item table"""
+    ids: np.ndarray               # (n, 16) uint8 uuid bytes
+    tenant_idx: np.ndarray
+    location_idx: np.ndarray
+    source_idx: np.ndarray
+    status_idx: np.ndarray
+    payment_idx: np.ndarray
+    pickup: np.ndarray            # bool, True for "особистий відбір"
+    order_time: np.ndarray        # unix seconds (float64)
+    accepted_time: np.ndarray     # unix seconds, NaN until "у реалізації"
+    completed_time: np.ndarray    # unix seconds, NaN until "виконано"
+    customer_first: np.ndarray
+    customer_last: np.ndarray
+    phone_operator: np.ndarray
+    phone_number: np.ndarray
+    street_idx: np.ndarray
+    house_number: np.ndarray
+    line_offsets: np.ndarray      # start index of each order's lines, len n + 1
+    line_item_idx: np.ndarray     # index into the menu ItemBatch
+    line_quantity: np.ndarray
+    line_price_kopecks: np.ndarray
+    line_packaging_kopecks: np.ndarray
+    line_subtotal_kopecks: np.ndarray
+    subtotal_kopecks: np.ndarray
+    delivery_fee_kopecks: np.ndarray
+    total_kopecks: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.source_idx)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Return all columns by name (for .npz output or analysis)"""
+        return dict(self.__dict__)
+
+    def records(self, menu: ItemBatch, tenant_ids: List[str], location_ids: List[str],
+                payload_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """Yield order records as dicts; payload_only drops server-assigned fields"""
+        for line in self.ndjson_lines(menu, tenant_ids, location_ids, payload_only):
+            yield json.loads(line)
+
+    def ndjson_lines(self, menu: ItemBatch, tenant_ids: List[str], location_ids: List[str],
+                     payload_only: bool = False) -> Iterator[str]:
+        """Yield one JSON document per order
+
+        Static fragments (menu item names, vocabularies) are encoded once per
+        batch, which is several times faster than json.dumps per record.
+        """
+        item_ids = _uuid_strings(menu.ids)
+        item_names = [_json(menu.name(i)) for i in range(len(menu))]
+        order_ids = _uuid_strings(self.ids)
+        order_times = _iso_strings(self.order_time)
+        accepted_times = _iso_strings(self.accepted_time)
+        completed_times = _iso_strings(self.completed_time)
+        offsets = self.line_offsets.tolist()
+        item_idx = self.line_item_idx.tolist()
+        quantities = self.line_quantity.tolist()
+        prices = _kopecks_to_float(self.line_price_kopecks).tolist()
+        packaging = _kopecks_to_float(self.line_packaging_kopecks).tolist()
+        line_subtotals = _kopecks_to_float(self.line_subtotal_kopecks).tolist()
+        subtotals = _kopecks_to_float(self.subtotal_kopecks).tolist()
+        fees = _kopecks_to_float(self.delivery_fee_kopecks).tolist()
+        totals = _kopecks_to_float(self.total_kopecks).tolist()
+        tenants = [_json(t) for t in tenant_ids]
+        locations = [_json(loc) for loc in location_ids]
+        sources = [_json(s) for s in ORDER_SOURCES]
+        payments = [_json(p) for p in PAYMENT_STATUSES]
+        delivery_types = [_json(d) for d in DELIVERY_TYPES]
+        statuses = [_json(s) for s in UKRAINIAN_STATUSES]
+        tenant_idx = self.tenant_idx.tolist()
+        location_idx = self.location_idx.tolist()
+        source_idx = self.source_idx.tolist()
+        payment_idx = self.payment_idx.tolist()
+        status_idx = self.status_idx.tolist()
+        pickup = self.pickup.tolist()
+        first = self.customer_first.tolist()
+        last = self.customer_last.tolist()
+        operator = self.phone_operator.tolist()
+        number = self.phone_number.tolist()
+        street = self.street_idx.tolist()
+        house = self.house_number.tolist()
+
+        for i in range(len(self)):
+            lines = ",".join(
+                f'{{"item_id":"{item_ids[item_idx[j]]}","name":{item_names[item_idx[j]]},'
+                f'"price":{prices[j]},"packaging_price":{packaging[j]},'
+                f'"quantity":{quantities[j]},"subtotal":{line_subtotals[j]}}}'
+                for j in range(offsets[i], offsets[i + 1])
+            )
+            customer = (f'"name":"{FIRST_NAMES[first[i]]} {LAST_NAMES[last[i]]}",'
+                        f'"phone":"+380{operator[i]}{number[i]:07d}"')
+            if pickup[i]:
+                delivery = f'{{"type":"pickup","delivery_fee":{fees[i]}}}'
+            else:
+                address = _json(f"{STREETS[street[i]]}, {house[i]}, Київ")
+                customer += f',"address":{address}'
+                delivery = f'{{"type":"courier","address":{address},"delivery_fee":{fees[i]}}}'
+
+            document = (
+                f'{{"tenant_id":{tenants[tenant_idx[i]]},"source":{sources[source_idx[i]]},'
+                f'"payment_status":{payments[payment_idx[i]]},"delivery_type":{delivery_types[pickup[i]]},'
+                f'"order_time":"{order_times[i]}","customer":{{{customer}}},"items":[{lines}],'
+                f'"location_id":{locations[location_idx[i]]},"delivery":{delivery},'
+                f'"subtotal":{subtotals[i]},"delivery_fee":{fees[i]},"total":{totals[i]},'
+                f'"total_amount":{totals[i]}'
+            )
+            if not payload_only:
+                history = f'{{"status":{statuses[0]},"at":"{order_times[i]}"}}'
+                if accepted_times[i] is not None:
+                    history += f',{{"status":{statuses[1]},"at":"{accepted_times[i]}"}}'
+                if completed_times[i] is not None:
+                    history += f',{{"status":{statuses[2]},"at":"{completed_times[i]}"}}'
+                document += (f',"id":"{order_ids[i]}","status":{statuses[status_idx[i]]},'
+                             f'"status_history":[{history}]')
+            yield document + "}"
+
+
+def _json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class BusinessCalendar:
+    """Maps "open seconds" (time counted only while a location is open) to wall-clock time"""
+
+    def __init__(self, hours: Dict[str, Dict[str, Any]], start: datetime):
+        self.hours = hours
+        self.day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.starts = np.empty(0)
+        self.cumulative = np.zeros(1)   # open seconds elapsed before each interval
+        if not any(not spec.get("closed") for spec in hours.values()):
+            raise ValueError("Location hours have no open days")
+
+    def _extend(self, weeks: int = 4):
+        starts, lengths = [], []
+        for _ in range(weeks * 7):
+            spec = self.hours.get(WEEKDAYS[self.day.weekday()])
+            if spec and not spec.get("closed"):
+                open_s = _hhmm_to_seconds(spec["open"])
+                close_s = _hhmm_to_seconds(spec["close"])
+                if close_s <= open_s:  # closes after midnight
+                    close_s += 24 * 3600
+                starts.append(self.day.timestamp() + open_s)
+                lengths.append(close_s - open_s)
+            self.day += timedelta(days=1)
+        self.starts = np.concatenate([self.starts, starts])
+        self.cumulative = np.concatenate([self.cumulative, self.cumulative[-1] + np.cumsum(lengths)])
+
+    def to_wall_clock(self, open_seconds: np.ndarray) -> np.ndarray:
+        """Convert sorted open-time offsets to unix timestamps"""
+        while self.cumulative[-1] <= open_seconds[-1]:
+            self._extend()
+        interval = np.searchsorted(self.cumulative, open_seconds, side="right") - 1
+        return self.starts[interval] + (open_seconds - self.cumulative[interval])
+
+
+class SyntheticDataGenerator:
+    """Seeded generator for menus and orders"""
+
+    def __init__(self, seed: int = 42, tenants: int = 1, locations: Optional[List[str]] = None,
+                 hours: Optional[Dict[str, Dict[str, Any]]] = None, orders_per_hour: float = 40.0,
+                 start: Optional[datetime] = None):
+        self.rng = np.random.default_rng(seed)
+        self.tenant_ids = _uuid_strings(self._uuid_bytes(tenants))
+        self.location_ids = locations or ["loc_1"]
+        self.orders_per_hour = orders_per_hour
+        self.start = start or datetime(2024, 1, 15, tzinfo=timezone.utc)
+        self.calendar = BusinessCalendar(hours or DEFAULT_HOURS, self.start)
+        self.open_clock = 0.0  # open seconds consumed by previous batches
+        self.menu: Optional[ItemBatch] = None
+        self._popularity: Optional[np.ndarray] = None
+
+    def _uuid_bytes(self, n: int) -> np.ndarray:
+        return self.rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+
+    def generate_menu(self, n_items: int = 200, n_categories: int = 12) -> ItemBatch:
+        """Generate the menu that subsequent orders draw from"""
+        rng = self.rng
+        category_ids = self._uuid_bytes(n_categories)
+        dish_idx = rng.integers(0, len(DISHES), size=n_items)
+        variant_idx = rng.choice(len(VARIANTS), size=n_items, p=[0.5, 0.15, 0.15, 0.1, 0.1])
+        base = np.array([price for _, price in DISHES])[dish_idx]
+        factor = np.array([f for _, f in VARIANTS])[variant_idx]
+        # Lognormal spread around the dish price, rounded to 0.50 UAH
+        price = base * factor * rng.lognormal(mean=0.0, sigma=0.15, size=n_items)
+        price_kopecks = (np.round(price * 2) * 50).astype(np.int64)
+        self.menu = ItemBatch(
+            ids=self._uuid_bytes(n_items),
+            category_ids=category_ids[rng.integers(0, n_categories, size=n_items)],
+            dish_idx=dish_idx,
+            variant_idx=variant_idx,
+            price_kopecks=np.maximum(price_kopecks, 1000),
+            packaging_kopecks=rng.choice(PACKAGING_KOPECKS, size=n_items, p=PACKAGING_WEIGHTS),
+            available=rng.random(n_items) < 0.92
+        )
+        # Zipf-like popularity: a few dishes take most orders
+        ranks = rng.permutation(n_items) + 1
+        weights = 1.0 / ranks ** 1.1
+        self._popularity = weights / weights.sum()
+        return self.menu
+
+    def generate_orders(self, n: int) -> OrderBatch:
+        """Generate one batch of n orders following the previous batch in time"""
+        if self.menu is None:
+            self.generate_menu()
+        rng = self.rng
+
+        # Line items: 1 + Poisson lines per order, quantities from a fixed mix
+        lines_per_order = np.minimum(1 + rng.poisson(1.3, size=n), 12)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lines_per_order, out=offsets[1:])
+        n_lines = int(offsets[-1])
+        line_item_idx = rng.choice(len(self.menu), size=n_lines, p=self._popularity)
+        line_quantity = rng.choice(QUANTITIES, size=n_lines, p=QUANTITY_WEIGHTS)
+        line_price = self.menu.price_kopecks[line_item_idx]
+        line_packaging = self.menu.packaging_kopecks[line_item_idx]
+        line_subtotal = (line_price + line_packaging) * line_quantity
+        subtotal = np.add.reduceat(line_subtotal, offsets[:-1])
+
+        # Source mix; aggregators always deliver, others pick up ~35% of the time
+        source_idx = rng.choice(len(ORDER_SOURCES), size=n, p=SOURCE_WEIGHTS)
+        aggregator = np.isin(source_idx, [ORDER_SOURCES.index(s) for s in AGGREGATOR_SOURCES])
+        pickup = ~aggregator & (rng.random(n) < 0.35)
+        delivery_fee = np.where(pickup, 0, rng.choice(DELIVERY_FEE_KOPECKS, size=n, p=DELIVERY_FEE_WEIGHTS))
+        paid = rng.random(n) < np.where(aggregator, 0.97, 0.6)
+
+        # Poisson arrivals over business hours
+        rate_per_second = self.orders_per_hour / 3600.0
+        open_seconds = self.open_clock + np.cumsum(rng.exponential(1.0 / rate_per_second, size=n))
+        self.open_clock = float(open_seconds[-1])
+        order_time = self.calendar.to_wall_clock(open_seconds)
+
+        # Status transitions нове → у реалізації → виконано, observed at the batch horizon
+        horizon = order_time[-1]
+        accepted = order_time + rng.exponential(240.0, size=n)
+        completed = accepted + rng.gamma(shape=4.0, scale=360.0, size=n)
+        status_idx = (accepted <= horizon).astype(np.int8) + (completed <= horizon)
+        accepted = np.where(status_idx >= 1, accepted, np.nan)
+        completed = np.where(status_idx == 2, completed, np.nan)
+
+        return OrderBatch(
+            ids=self._uuid_bytes(n),
+            tenant_idx=rng.integers(0, len(self.tenant_ids), size=n),
+            location_idx=rng.integers(0, len(self.location_ids), size=n),
+            source_idx=source_idx,
+            status_idx=status_idx,
+            payment_idx=np.where(paid, 0, 1),
+            pickup=pickup,
+            order_time=order_time,
+            accepted_time=accepted,
+            completed_time=completed,
+            customer_first=rng.integers(0, len(FIRST_NAMES), size=n),
+            customer_last=rng.integers(0, len(LAST_NAMES), size=n),
+            phone_operator=rng.choice(PHONE_OPERATORS, size=n),
+            phone_number=rng.integers(0, 10_000_000, size=n),
+            street_idx=rng.integers(0, len(STREETS), size=n),
+            house_number=rng.integers(1, 120, size=n),
+            line_offsets=offsets,
+            line_item_idx=line_item_idx,
+            line_quantity=line_quantity,
+            line_price_kopecks=line_price,
+            line_packaging_kopecks=line_packaging,
+            line_subtotal_kopecks=line_subtotal,
+            subtotal_kopecks=subtotal,
+            delivery_fee_kopecks=delivery_fee,
+            total_kopecks=subtotal + delivery_fee
+        )
+
+    def iter_order_batches(self, total: int, batch_size: int = 50_000) -> Iterator[OrderBatch]:
+        """Yield batches until `total` orders have been generated"""
+        remaining = total
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            yield self.generate_orders(size)
+            remaining -= size
+
+    def iter_order_records(self, total: int, batch_size: int = 50_000,
+                           payload_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """Yield order dicts ready to be sent as POST /orders bodies"""
+        for batch in self.iter_order_batches(total, batch_size):
+            yield from batch.records(self.menu, self.tenant_ids, self.location_ids, payload_only)
+
+    def iter_order_lines(self, total: int, batch_size: int = 50_000,
+                         payload_only: bool = False) -> Iterator[str]:
+        """Yield orders as pre-encoded NDJSON lines"""
+        for batch in self.iter_order_batches(total, batch_size):
+            yield from batch.ndjson_lines(self.menu, self.tenant_ids, self.location_ids, payload_only)
+
+
+def write_ndjson(lines: Iterator[str], stream, chunk: int = 10_000) -> int:
+    """Write JSON lines to a stream in chunks, returning the line count"""
+    count = 0
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= chunk:
+            stream.write("\n".join(buffer) + "\n")
+            count += len(buffer)
+            buffer.clear()
+    if buffer:
+        stream.write("\n".join(buffer) + "\n")
+        count += len(buffer)
+    return count
+
+
+def main():
+    """Generate synthetic menus/orders from the command line"""
+    parser = argparse.ArgumentParser(description="Generate synthetic ROBOT menus and orders")
+    parser.add_argument("--orders", type=int, default=10_000, help="number of orders to generate")
+    parser.add_argument("--items", type=int, default=200, help="menu size")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tenants", type=int, default=1)
+    parser.add_argument("--orders-per-hour", type=float, default=40.0)
+    parser.add_argument("--format", choices=["ndjson", "npz"], default="ndjson")
+    parser.add_argument("--payload-only", action="store_true",
+                        help="omit server-assigned fields (id, status, history)")
+    parser.add_argument("--menu-out", help="write the menu items as NDJSON to this path")
+    parser.add_argument("--out", default="-", help="output file (ndjson) or prefix (npz); '-' for stdout")
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator(seed=args.seed, tenants=args.tenants,
+                                       orders_per_hour=args.orders_per_hour)
+    menu = generator.generate_menu(args.items)
+    start_time = time.time()
+
+    if args.menu_out:
+        with open(args.menu_out, "w", encoding="utf-8") as f:
+            write_ndjson((_json(item) for item in menu.records()), f)
+
+    if args.format == "npz":
+        prefix = "orders" if args.out == "-" else args.out
+        count = 0
+        for n, batch in enumerate(generator.iter_order_batches(args.orders, args.batch_size)):
+            np.savez(f"{prefix}-{n:05d}.npz", **batch.columns())
+            count += len(batch)
+    elif args.out == "-":
+        count = write_ndjson(generator.iter_order_lines(args.orders, args.batch_size, args.payload_only),
+                             sys.stdout)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            count = write_ndjson(generator.iter_order_lines(args.orders, args.batch_size, args.payload_only), f)
+
+    elapsed = time.time() - start_time
+    print(f"✅ Generated {count} orders in {elapsed:.2f}s ({count / max(elapsed, 1e-9):,.0f} orders/s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+ROBOT Telegram Login Helpers
+
+Builds Telegram Login Widget payloads for POST /auth/telegram/verify that
+pass the backend's signature check, and logs staff users in through the
+async load client:
+
+    data_check_string = "\\n".join(f"{key}={value}" for every field but hash, sorted by key)
+    hash = hex(HMAC-SHA256(key=SHA256(bot_token), msg=data_check_string))
+
+The bot token is --bot-token or ROBOT_TELEGRAM_BOT_TOKEN; it must be the
+token the target deployment verifies against (a local or staging bot,
+never production's).
+"""
+
+import hashlib
+import hmac
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+from synthetic_data import FIRST_NAMES, LAST_NAMES
+
+BOT_TOKEN_ENV = "ROBOT_TELEGRAM_BOT_TOKEN"
+LOCAL_BOT_TOKEN = "123456789:robot-local-test-bot-token"
+
+USER_ID_BASE = 7_000_000_000  # above the ids of real test accounts
+USERS_PER_TENANT = 1000       # staff ids are USER_ID_BASE + tenant * USERS_PER_TENANT + index
+
+
+def bot_token_from_env(default: Optional[str] = None) -> Optional[str]:
+    return os.environ.get(BOT_TOKEN_ENV, default)
+
+
+def data_check_string(fields: Dict[str, Any]) -> str:
+    return "\n".join(f"{key}={fields[key]}" for key in sorted(fields)
+                     if key != "hash" and fields[key] is not None)
+
+
+def sign(fields: Dict[str, Any], bot_token: str) -> Dict[str, Any]:
+    """Widget fields plus the hash the backend expects"""
+    secret = hashlib.sha256(bot_token.encode()).digest()
+    digest = hmac.new(secret, data_check_string(fields).encode(), hashlib.sha256).hexdigest()
+    return {**fields, "hash": digest}
+
+
+def verify(payload: Dict[str, Any], bot_token: str) -> bool:
+    expected = sign({k: v for k, v in payload.items() if k != "hash"}, bot_token)["hash"]
+    return hmac.compare_digest(expected, str(payload.get("hash", "")))
+
+
+def staff_user(tenant: int, index: int) -> Dict[str, Any]:
+    """Stable widget fields (without auth_date/hash) for staff member `index` of tenant `tenant`"""
+    if tenant < 0 or not 0 <= index < USERS_PER_TENANT:
+        raise ValueError(f"staff user {index} of tenant {tenant}: need tenant >= 0 and "
+                         f"0 <= index < {USERS_PER_TENANT}, or ids would collide")
+    n = tenant * USERS_PER_TENANT + index
+    return {
+        "id": USER_ID_BASE + n,
+        "first_name": FIRST_NAMES[n % len(FIRST_NAMES)],
+        "last_name": LAST_NAMES[(n // len(FIRST_NAMES)) % len(LAST_NAMES)],
+        "username": f"robot_t{tenant}_staff{index}",
+    }
+
+
+def login_payload(user: Dict[str, Any], bot_token: str, auth_date: Optional[int] = None) -> Dict[str, Any]:
+    """Freshly signed payload; Telegram payloads expire, so sign right before sending"""
+    return sign({**user, "auth_date": int(auth_date if auth_date is not None else time.time())}, bot_token)
+
+
+@dataclass
+class LoginResult:
+    telegram_id: int
+    success: bool
+    status_code: int
+    login_time: float
+    token: Optional[str] = None
+    tenant_id: Optional[str] = None
+    me_time: Optional[float] = None
+    me_matches: Optional[bool] = None  # /me returned the user that just logged in
+    error: Optional[str] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+
+async def login(client, user: Dict[str, Any], bot_token: str, check_me: bool = True) -> LoginResult:
+    """POST /auth/telegram/verify, then GET /me with the issued token"""
+    result = await client.request("POST", "/auth/telegram/verify", login_payload(user, bot_token))
+    data = result.response_data if isinstance(result.response_data, dict) else {}
+    token = data.get("token")
+    if not result.success or not token:
+        return LoginResult(user["id"], False, result.status_code, result.execution_time,
+                           error=result.error_message or "no token in response")
+    tenant = data.get("tenant") or {}
+    tenant_id = tenant.get("id") if isinstance(tenant, dict) else None
+    login_result = LoginResult(user["id"], True, result.status_code, result.execution_time, token,
+                               tenant_id or (data.get("user") or {}).get("tenant_id"))
+    if check_me:
+        me = await client.request("GET", "/me", headers=login_result.headers)
+        login_result.me_time = me.execution_time
+        if me.success and isinstance(me.response_data, dict):
+            login_result.me_matches = str(me.response_data.get("telegram_id")) == str(user["id"])
+            login_result.tenant_id = login_result.tenant_id or me.response_data.get("tenant_id")
+        else:
+            login_result.me_matches = False
+            login_result.error = me.error_message
+    return login_result
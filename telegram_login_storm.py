@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+ROBOT Telegram Login Storm
+
+At shift change, staff across many tenants log in through the Telegram
+widget at the same moment: POST /auth/telegram/verify, then GET /me with
+the new token. This benchmark signs widget payloads for --users distinct
+staff members spread over --tenants restaurants and fires --bursts login
+bursts at them:
+
+    ROBOT_TELEGRAM_BOT_TOKEN=<bot token> python3 telegram_login_storm.py --target http://localhost:8000
+    python3 telegram_login_storm.py --users 300 --tenants 30 --bursts 5 --concurrency 64 --bot-token <token>
+
+Reported per burst and overall: token issuance throughput, login
+latency percentiles, /me latency right after login, failures by status,
+and any /me that answered with a different user than the one who just
+logged in. Each burst also sends one payload with a tampered hash, which
+must be rejected.
+
+Payloads are only accepted if the target verifies against the same bot
+token (see telegram_login.py).
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+from async_client import AsyncLoadClient
+from harness import HarnessRun
+from latency_histogram import LatencyHistogram
+from telegram_login import (LoginResult, LOCAL_BOT_TOKEN, BOT_TOKEN_ENV, bot_token_from_env, login,
+                            login_payload, staff_user, USERS_PER_TENANT)
+
+BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
+
+
+class BurstStats:
+    def __init__(self, index: int):
+        self.index = index
+        self.results: List[LoginResult] = []
+        self.elapsed = 0.0
+        self.tampered_accepted = False
+
+    @property
+    def issued(self) -> int:
+        return sum(r.success for r in self.results)
+
+    @property
+    def throughput(self) -> float:
+        return self.issued / self.elapsed if self.elapsed else 0.0
+
+
+async def run_burst(client: AsyncLoadClient, users: List[Dict], bot_token: str, index: int) -> BurstStats:
+    stats = BurstStats(index)
+    tampered = login_payload(users[0], bot_token)
+    tampered["hash"] = ("0" if tampered["hash"][0] != "0" else "1") + tampered["hash"][1:]
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(login(client, user, bot_token) for user in users),
+        client.request("POST", "/auth/telegram/verify", tampered, expect_success=False))
+    stats.elapsed = time.perf_counter() - start
+    stats.results = list(results[:-1])
+    stats.tampered_accepted = 0 < results[-1].status_code < 400
+    return stats
+
+
+def print_report(bursts: List[BurstStats], tenants: int):
+    results = [r for b in bursts for r in b.results]
+    login_latency, me_latency = LatencyHistogram(), LatencyHistogram()
+    failures: Dict[int, int] = {}
+    for r in results:
+        if r.success:
+            login_latency.record(r.login_time)
+            if r.me_time is not None:
+                me_latency.record(r.me_time)
+        else:
+            failures[r.status_code] = failures.get(r.status_code, 0) + 1
+
+    print(f"\n🔐 Telegram login storm: {len(bursts)} bursts of {len(bursts[0].results) if bursts else 0} logins")
+    print(f"   {'burst':>5}{'issued':>8}{'time':>8}{'tokens/s':>10}{'login p99':>11}")
+    for b in bursts:
+        h = LatencyHistogram()
+        for r in b.results:
+            if r.success:
+                h.record(r.login_time)
+        p99 = f"{h.percentile(99) * 1000:>9.0f}ms" if h.count else f"{'-':>11}"
+        print(f"   {b.index:>5}{b.issued:>8,}{b.elapsed:>7.2f}s{b.throughput:>10.1f}{p99}")
+    if login_latency.count:
+        print(f"   Login: p50 {login_latency.percentile(50) * 1000:.0f}ms, p95 {login_latency.percentile(95) * 1000:.0f}ms, "
+              f"p99 {login_latency.percentile(99) * 1000:.0f}ms")
+    if me_latency.count:
+        print(f"   /me after login: p50 {me_latency.percentile(50) * 1000:.0f}ms, "
+              f"p99 {me_latency.percentile(99) * 1000:.0f}ms")
+    seen_tenants = {r.tenant_id for r in results if r.tenant_id}
+    if seen_tenants:
+        print(f"   Logins landed in {len(seen_tenants)} tenants ({tenants} simulated restaurants)")
+    if failures:
+        print("   ❌ Failed logins: " + ", ".join(f"{count:,} x {'no response' if status == 0 else status}"
+                                              for status, count in sorted(failures.items())))
+        if 401 in failures or 403 in failures:
+            print(f"      401/403 usually means the target verifies against a different bot token ({BOT_TOKEN_ENV})")
+    mismatched = sum(r.me_matches is False for r in results)
+    if mismatched:
+        print(f"   ❌ {mismatched:,} /me calls failed or answered with a different user than the one who logged in")
+    if any(b.tampered_accepted for b in bursts):
+        print("   ❌ A payload with a tampered hash was accepted")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Telegram login bursts against the ROBOT API")
+    parser.add_argument("--users", type=int, default=60, help="distinct staff users per burst")
+    parser.add_argument("--tenants", type=int, default=6, help="restaurants the users are spread over")
+    parser.add_argument("--bursts", type=int, default=3)
+    parser.add_argument("--burst-interval", type=float, default=5.0, help="seconds between bursts")
+    parser.add_argument("--bot-token", default=bot_token_from_env(), help=f"default: ${BOT_TOKEN_ENV}")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--transport", default="requests", choices=["requests", "http.client"])
+    parser.add_argument("--target", default=BASE_URL)
+    args = parser.parse_args()
+
+    if args.tenants < 1:
+        parser.error("--tenants must be at least 1")
+    if -(-args.users // args.tenants) > USERS_PER_TENANT:
+        parser.error(f"at most {USERS_PER_TENANT} users per tenant; raise --tenants")
+    bot_token = args.bot_token
+    if not bot_token:
+        print(f"⚠️ No bot token given (--bot-token or {BOT_TOKEN_ENV}); signing with a local test token")
+        bot_token = LOCAL_BOT_TOKEN
+    users = [staff_user(i % args.tenants, i // args.tenants) for i in range(args.users)]
+
+    harness = HarnessRun.from_env("telegram_login_storm", target_url=args.target)
+    client = AsyncLoadClient.create(args.target, args.concurrency, args.transport, harness=harness)
+    bursts: List[BurstStats] = []
+
+    async def run():
+        for index in range(1, args.bursts + 1):
+            if index > 1:
+                await asyncio.sleep(args.burst_interval)
+            bursts.append(await run_burst(client, users, bot_token, index))
+
+    try:
+        asyncio.run(run())
+    finally:
+        client.close()
+    harness.close()
+    print_report(bursts, args.tenants)
+    failed = any(r.success is False or r.me_matches is False for b in bursts for r in b.results)
+    tampered = any(b.tampered_accepted for b in bursts)
+    exit(0 if harness.passed_slos and not failed and not tampered else 1)
+
+
+if __name__ == "__main__":
+    main()
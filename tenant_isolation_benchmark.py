@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+ROBOT Multi-Tenant Noisy-Neighbour Benchmark
+
+Runs many tenants against one deployment at once to see whether a single
+big restaurant degrades everyone else. Each tenant is provisioned through
+the normal login flow (a signed Telegram login per tenant owner, see
+telegram_login.py) and every request carries that tenant's token.
+
+    quiet tenants   normal admin work at --quiet-rate requests/s each:
+                    order lists, menu reads, /me, the odd new order
+    noisy tenant    the same work at --quiet-rate during the baseline
+                    phase, then a heavy order and menu mix at --noisy-rate
+                    during the noisy phase
+
+    python3 tenant_isolation_benchmark.py --tenants 8 --noisy-rate 40 --target http://localhost:8000
+    python3 tenant_isolation_benchmark.py --tenants 20 --quiet-rate 0.5 --baseline 60 --noisy 120
+
+Reported per tenant and phase: requests, errors and latency
+percentiles, plus how much the quiet tenants' p99 grew while the noisy
+tenant was loud. Order lists that return another tenant's orders are
+counted as isolation leaks.
+
+Arrivals are open-loop Poisson. The client's --concurrency slots are
+split between tenants: half are reserved for the quiet tenants (at least
+one each) and the noisy tenant gets the rest, so its backlog cannot delay
+quiet requests inside this client. Latency is measured from each
+request's scheduled time, including any wait for a slot. Arrivals beyond
+4 x a tenant's slots pending are shed and counted as errors in its row.
+New orders are real writes; point --target at a disposable deployment.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, Any, Optional, List, Tuple
+
+from async_client import AsyncLoadClient
+from harness import HarnessRun
+from latency_histogram import LatencyHistogram
+from load_profiles import RequestMix
+from synthetic_data import SyntheticDataGenerator, UKRAINIAN_STATUSES
+from telegram_login import LOCAL_BOT_TOKEN, BOT_TOKEN_ENV, bot_token_from_env, login, staff_user
+
+BASE_URL = "https://robot-api-app-cc4d4f828ab6.herokuapp.com"
+
+BASELINE = "baseline"
+NOISY = "noisy"
+PHASES = [BASELINE, NOISY]
+
+
+class Tenant:
+    """One provisioned tenant and its measurements"""
+
+    def __init__(self, index: int, token: str, tenant_id: Optional[str], noisy: bool = False):
+        self.index = index
+        self.token = token
+        self.tenant_id = tenant_id
+        self.noisy = noisy
+        self.latency: Dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in PHASES}
+        self.requests: Dict[str, int] = {phase: 0 for phase in PHASES}
+        self.errors: Dict[str, int] = {phase: 0 for phase in PHASES}
+        self.shed: Dict[str, int] = {phase: 0 for phase in PHASES}
+        self.leaks = 0
+        self.pending: set = set()
+        self.slots = 1
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def name(self) -> str:
+        return f"tenant {self.index}" + (" (noisy)" if self.noisy else "")
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+def build_tenant_mix(tenant: Tenant, heavy: bool, seed: int = 0) -> RequestMix:
+    rng = random.Random(seed)
+    generator = SyntheticDataGenerator(seed=seed)
+    generator.generate_menu()
+    payloads = generator.iter_order_records(10 ** 9, batch_size=500, payload_only=True)
+
+    def create_order():
+        payload = next(payloads)
+        if tenant.tenant_id:
+            payload["tenant_id"] = tenant.tenant_id
+        return "POST", "/orders", payload
+
+    def new_orders():
+        return "GET", f"/orders?status={UKRAINIAN_STATUSES[0]}", None
+
+    def filtered_orders():
+        return "GET", f"/orders?status={rng.choice(UKRAINIAN_STATUSES)}", None
+
+    def order_page():
+        return "GET", "/orders?limit=50", None
+
+    def categories():
+        return "GET", "/categories", None
+
+    def items():
+        return "GET", "/items", None
+
+    def me():
+        return "GET", "/me", None
+
+    if heavy:
+        # A big restaurant at lunch: lots of new orders and full-list reads
+        return RequestMix([(0.35, create_order), (0.25, order_page), (0.15, filtered_orders),
+                           (0.15, items), (0.1, categories)], seed)
+    return RequestMix([(0.3, new_orders), (0.15, filtered_orders), (0.15, categories), (0.2, items),
+                       (0.1, me), (0.1, create_order)], seed)
+
+
+class NoisyNeighbourRun:
+    def __init__(self, client: AsyncLoadClient, seed: int = 0):
+        self.client = client
+        self.seed = seed
+        self.tenants: List[Tenant] = []
+
+    async def provision(self, count: int, bot_token: str) -> List[str]:
+        """Log each tenant's owner in; returns error descriptions"""
+        results = await asyncio.gather(*(login(self.client, staff_user(t, 0), bot_token, check_me=False)
+                                         for t in range(count)))
+        errors = []
+        for index, result in enumerate(results):
+            if result.success:
+                self.tenants.append(Tenant(index, result.token, result.tenant_id, noisy=not self.tenants))
+            else:
+                errors.append(f"tenant {index}: HTTP {result.status_code} {result.error or ''}".strip())
+        return errors
+
+    def reserve_slots(self):
+        """Split the client's concurrency: half for the quiet tenants, the rest for the noisy one"""
+        quiet = [t for t in self.tenants if not t.noisy]
+        share = max(1, self.client.concurrency // 2 // max(len(quiet), 1))
+        for t in self.tenants:
+            t.slots = max(1, self.client.concurrency - share * len(quiet)) if t.noisy else share
+            t.semaphore = asyncio.Semaphore(t.slots)
+
+    async def request(self, tenant: Tenant, phase: str, scheduled: float, method: str, endpoint: str, data: Any):
+        async with tenant.semaphore:
+            result = await self.client.request(method, endpoint, data, headers=tenant.headers)
+        tenant.requests[phase] += 1
+        if not result.success:
+            tenant.errors[phase] += 1
+            return
+        tenant.latency[phase].record(time.perf_counter() - scheduled)
+        if tenant.tenant_id and method == "GET" and endpoint.startswith("/orders") \
+                and isinstance(result.response_data, list):
+            tenant.leaks += sum(1 for order in result.response_data if isinstance(order, dict)
+                                and order.get("tenant_id") not in (None, tenant.tenant_id))
+
+    async def drive(self, tenant: Tenant, phase: str, rate: float, duration: float, mix: RequestMix, seed: int):
+        rng = random.Random(seed)
+        start = time.perf_counter()
+        offset = rng.expovariate(rate)
+        while offset < duration:
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(tenant.pending) >= tenant.slots * 4:
+                # Never sent, so it counts against this tenant as a failed request
+                tenant.requests[phase] += 1
+                tenant.errors[phase] += 1
+                tenant.shed[phase] += 1
+            else:
+                task = asyncio.ensure_future(self.request(tenant, phase, start + offset, *mix.next()))
+                tenant.pending.add(task)
+                task.add_done_callback(tenant.pending.discard)
+            offset += rng.expovariate(rate)
+
+    async def run(self, quiet_rate: float, noisy_rate: float, baseline: float, noisy: float):
+        self.reserve_slots()
+        quiet_mixes = {t.index: build_tenant_mix(t, False, self.seed + t.index) for t in self.tenants}
+        noisy_tenant = self.tenants[0]
+        heavy_mix = build_tenant_mix(noisy_tenant, True, self.seed)
+        for phase, duration in ((BASELINE, baseline), (NOISY, noisy)):
+            if duration <= 0:
+                continue
+            loops = []
+            for t in self.tenants:
+                if t.noisy and phase == NOISY:
+                    loops.append(self.drive(t, phase, noisy_rate, duration, heavy_mix, self.seed))
+                else:
+                    loops.append(self.drive(t, phase, quiet_rate, duration, quiet_mixes[t.index],
+                                            self.seed + 1000 * (phase == NOISY) + t.index))
+            await asyncio.gather(*loops)
+            # Let the phase's requests finish so they are not measured in the next one
+            pending = set().union(*(t.pending for t in self.tenants))
+            if pending:
+                await asyncio.wait(pending)
+
+
+def _row(name: str, requests: int, errors: int, h: LatencyHistogram) -> str:
+    latencies = ("".join(f"{h.percentile(p) * 1000:>7.0f}ms" for p in (50, 95, 99)) if h.count
+                 else f"{'-':>9}{'-':>9}{'-':>9}")
+    return f"   {name:<20}{requests:>9,}{errors / max(requests, 1):>8.1%}{latencies}"
+
+
+def quiet_p99(tenants: List[Tenant], phase: str) -> Tuple[Optional[float], LatencyHistogram]:
+    merged = LatencyHistogram()
+    for t in tenants:
+        if not t.noisy:
+            merged.merge(t.latency[phase])
+    return (merged.percentile(99) if merged.count else None), merged
+
+
+def print_report(run: NoisyNeighbourRun):
+    for phase in PHASES:
+        if not any(t.requests[phase] for t in run.tenants):
+            continue
+        print(f"\n🏢 {phase} phase:")
+        print(f"   {'':<20}{'requests':>9}{'errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+        for t in run.tenants:
+            print(_row(t.name, t.requests[phase], t.errors[phase], t.latency[phase]))
+        _, merged = quiet_p99(run.tenants, phase)
+        requests = sum(t.requests[phase] for t in run.tenants if not t.noisy)
+        errors = sum(t.errors[phase] for t in run.tenants if not t.noisy)
+        print(_row("all quiet tenants", requests, errors, merged))
+
+    before, _ = quiet_p99(run.tenants, BASELINE)
+    during, _ = quiet_p99(run.tenants, NOISY)
+    if before and during:
+        ratio = during / before
+        verdict = "✅" if ratio < 1.5 else "⚠️"
+        print(f"\n   {verdict} Quiet tenants' p99 went from {before * 1000:.0f}ms to {during * 1000:.0f}ms "
+              f"({ratio:.1f}x) while the noisy tenant was loud")
+        worst = max((t for t in run.tenants if not t.noisy and t.latency[BASELINE].count and t.latency[NOISY].count),
+                    key=lambda t: t.latency[NOISY].percentile(99) / max(t.latency[BASELINE].percentile(99), 1e-9),
+                    default=None)
+        if worst:
+            print(f"   Most affected: {worst.name}, p99 {worst.latency[BASELINE].percentile(99) * 1000:.0f}ms -> "
+                  f"{worst.latency[NOISY].percentile(99) * 1000:.0f}ms")
+    leaks = sum(t.leaks for t in run.tenants)
+    if leaks:
+        print(f"   ❌ {leaks:,} orders of another tenant appeared in order lists")
+    for t in run.tenants:
+        shed = sum(t.shed.values())
+        if shed:
+            print(f"   ⚠️ {t.name}: {shed:,} requests shed (more than {t.slots * 4} pending), "
+                  f"counted as errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure noisy-neighbour effects between ROBOT tenants")
+    parser.add_argument("--tenants", type=int, default=8, help="tenants, the first of which is noisy")
+    parser.add_argument("--quiet-rate", type=float, default=1.0, help="requests/s per quiet tenant")
+    parser.add_argument("--noisy-rate", type=float, default=30.0, help="requests/s of the noisy tenant when loud")
+    parser.add_argument("--baseline", type=float, default=60.0, help="seconds with every tenant quiet")
+    parser.add_argument("--noisy", type=float, default=60.0, help="seconds with the noisy tenant loud")
+    parser.add_argument("--bot-token", default=bot_token_from_env(), help=f"default: ${BOT_TOKEN_ENV}")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--transport", default="requests", choices=["requests", "http.client"])
+    parser.add_argument("--target", default=BASE_URL)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.tenants < 2:
+        parser.error("--tenants must be at least 2 (one noisy, one quiet)")
+    if args.concurrency < args.tenants:
+        parser.error("--concurrency must be at least --tenants (one slot per tenant)")
+    bot_token = args.bot_token
+    if not bot_token:
+        print(f"⚠️ No bot token given (--bot-token or {BOT_TOKEN_ENV}); signing with a local test token")
+        bot_token = LOCAL_BOT_TOKEN
+
+    harness = HarnessRun.from_env("tenant_isolation", target_url=args.target)
+    client = AsyncLoadClient.create(args.target, args.concurrency, args.transport, harness=harness)
+    run = NoisyNeighbourRun(client, args.seed)
+    ready = False
+
+    async def main_async():
+        nonlocal ready
+        errors = await run.provision(args.tenants, bot_token)
+        for error in errors:
+            print(f"❌ Login failed for {error}")
+        if len(run.tenants) < 2:
+            print("❌ Fewer than two tenants could log in; nothing to compare")
+            return
+        distinct = {t.tenant_id for t in run.tenants if t.tenant_id}
+        if len(distinct) < len(run.tenants):
+            print(f"⚠️ {len(run.tenants)} logins map to {len(distinct)} distinct tenant ids; "
+                  f"latencies are still reported per login")
+        print(f"🚀 {len(run.tenants)} tenants: noisy at {args.noisy_rate:g} req/s, "
+              f"quiet at {args.quiet_rate:g} req/s each")
+        ready = True
+        await run.run(args.quiet_rate, args.noisy_rate, args.baseline, args.noisy)
+
+    try:
+        asyncio.run(main_async())
+    finally:
+        client.close()
+    harness.close()
+    if ready:
+        print_report(run)
+    leaks = sum(t.leaks for t in run.tenants)
+    exit(0 if harness.passed_slos and ready and not leaks else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+ROBOT Benchmark Analysis Tests
+
+Known-value checks for the pieces the performance gates rely on: the
+Mann-Whitney U test, Cliff's delta and Holm correction of the regression
+gate, LatencyHistogram percentile error and merging, and route template
+normalisation. Run with `python -m pytest -q`.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from latency_histogram import GROWTH, LatencyHistogram
+from regression_detection import (REGRESSED, UNCHANGED, ComparisonConfig, EndpointComparison, _distribution,
+                                  compare_runs, holm_adjust, mann_whitney)
+from route_templates import RouteTrie, endpoint_template, normalize_endpoint, split_template
+
+UUID = "123e4567-e89b-12d3-a456-426614174000"
+
+# Worst-case relative error of a bucket midpoint: half a bucket on a log scale
+BUCKET_ERROR = math.sqrt(GROWTH) - 1
+
+
+def _mann_whitney(a, b):
+    return mann_whitney(_distribution(a), _distribution(b))
+
+
+# Regression gate -----------------------------------------------------------
+
+def test_mann_whitney_separated_samples():
+    # U = 0; normal approximation with continuity correction (as scipy's asymptotic method)
+    p_value, delta = _mann_whitney([1, 2, 3, 4, 5], [6, 7, 8, 9, 10])
+    assert p_value == pytest.approx(0.0121858, abs=1e-6)
+    assert delta == 1.0
+
+
+def test_mann_whitney_is_symmetric():
+    p_ab, delta_ab = _mann_whitney([1, 2, 3, 4, 5], [6, 7, 8, 9, 10])
+    p_ba, delta_ba = _mann_whitney([6, 7, 8, 9, 10], [1, 2, 3, 4, 5])
+    assert p_ab == pytest.approx(p_ba)
+    assert delta_ba == -delta_ab
+
+
+def test_mann_whitney_interleaved_samples():
+    # a > b in 3 of 9 pairs, b > a in 6: delta = 6/9 - 3/9
+    _, delta = _mann_whitney([1, 3, 5], [2, 4, 6])
+    assert delta == pytest.approx(1 / 3)
+
+
+def test_mann_whitney_ties():
+    # U_a = 3 (ties count half); tie-corrected variance 16/12 * (9 - 48/56)
+    p_value, delta = _mann_whitney([1, 2, 2, 3], [2, 3, 3, 4])
+    z = (abs(3 - 8) - 0.5) / math.sqrt(16 / 12 * (9 - 48 / 56))
+    assert p_value == pytest.approx(math.erfc(z / math.sqrt(2)))
+    assert p_value == pytest.approx(0.172034, abs=1e-6)
+    assert delta == pytest.approx(1 - 2 * 3 / 16)
+
+
+def test_mann_whitney_all_tied():
+    assert _mann_whitney([0.1] * 5, [0.1] * 5) == (1.0, 0.0)
+
+
+def test_holm_adjust_known_values():
+    # Sorted: 0.005 x 4, 0.01 x 3, 0.03 x 2, 0.04 x 1 -> step-down keeps it monotone
+    adjusted = holm_adjust([0.01, 0.04, 0.03, 0.005])
+    assert adjusted == pytest.approx([0.03, 0.06, 0.06, 0.02])
+
+
+def test_holm_adjust_caps_at_one():
+    assert holm_adjust([0.5, 0.9]) == [1.0, 1.0]
+    assert holm_adjust([]) == []
+
+
+@pytest.mark.parametrize("delta, label", [(0.1, "negligible"), (-0.2, "small"), (0.4, "medium"),
+                                          (-0.5, "large"), (1.0, "large")])
+def test_cliffs_delta_labels(delta, label):
+    comparison = EndpointComparison("GET /orders", 10, 10, effect=delta)
+    assert comparison.effect_label == label
+
+
+def test_compare_runs_flags_a_slower_endpoint():
+    rng = np.random.default_rng(1)
+    baseline = {"GET /orders": rng.normal(0.100, 0.005, 200), "GET /items": rng.normal(0.050, 0.005, 200)}
+    candidate = {"GET /orders": rng.normal(0.130, 0.005, 200), "GET /items": rng.normal(0.050, 0.005, 200)}
+    report = compare_runs(baseline, candidate, ComparisonConfig(bootstrap=200))
+    verdicts = {c.endpoint: c.verdict for c in report.endpoints}
+    assert verdicts == {"GET /orders": REGRESSED, "GET /items": UNCHANGED}
+    assert not report.passed
+
+
+# Latency histogram ---------------------------------------------------------
+
+def test_histogram_percentiles_within_bucket_error():
+    h = LatencyHistogram()
+    for ms in range(1, 1001):
+        h.record(ms / 1000)
+    for p in (50, 90, 95, 99):
+        # Nearest rank of 1..1000ms is exactly p * 10ms
+        assert h.percentile(p) == pytest.approx(p / 100, rel=BUCKET_ERROR)
+    assert h.percentile(100) == 1.0
+    assert h.percentile(0) == pytest.approx(0.001, rel=BUCKET_ERROR)
+
+
+def test_histogram_percentiles_clamped_to_observed_range():
+    h = LatencyHistogram()
+    h.record(0.2)
+    assert h.percentile(1) == h.percentile(99) == 0.2
+    assert LatencyHistogram().percentile(99) == 0.0
+
+
+def test_histogram_merge_matches_recording_everything():
+    values = [i / 997 for i in range(1, 500)]
+    merged, left, right = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i, value in enumerate(values):
+        merged.record(value)
+        (left if i % 2 else right).record(value)
+    left.merge(right)
+    assert left.counts == merged.counts
+    assert left.count == merged.count
+    assert left.total == pytest.approx(merged.total)
+    assert (left.min, left.max) == (merged.min, merged.max)
+    assert left.percentile(99) == merged.percentile(99)
+
+
+def test_histogram_merge_empty():
+    h = LatencyHistogram()
+    h.record(0.05)
+    h.merge(LatencyHistogram())
+    assert (h.count, h.min, h.max) == (1, 0.05, 0.05)
+    empty = LatencyHistogram()
+    empty.merge(h)
+    assert (empty.count, empty.min, empty.max) == (1, 0.05, 0.05)
+
+
+# Route templates -----------------------------------------------------------
+
+@pytest.mark.parametrize("endpoint, template", [
+    (f"/orders/{UUID}/status", "/orders/{id}/status"),
+    (f"/api/orders/{UUID}/status", "/api/orders/{id}/status"),
+    ("/orders/stats/summary", "/orders/stats/summary"),
+    ("/api/orders/stats/summary", "/api/orders/stats/summary"),
+    ("/categories/reorder", "/categories/reorder"),
+    ("/items/42/availability/", "/items/{id}/availability"),
+    ("/widgets/507f1f77bcf86cd799439011", "/widgets/{id}"),
+])
+def test_normalize_paths(endpoint, template):
+    assert normalize_endpoint(endpoint) == template
+
+
+@pytest.mark.parametrize("endpoint, template", [
+    ("/orders?limit=50&status=new", "/orders?status&limit"),
+    ("/api/orders?offset=0&source=web&status=a&status=b", "/api/orders?status&source&offset"),
+    ("/orders?zeta=1&status=new&alpha=2", "/orders?status&alpha&zeta"),
+    ("/items?categoryId=7", "/items?categoryId"),
+    ("/orders?", "/orders"),
+])
+def test_normalize_queries(endpoint, template):
+    assert normalize_endpoint(endpoint) == template
+
+
+def test_endpoint_template_and_api_prefix_split():
+    template = endpoint_template("PATCH", f"/api/orders/{UUID}/status")
+    assert template == "PATCH /api/orders/{id}/status"
+    assert split_template("/api/orders?status&limit") == ("/orders", ["status", "limit"])
+    assert split_template("/orders/{id}") == ("/orders/{id}", [])
+
+
+def test_route_trie_prefers_literal_segments():
+    trie = RouteTrie(["/things/{id}", "/things/special", "/things/{id}/parts"], {"/things/{id}": ["b", "a"]})
+    assert trie.match("/things/special") == "/things/special"
+    assert trie.match("/things/7") == "/things/{id}"
+    assert trie.match("/things/special/parts") == "/things/{id}/parts"
+    assert trie.match("/other") is None
+    assert trie.normalize("/things/7?a=1&b=2") == "/things/{id}?b&a"
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+ROBOT Request Tracing
+
+Stamps every request sent through an instrumented requests.Session with
+a unique X-Request-ID and a W3C `traceparent` header, and records spans:
+one root span per suite run, one per test step and one client span per
+request carrying the phase timings (time to response headers, body
+download, whether a pooled connection was reused; DNS/connect/TLS time
+is included in the time to headers of requests that opened a new
+connection).
+
+Enabled with ROBOT_TRACE_FILE=<path>. Spans are written in batches as
+OTLP-JSON (one ExportTraceServiceRequest per line, the OpenTelemetry
+collector file exporter format), so memory stays flat on long runs and
+the file loads in trace viewers that accept OTLP-JSON.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+from route_templates import endpoint_template
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    """One timed operation"""
+
+    __slots__ = ("tracer", "name", "span_id", "parent_id", "kind", "start_ns", "end_ns",
+                 "attributes", "events", "status", "status_message", "_start_perf")
+
+    def __init__(self, tracer: "Tracer", name: str, parent_id: Optional[str], kind: int):
+        self.tracer = tracer
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self._start_perf = time.perf_counter()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = {}
+        self.events: List[Dict[str, Any]] = []
+        self.status = STATUS_OK
+        self.status_message = ""
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.tracer.trace_id}-{self.span_id}-01"
+
+    def offset_ns(self, perf_time: float) -> int:
+        """Wall-clock nanoseconds for a perf_counter() reading taken during the span"""
+        return self.start_ns + int((perf_time - self._start_perf) * 1e9)
+
+    def add_event(self, name: str, perf_time: float):
+        self.events.append({"timeUnixNano": str(self.offset_ns(perf_time)), "name": name})
+
+    def fail(self, message: str):
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    def end(self, perf_time: Optional[float] = None):
+        if self.end_ns is None:
+            self.end_ns = self.offset_ns(perf_time if perf_time is not None else time.perf_counter())
+            self.tracer._finished(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.tracer.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": self.status}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.events:
+            span["events"] = self.events
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class Tracer:
+    """Creates spans for one suite run and writes them to an OTLP-JSON file"""
+
+    def __init__(self, path: str, suite: str, service: str = "robot-api-tests", batch_size: int = 256):
+        self.path = path
+        self.suite = suite
+        self.service = service
+        self.batch_size = batch_size
+        self.trace_id = os.urandom(16).hex()
+        self.spans_written = 0
+        self._file = open(path, "w", encoding="utf-8")
+        self._batch: List[Span] = []
+        self._lock = threading.Lock()
+        self.root = Span(self, suite, None, SPAN_KIND_INTERNAL)
+        self.root.attributes["robot.suite"] = suite
+        self.current: Span = self.root
+
+    @classmethod
+    def from_env(cls, suite: str) -> Optional["Tracer"]:
+        path = os.environ.get("ROBOT_TRACE_FILE")
+        return cls(path, suite) if path else None
+
+    def start_span(self, name: str, kind: int = SPAN_KIND_INTERNAL, parent: Optional[Span] = None) -> Span:
+        return Span(self, name, (parent or self.current).span_id, kind)
+
+    @contextmanager
+    def step(self, name: str):
+        """Make the block's requests children of a step span"""
+        span = self.start_span(name)
+        span.attributes["robot.step"] = name
+        previous, self.current = self.current, span
+        try:
+            yield span
+        except Exception as e:
+            span.fail(str(e))
+            raise
+        finally:
+            self.current = previous
+            span.end()
+
+    def _finished(self, span: Span):
+        with self._lock:
+            self._batch.append(span)
+            if len(self._batch) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._batch or self._file.closed:
+            return
+        document = {"resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", self.service),
+                                        _attribute("robot.suite", self.suite)]},
+            "scopeSpans": [{"scope": {"name": "robot.harness"},
+                            "spans": [span.to_otlp() for span in self._batch]}]
+        }]}
+        self._file.write(json.dumps(document, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.spans_written += len(self._batch)
+        self._batch = []
+
+    def close(self):
+        self.root.end()
+        with self._lock:
+            self._flush_locked()
+            self._file.close()
+
+
+class TracingAdapter(HTTPAdapter):
+    """Transport adapter that stamps trace headers and records a span per request
+
+    With `inner`, requests are sent through that adapter (keeping its pool
+    settings or cassette behaviour) instead of this one's own pool.
+    """
+
+    def __init__(self, tracer: Tracer, inner: Optional[HTTPAdapter] = None, **kwargs):
+        self.tracer = tracer
+        self.inner = inner
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        parts = urlsplit(request.url)
+        endpoint = parts.path + (f"?{parts.query}" if parts.query else "")
+        span = self.tracer.start_span(endpoint_template(request.method, endpoint), SPAN_KIND_CLIENT)
+        request_id = str(uuid.uuid4())
+        request.headers["X-Request-ID"] = request_id
+        request.headers["traceparent"] = span.traceparent
+        span.attributes.update({
+            "http.request.method": request.method,
+            "url.full": request.url,
+            "server.address": parts.hostname or "",
+            "http.request.header.x-request-id": request_id,
+        })
+        if self.tracer.current is not self.tracer.root:
+            span.attributes["robot.step"] = self.tracer.current.name
+
+        pool = self._pool(request, verify, cert, proxies)
+        connections_before = pool.num_connections if pool is not None else None
+
+        try:
+            sender = self.inner.send if self.inner is not None else super().send
+            response = sender(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        except Exception as e:
+            span.fail(f"{type(e).__name__}: {e}")
+            span.attributes["error.type"] = type(e).__name__
+            span.end()
+            raise
+        headers_at = time.perf_counter()
+        span.add_event("response.headers", headers_at)
+        body = None if stream else response.content  # read the body inside the span
+        end = time.perf_counter()
+
+        span.attributes["http.response.status_code"] = response.status_code
+        server_timing = response.headers.get("Server-Timing")
+        if server_timing:
+            span.attributes["http.response.header.server-timing"] = server_timing
+        span.attributes["robot.phase.headers_ms"] = round((headers_at - span._start_perf) * 1000, 3)
+        if not stream:
+            span.attributes["robot.phase.download_ms"] = round((end - headers_at) * 1000, 3)
+            span.attributes["http.response.body.size"] = len(body)
+        if pool is not None:
+            span.attributes["robot.connection.reused"] = pool.num_connections == connections_before
+        if response.status_code >= 400:
+            span.fail(f"HTTP {response.status_code}")
+        span.end(end)
+        return response
+
+    def _pool(self, request, verify, cert, proxies):
+        """The urllib3 pool the request will be sent on, to tell new from reused connections"""
+        adapter = self.inner if self.inner is not None else self
+        try:
+            if hasattr(adapter, "get_connection_with_tls_context"):
+                return adapter.get_connection_with_tls_context(request, verify, proxies=proxies, cert=cert)
+            return adapter.get_connection(request.url, proxies)
+        except Exception:
+            return None
+
+
+def instrument(session, tracer: Tracer):
+    """Route all of a session's HTTP(S) traffic through a TracingAdapter"""
+    for prefix in ("http://", "https://"):
+        inner = session.adapters.get(prefix)
+        session.mount(prefix, TracingAdapter(tracer, inner if isinstance(inner, HTTPAdapter) else None))
+    return session
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}